@@ -0,0 +1,68 @@
+from typing import Any, Dict, List, Optional
+
+
+class DeltaEncoder:
+    """Keyframe / delta frames for the live_delta Socket.IO stream
+
+    Frames are computed once per broadcast tick and shared by all
+    delta subscribers:
+
+        keyframe: {"seq": 812, "keyframe": true, "data": {...full live data...}}
+        delta:    {"seq": 815, "base": 812, "changes": {"actual_force": 12.4,
+                                                        "plc": {"cpu_state": "stop"},
+                                                        "timestamp": 1760612345.1},
+                   "fresh": ["actual_position", "actual_force"]}
+
+    changes holds only the fields that differ from the previous frame;
+    nested dicts (plc) are diffed one level deep and merged by the client.
+    The seq field is carried by the frame itself, and fields read at the
+    frame's timestamp are listed in fresh instead of repeating that time
+    in field_timestamps. A client whose last seq is not the frame's base
+    missed a frame and asks for a resync (keyframe()). Keyframes also go
+    out every keyframe_interval seconds and whenever the field set changes.
+    """
+
+    def __init__(self, keyframe_interval: float):
+        self.keyframe_interval = keyframe_interval
+        self.seq = 0
+        self.last: Optional[Dict[str, Any]] = None
+        self._next_keyframe = 0.0
+
+    def keyframe(self) -> Optional[Dict[str, Any]]:
+        """Full frame of the last encoded data, for new or resyncing clients"""
+        if self.last is None:
+            return None
+        return {"seq": self.seq, "keyframe": True, "data": self.last}
+
+    def encode(self, data: Dict[str, Any], seq: int, now: float) -> Dict[str, Any]:
+        """Frame for the next tick - data must not be modified afterwards"""
+        last = self.last
+        if last is None or now >= self._next_keyframe or data.keys() != last.keys():
+            frame = {"seq": seq, "keyframe": True, "data": data}
+            self._next_keyframe = now + self.keyframe_interval
+        else:
+            changes: Dict[str, Any] = {}
+            fresh: List[str] = []
+            for key, value in data.items():
+                old = last[key]
+                if value == old or key == "seq":
+                    continue
+                if key == "field_timestamps":
+                    timestamp = data["timestamp"]
+                    stale = {}
+                    for name, read_at in value.items():
+                        if read_at == timestamp:
+                            fresh.append(name)
+                        elif old.get(name) != read_at:
+                            stale[name] = read_at
+                    if stale:
+                        changes[key] = stale
+                    continue
+                if isinstance(value, dict) and isinstance(old, dict) and value.keys() == old.keys():
+                    changes[key] = {k: v for k, v in value.items() if old[k] != v}
+                else:
+                    changes[key] = value
+            frame = {"seq": seq, "base": self.seq, "changes": changes, "fresh": fresh}
+        self.last = data
+        self.seq = seq
+        return frame
@@ -0,0 +1,39 @@
+from typing import Any, Dict
+
+
+class ClientFlow:
+    """Latest-value flow control state of one live data subscriber
+
+    A client gets a tick only when its previous frames have left the
+    Engine.IO queue; otherwise the tick is dropped and the next one, which
+    is newer, takes its place. So a stalled client holds at most one
+    undelivered snapshot and never slows down the others. A delta client
+    that missed frames is resumed with a keyframe.
+    """
+
+    __slots__ = ("sent", "dropped", "keyframes", "consecutive_dropped", "needs_keyframe")
+
+    def __init__(self):
+        self.sent = 0
+        self.dropped = 0
+        self.keyframes = 0  # Resume / resync keyframes sent to this client alone
+        self.consecutive_dropped = 0
+        self.needs_keyframe = False
+
+    def deliver(self):
+        self.sent += 1
+        self.consecutive_dropped = 0
+
+    def drop(self, delta: bool):
+        self.dropped += 1
+        self.consecutive_dropped += 1
+        if delta:
+            self.needs_keyframe = True
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "sent": self.sent,
+            "dropped": self.dropped,
+            "keyframes": self.keyframes,
+            "consecutive_dropped": self.consecutive_dropped,
+        }
@@ -3,13 +3,15 @@ from pydantic import BaseModel
 
 router = APIRouter(tags=["Commands"])
 
-# This will be set from main.py
+# These will be set from main.py
 command_service = None
+plc_io = None  # AsyncPLCConnector - runs every command on its ordered command lane
 
 
-def set_services(command_service_instance):
-    global command_service
+def set_services(command_service_instance, plc_io_instance):
+    global command_service, plc_io
     command_service = command_service_instance
+    plc_io = plc_io_instance
 
 
 class JogSpeedRequest(BaseModel):
@@ -27,7 +29,7 @@ class ModeResponse(BaseModel):
 
 
 def _check_service():
-    if command_service is None:
+    if command_service is None or plc_io is None:
         raise HTTPException(status_code=503, detail="Command service not initialized")
 
 
@@ -37,7 +39,7 @@ def _check_service():
 async def start_test():
     """Start automated test"""
     _check_service()
-    success = command_service.start_test()
+    success = await plc_io.run_priority(command_service.start_test)
     return CommandResponse(
         success=success,
         message="Test started" if success else "Failed to start test"
@@ -48,7 +50,7 @@ async def start_test():
 async def emergency_stop():
     """Emergency stop - stops all movement"""
     _check_service()
-    success = command_service.stop()
+    success = await plc_io.run_priority(command_service.stop)
     return CommandResponse(
         success=success,
         message="Emergency stop executed" if success else "Failed to execute stop"
@@ -59,7 +61,7 @@ async def emergency_stop():
 async def go_home():
     """Move to home position"""
     _check_service()
-    success = command_service.home()
+    success = await plc_io.run_priority(command_service.home)
     return CommandResponse(
         success=success,
         message="Homing started" if success else "Failed to start homing"
@@ -72,7 +74,7 @@ async def go_home():
 async def enable_servo():
     """Enable servo motor"""
     _check_service()
-    success = command_service.enable_servo()
+    success = await plc_io.run_priority(command_service.enable_servo)
     return CommandResponse(
         success=success,
         message="Servo enabled" if success else "Failed to enable servo"
@@ -83,7 +85,7 @@ async def enable_servo():
 async def disable_servo():
     """Disable servo motor"""
     _check_service()
-    success = command_service.disable_servo()
+    success = await plc_io.run_priority(command_service.disable_servo)
     return CommandResponse(
         success=success,
         message="Servo disabled" if success else "Failed to disable servo"
@@ -94,7 +96,7 @@ async def disable_servo():
 async def reset_servo_alarm():
     """Reset servo alarm"""
     _check_service()
-    success = command_service.reset_alarm()
+    success = await plc_io.run_priority(command_service.reset_alarm)
     return CommandResponse(
         success=success,
         message="Alarm reset" if success else "Failed to reset alarm"
@@ -110,7 +112,7 @@ async def set_jog_speed(request: JogSpeedRequest):
     if request.velocity < 1 or request.velocity > 100:
         raise HTTPException(status_code=400, detail="Velocity must be between 1 and 100 mm/min")
 
-    success = command_service.set_jog_velocity(request.velocity)
+    success = await plc_io.run_priority(command_service.set_jog_velocity, request.velocity)
     return CommandResponse(
         success=success,
         message=f"Jog speed set to {request.velocity} mm/min" if success else "Failed to set jog speed"
@@ -121,7 +123,8 @@ async def set_jog_speed(request: JogSpeedRequest):
 async def jog_forward_start():
     """Start jog forward (down)"""
     _check_service()
-    success = command_service.jog_forward(True)
+    result = await plc_io.run_priority(command_service.jog_forward, True)
+    success = result.get("success", False)
     return CommandResponse(
         success=success,
         message="Jog forward started" if success else "Failed to start jog"
@@ -132,7 +135,8 @@ async def jog_forward_start():
 async def jog_forward_stop():
     """Stop jog forward"""
     _check_service()
-    success = command_service.jog_forward(False)
+    result = await plc_io.run_priority(command_service.jog_forward, False)
+    success = result.get("success", False)
     return CommandResponse(
         success=success,
         message="Jog forward stopped" if success else "Failed to stop jog"
@@ -143,7 +147,8 @@ async def jog_forward_stop():
 async def jog_backward_start():
     """Start jog backward (up)"""
     _check_service()
-    success = command_service.jog_backward(True)
+    result = await plc_io.run_priority(command_service.jog_backward, True)
+    success = result.get("success", False)
     return CommandResponse(
         success=success,
         message="Jog backward started" if success else "Failed to start jog"
@@ -154,7 +159,8 @@ async def jog_backward_start():
 async def jog_backward_stop():
     """Stop jog backward"""
     _check_service()
-    success = command_service.jog_backward(False)
+    result = await plc_io.run_priority(command_service.jog_backward, False)
+    success = result.get("success", False)
     return CommandResponse(
         success=success,
         message="Jog backward stopped" if success else "Failed to stop jog"
@@ -167,7 +173,7 @@ async def jog_backward_stop():
 async def lock_upper_clamp():
     """Lock upper clamp"""
     _check_service()
-    success = command_service.lock_upper()
+    success = await plc_io.run_priority(command_service.lock_upper)
     return CommandResponse(
         success=success,
         message="Upper clamp locked" if success else "Failed to lock upper clamp"
@@ -178,7 +184,7 @@ async def lock_upper_clamp():
 async def lock_lower_clamp():
     """Lock lower clamp"""
     _check_service()
-    success = command_service.lock_lower()
+    success = await plc_io.run_priority(command_service.lock_lower)
     return CommandResponse(
         success=success,
         message="Lower clamp locked" if success else "Failed to lock lower clamp"
@@ -189,7 +195,7 @@ async def lock_lower_clamp():
 async def unlock_all_clamps():
     """Unlock all clamps"""
     _check_service()
-    success = command_service.unlock_all()
+    success = await plc_io.run_priority(command_service.unlock_all)
     return CommandResponse(
         success=success,
         message="All clamps unlocked" if success else "Failed to unlock clamps"
@@ -202,7 +208,7 @@ async def unlock_all_clamps():
 async def get_mode():
     """Get current control mode"""
     _check_service()
-    remote_mode = command_service.get_remote_mode()
+    remote_mode = await plc_io.run_priority(command_service.get_remote_mode)
     return ModeResponse(
         remote_mode=remote_mode,
         mode="remote" if remote_mode else "local"
@@ -213,7 +219,7 @@ async def get_mode():
 async def set_local_mode():
     """Switch to Local mode (Physical buttons)"""
     _check_service()
-    success = command_service.set_remote_mode(False)
+    success = await plc_io.run_priority(command_service.set_remote_mode, False)
     return CommandResponse(
         success=success,
         message="Switched to Local mode" if success else "Failed to switch mode"
@@ -224,7 +230,7 @@ async def set_local_mode():
 async def set_remote_mode():
     """Switch to Remote mode (Web interface)"""
     _check_service()
-    success = command_service.set_remote_mode(True)
+    success = await plc_io.run_priority(command_service.set_remote_mode, True)
     return CommandResponse(
         success=success,
         message="Switched to Remote mode" if success else "Failed to switch mode"
@@ -3,9 +3,13 @@ from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime, timedelta
 import random
+from array import array
 
+from config import settings
 from db.database import get_db
-from db.models import Test, TestDataPoint, Alarm
+from db.bulk import DATA_POINT_INSERT, data_point_params
+from db.curves import CURVE_INSERT, curve_params
+from db.models import Test, TestDataPoint, TestCurve, Alarm
 
 router = APIRouter(prefix="/demo", tags=["Demo"])
 
@@ -49,19 +53,18 @@ async def generate_demo_tests(count: int = 5, db: AsyncSession = Depends(get_db)
 
         # Generate data points for chart
         num_points = random.randint(50, 150)
+        points = []
         for j in range(num_points):
             deflection = (target_deflection * j) / num_points
             # Simulated force curve (approximately linear with some noise)
             force = (force_at_target * j / num_points) + random.uniform(-0.5, 0.5)
+            points.append((j * 0.1, max(0, force), deflection, deflection))  # 100ms intervals
 
-            data_point = TestDataPoint(
-                test_id=test.id,
-                timestamp=j * 0.1,  # 100ms intervals
-                force=max(0, force),
-                deflection=deflection,
-                position=deflection,
-            )
-            db.add(data_point)
+        if settings.CURVE_STORAGE == "binary":
+            columns = [array("f", column) for column in zip(*points)]
+            await db.execute(CURVE_INSERT, curve_params(test.id, 0, columns))
+        else:
+            await db.execute(DATA_POINT_INSERT, data_point_params(test.id, points))
 
         tests_created.append({
             "id": test.id,
@@ -122,6 +125,7 @@ async def clear_demo_data(db: AsyncSession = Depends(get_db)):
     from sqlalchemy import delete
 
     await db.execute(delete(TestDataPoint))
+    await db.execute(delete(TestCurve))
     await db.execute(delete(Test))
     await db.execute(delete(Alarm))
     await db.commit()
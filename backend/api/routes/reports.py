@@ -76,7 +76,7 @@ async def get_tests(
 @router.get("/tests/{test_id}")
 async def get_test(test_id: int, db: AsyncSession = Depends(get_db)):
     """Get single test details with data points"""
-    query = select(Test).options(selectinload(Test.data_points)).where(Test.id == test_id)
+    query = select(Test).options(selectinload(Test.curve_segments), selectinload(Test.data_points)).where(Test.id == test_id)
     result = await db.execute(query)
     test = result.scalar_one_or_none()
 
@@ -84,7 +84,7 @@ async def get_test(test_id: int, db: AsyncSession = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Test not found")
 
     test_dict = test.to_dict()
-    test_dict["data_points"] = [dp.to_dict() for dp in test.data_points]
+    test_dict["data_points"] = [point._asdict() for point in test.curve]
     return test_dict
 
 
@@ -112,7 +112,7 @@ async def download_pdf_report(test_id: int, db: AsyncSession = Depends(get_db)):
     if pdf_generator is None:
         raise HTTPException(status_code=503, detail="PDF generator not initialized")
 
-    query = select(Test).options(selectinload(Test.data_points)).where(Test.id == test_id)
+    query = select(Test).options(selectinload(Test.curve_segments), selectinload(Test.data_points)).where(Test.id == test_id)
     result = await db.execute(query)
     test = result.scalar_one_or_none()
 
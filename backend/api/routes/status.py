@@ -2,17 +2,23 @@ from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
 from typing import Optional
 
+from api import websocket
+
 router = APIRouter(tags=["Status"])
 
 # These will be set from main.py
 plc = None
 data_service = None
+poller = None
+plc_io = None  # AsyncPLCConnector - runs PLC calls on the I/O thread
 
 
-def set_services(plc_instance, data_service_instance):
-    global plc, data_service
+def set_services(plc_instance, data_service_instance, poller_instance=None, plc_io_instance=None):
+    global plc, data_service, poller, plc_io
     plc = plc_instance
     data_service = data_service_instance
+    poller = poller_instance
+    plc_io = plc_io_instance
 
 
 class ParametersRequest(BaseModel):
@@ -32,10 +38,13 @@ class ConnectionResponse(BaseModel):
 
 @router.get("/status")
 async def get_status():
-    """Get all live data (force, position, status, indicators)"""
-    if data_service is None:
+    """Get all live data (force, position, status, indicators)
+
+    Served from the shared poller's latest snapshot - no PLC read per request.
+    """
+    if poller is None:
         raise HTTPException(status_code=503, detail="Service not initialized")
-    return data_service.get_live_data()
+    return poller.snapshot.to_dict()
 
 
 @router.get("/status/connection", response_model=ConnectionResponse)
@@ -54,13 +63,61 @@ async def get_connection_status():
     )
 
 
+@router.get("/status/io")
+async def get_io_stats():
+    """PLC I/O lane statistics
+
+    Queueing delay of the polling / recording I/O thread and of the
+    command lane (every machine command) - max_queue_delay_ms is the worst
+    case a command has waited so far.
+    """
+    if plc_io is None:
+        raise HTTPException(status_code=503, detail="PLC service not initialized")
+    return plc_io.stats()
+
+
+@router.get("/status/metrics")
+async def get_plc_metrics():
+    """PLC call metrics
+
+    Per-operation latency histograms (time on the wire), lock wait (time
+    spent queued behind other PLC calls in the backend), bytes transferred,
+    errors and connection counters, plus the I/O lane queueing delays.
+    """
+    if plc is None:
+        raise HTTPException(status_code=503, detail="PLC service not initialized")
+    metrics = plc.metrics.to_dict()
+    if plc_io is not None:
+        metrics["lanes"] = plc_io.stats()
+    return metrics
+
+
+@router.get("/status/websocket")
+async def get_websocket_flow():
+    """Live data frames delivered to / dropped for each Socket.IO subscriber
+
+    A subscriber that has not taken its previous frame yet skips ticks
+    instead of queueing them; dropped counts those skipped ticks.
+    """
+    return websocket.flow_stats()
+
+
+@router.delete("/status/metrics")
+async def reset_plc_metrics():
+    """Reset PLC call metrics"""
+    if plc is None:
+        raise HTTPException(status_code=503, detail="PLC service not initialized")
+    plc.metrics.reset()
+    return {"success": True}
+
+
 @router.post("/status/reconnect")
 async def reconnect_plc():
     """Reconnect to PLC"""
-    if plc is None:
+    if plc_io is None:
         raise HTTPException(status_code=503, detail="PLC service not initialized")
 
-    success = plc.reconnect()
+    success = await plc_io.reconnect()
     return {
         "success": success,
         "connected": plc.connected,
@@ -79,10 +136,11 @@ async def get_parameters():
 @router.post("/parameters")
 async def set_parameters(params: ParametersRequest):
     """Set test parameters to PLC"""
-    if data_service is None:
+    if data_service is None or plc_io is None:
         raise HTTPException(status_code=503, detail="Service not initialized")
 
-    success = data_service.set_parameters(
+    success = await plc_io.run(
+        data_service.set_parameters,
         diameter=params.pipe_diameter,
         length=params.pipe_length,
         deflection_pct=params.deflection_percent,
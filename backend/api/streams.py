@@ -0,0 +1,91 @@
+from typing import Any, Dict, FrozenSet, Hashable, Optional, Set, Tuple
+
+from .delta import DeltaEncoder
+
+try:
+    import msgpack
+except ImportError:  # Optional - binary live data is refused without it
+    msgpack = None
+
+
+ENCODINGS = ('json', 'msgpack')
+
+# Always part of a projected frame
+FRAME_FIELDS = frozenset({'seq', 'timestamp'})
+
+
+def encode(payload: Dict[str, Any], encoding: str) -> Any:
+    """Socket.IO payload for a stream encoding - bytes for msgpack"""
+    if encoding == 'msgpack':
+        return msgpack.packb(payload)
+    return payload
+
+
+class LiveStream:
+    """Live data for all subscribers sharing one projection
+
+    delta: live_delta frames instead of full live_data dicts
+    encoding: 'json' or 'msgpack'
+    fields: Live data fields to send (None = all); seq and timestamp are
+            always included, field_timestamps is cut to the same fields
+    interval: Minimum seconds between frames (the client's max rate)
+
+    A frame is projected and encoded once per tick for the whole room, and
+    delta streams keep their own DeltaEncoder, so a delta always refers to
+    the previous frame of the same stream.
+    """
+
+    def __init__(
+        self,
+        room: str,
+        delta: bool,
+        encoding: str,
+        fields: Optional[FrozenSet[str]],
+        interval: float,
+        keyframe_interval: float,
+    ):
+        self.room = room
+        self.delta = delta
+        self.encoding = encoding
+        self.fields = fields
+        self.interval = interval
+        self.event = 'live_delta' if delta else 'live_data'
+        self.encoder = DeltaEncoder(keyframe_interval) if delta else None
+        self.members: Set[str] = set()
+        self.next_due = 0.0
+
+    @property
+    def key(self) -> Tuple[Hashable, ...]:
+        return (self.delta, self.encoding, self.fields, self.interval)
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            'delta': self.delta,
+            'encoding': self.encoding,
+            'fields': sorted(self.fields) if self.fields is not None else None,
+            'max_rate': round(1 / self.interval, 2),
+        }
+
+    def project(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        if self.fields is None:
+            return data
+        result = {key: data[key] for key in self.fields | FRAME_FIELDS if key in data}
+        timestamps = data.get('field_timestamps')
+        if timestamps is not None:
+            result['field_timestamps'] = {key: timestamps[key] for key in self.fields if key in timestamps}
+        return result
+
+    def frame(self, data: Dict[str, Any], seq: int, now: float) -> Any:
+        """Encoded payload of this tick - schedules the next one"""
+        self.next_due = max(self.next_due + self.interval, now)
+        payload = self.project(data)
+        if self.encoder is not None:
+            payload = self.encoder.encode(payload, seq, now)
+        return encode(payload, self.encoding)
+
+    def keyframe(self) -> Optional[Any]:
+        """Encoded keyframe for a new or resyncing delta client"""
+        if self.encoder is None:
+            return None
+        frame = self.encoder.keyframe()
+        return None if frame is None else encode(frame, self.encoding)
@@ -1,8 +1,10 @@
 import socketio
 import asyncio
 import logging
-from typing import Optional
+from typing import Any, Dict, Hashable, List, Optional, Set, Tuple
 from config import settings
+from .flow import ClientFlow
+from .streams import ENCODINGS, LiveStream, msgpack
 
 logger = logging.getLogger(__name__)
 
@@ -17,18 +19,45 @@ sio = socketio.AsyncServer(
 # Services - will be set from main.py
 data_service = None
 command_service = None
-plc_connector = None  # PLC connector for reconnection
+plc_connector = None  # PLC connector
+poller = None  # Shared PLC poller - source of live data snapshots
+plc_io = None  # AsyncPLCConnector - runs PLC calls on the I/O thread
+test_service = None  # TestService - source of the test curve
 
 # Background task handle
 broadcast_task: Optional[asyncio.Task] = None
 
+# Clients in the live_data room - drives the poller rate
+live_subscribers: Set[str] = set()
 
-def set_services(data_svc, cmd_svc, plc=None):
+# Subscribers asking for the same delta / encoding / fields / rate share
+# one LiveStream and its room, so each frame is encoded once per tick
+live_groups: Dict[Tuple[Hashable, ...], LiveStream] = {}
+live_streams: Dict[str, LiveStream] = {}
+_room_counter = 0
+
+# Subscription rate limits (Hz)
+DEFAULT_RATE = 1 / settings.WS_UPDATE_INTERVAL
+MAX_RATE = 1 / settings.POLL_ACTIVE_INTERVAL
+
+# Per-subscriber flow control and dropped frame counters
+client_flows: Dict[str, ClientFlow] = {}
+
+# Clients in the curve room get batched curve_append events; curve_sent is
+# (test id, number of samples) already sent to the room
+CURVE_ROOM = 'curve'
+curve_sent: Tuple[Optional[int], int] = (None, 0)
+
+
+def set_services(data_svc, cmd_svc, plc=None, live_poller=None, plc_io_connector=None, test_svc=None):
     """Set service instances from main.py"""
-    global data_service, command_service, plc_connector
+    global data_service, command_service, plc_connector, poller, plc_io, test_service
     data_service = data_svc
     command_service = cmd_svc
     plc_connector = plc
+    poller = live_poller
+    plc_io = plc_io_connector
+    test_service = test_svc
 
 
 @sio.event
@@ -42,32 +71,209 @@ async def connect(sid, environ):
 async def disconnect(sid):
     """Handle client disconnect - SAFETY: stop all jog on disconnect"""
     logger.info(f"Client disconnected: {sid}")
+    _set_subscribed(sid, False)
     if command_service:
         # Safety: stop all jog movements when client disconnects
-        command_service.stop_all_jog()
+        await plc_io.run_priority(command_service.stop_all_jog)
         logger.warning(f"Safety stop executed for disconnected client: {sid}")
 
 
+def _set_subscribed(sid: str, subscribed: bool):
+    """Track live_data subscribers and tell the poller how many there are"""
+    if subscribed:
+        live_subscribers.add(sid)
+        client_flows.setdefault(sid, ClientFlow())
+    else:
+        live_subscribers.discard(sid)
+        client_flows.pop(sid, None)
+        _detach(sid)
+    if poller:
+        poller.set_subscribers(len(live_subscribers))
+
+
+def _attach(sid: str, delta: bool, encoding: str, fields: Optional[frozenset], rate: float) -> LiveStream:
+    """Add a client to the stream of its projection, creating it if needed"""
+    global _room_counter
+    _detach(sid)
+    interval = 1 / rate
+    key = (delta, encoding, fields, interval)
+    stream = live_groups.get(key)
+    if stream is None:
+        _room_counter += 1
+        stream = live_groups[key] = LiveStream(
+            f'live:{_room_counter}', delta, encoding, fields, interval, settings.WS_KEYFRAME_INTERVAL
+        )
+        # Faster than the watched poll rate - keep the poller at its high rate
+        if poller and interval < poller.interval:
+            poller.request_high_rate(stream)
+    stream.members.add(sid)
+    live_streams[sid] = stream
+    return stream
+
+
+def _detach(sid: str) -> Optional[LiveStream]:
+    """Remove a client from its stream - empty streams are dropped"""
+    stream = live_streams.pop(sid, None)
+    if stream is not None:
+        stream.members.discard(sid)
+        if not stream.members:
+            live_groups.pop(stream.key, None)
+            if poller:
+                poller.release_high_rate(stream)
+    return stream
+
+
+def _pending_packets(sid: str) -> int:
+    """Packets queued for a client in Engine.IO, not yet taken by its transport"""
+    try:
+        eio_sid = sio.manager.eio_sid_from_sid(sid, '/')
+        return sio.eio.sockets[eio_sid].queue.qsize()
+    except (KeyError, AttributeError):
+        return 0
+
+
+def flow_stats() -> Dict[str, Any]:
+    """Delivered / dropped live frames per subscriber"""
+    return {
+        "clients": {
+            sid: {"stream": live_streams[sid].describe() if sid in live_streams else None,
+                  **flow.to_dict()}
+            for sid, flow in client_flows.items()
+        },
+        "streams": len(live_groups),
+        "dropped": sum(flow.dropped for flow in client_flows.values()),
+    }
+
+
+async def _leave_stream(sid: str):
+    stream = _detach(sid)
+    if stream is not None:
+        await sio.leave_room(sid, stream.room)
+
+
 @sio.event
 async def subscribe(sid, data):
-    """Subscribe to live data updates"""
+    """Subscribe to live data updates
+
+    Options (all optional):
+        delta: true - live_delta frames (see DeltaEncoder) instead of full
+               live_data dicts, starting with a keyframe
+        encoding: "json" (default) or "msgpack" - msgpack frames arrive as
+                  binary MessagePack payloads of the same events
+        fields: List of live data fields to receive (default: all)
+        max_rate: Frames per second, whole Hz (default 1 / WS_UPDATE_INTERVAL,
+                  at most 1 / POLL_ACTIVE_INTERVAL)
+
+    Clients with the same options share one stream (see LiveStream).
+    Returns the negotiated options as the Socket.IO acknowledgement.
+    """
+    options = data if isinstance(data, dict) else {}
+    delta = bool(options.get('delta'))
+    encoding = options.get('encoding', 'json')
+    if encoding not in ENCODINGS or (encoding == 'msgpack' and msgpack is None):
+        logger.warning(f"Client {sid} asked for unsupported encoding {encoding!r}, using json")
+        encoding = 'json'
+    fields = options.get('fields')
+    fields = frozenset(map(str, fields)) if isinstance(fields, (list, tuple)) and fields else None
+    try:
+        rate = float(options.get('max_rate') or DEFAULT_RATE)
+    except (TypeError, ValueError):
+        rate = DEFAULT_RATE
+    rate = min(max(round(rate), 1), MAX_RATE)  # Whole Hz, so similar requests share a stream
+
     await sio.enter_room(sid, 'live_data')
-    logger.info(f"Client {sid} subscribed to live_data")
+    await _leave_stream(sid)
+    stream = _attach(sid, delta, encoding, fields, rate)
+    await sio.enter_room(sid, stream.room)
+    _set_subscribed(sid, True)
+    if delta:
+        await resync(sid, None)
+    logger.info(f"Client {sid} subscribed to live_data ({stream.describe()})")
+    return stream.describe()
+
+
+@sio.event
+async def resync(sid, data):
+    """Send a keyframe - delta clients ask for one after a sequence gap"""
+    stream = live_streams.get(sid)
+    frame = stream.keyframe() if stream is not None else None
+    if frame is not None:
+        flow = client_flows.get(sid)
+        if flow is not None:
+            flow.needs_keyframe = False
+            flow.keyframes += 1
+        await sio.emit('live_delta', frame, room=sid)
 
 
 @sio.event
 async def unsubscribe(sid, data):
     """Unsubscribe from live data updates"""
     await sio.leave_room(sid, 'live_data')
+    await _leave_stream(sid)
+    _set_subscribed(sid, False)
     logger.info(f"Client {sid} unsubscribed from live_data")
 
 
+def _curve_batch(test_id: int, start: int, stop: int) -> Dict[str, Any]:
+    """curve_append payload for samples [start, stop) of the test curve
+
+    reset (start == 0) tells the client to drop its curve first. A client
+    whose curve length is not start missed a batch and re-subscribes.
+    """
+    curve = test_service.curve
+    return {
+        'test_id': test_id,
+        'start': start,
+        'reset': start == 0,
+        # Little-endian float32 columns - a Float32Array on the client
+        't': curve.to_bytes('timestamp', start, stop, 'f'),
+        'force': curve.to_bytes('force', start, stop, 'f'),
+        'deflection': curve.to_bytes('deflection', start, stop, 'f'),
+    }
+
+
+@sio.event
+async def subscribe_curve(sid, data):
+    """Join the curve room - starts with a backfill of the curve so far"""
+    await sio.enter_room(sid, CURVE_ROOM)
+    test_id, count = curve_sent
+    if test_service and test_id is not None and test_id == test_service.curve_test_id:
+        await sio.emit('curve_append', _curve_batch(test_id, 0, count), room=sid)
+    logger.info(f"Client {sid} subscribed to the test curve")
+
+
+@sio.event
+async def unsubscribe_curve(sid, data):
+    """Leave the curve room"""
+    await sio.leave_room(sid, CURVE_ROOM)
+
+
+async def _emit_curve():
+    """Send the samples recorded since the last tick to the curve room
+
+    One message per tick however fast the curve is sampled; a new test
+    starts over with a reset batch.
+    """
+    global curve_sent
+    if test_service is None or test_service.curve_test_id is None:
+        return
+    test_id, start = curve_sent
+    if test_id != test_service.curve_test_id:
+        test_id, start = test_service.curve_test_id, 0
+    stop = len(test_service.curve)
+    if stop == start and (test_id, start) == curve_sent:
+        return
+    curve_sent = (test_id, stop)
+    await sio.emit('curve_append', _curve_batch(test_id, start, stop), room=CURVE_ROOM)
+
+
 @sio.event
 async def jog_forward(sid, data):
     """Handle jog forward command from client"""
     if command_service:
         state = data.get('state', False)
-        result = command_service.jog_forward(state)
+        # Press and release share the command lane - the release can never overtake the press
+        result = await plc_io.run_priority(command_service.jog_forward, state)
 
         # Check if jog was rejected due to LOCAL mode
         if not result.get('success') and result.get('reason') == 'LOCAL_MODE':
@@ -89,7 +295,8 @@ async def jog_backward(sid, data):
     """Handle jog backward command from client"""
     if command_service:
         state = data.get('state', False)
-        result = command_service.jog_backward(state)
+        # Press and release share the command lane - the release can never overtake the press
+        result = await plc_io.run_priority(command_service.jog_backward, state)
 
         # Check if jog was rejected due to LOCAL mode
         if not result.get('success') and result.get('reason') == 'LOCAL_MODE':
@@ -111,7 +318,7 @@ async def set_jog_speed(sid, data):
     """Set jog velocity"""
     if command_service:
         velocity = data.get('velocity', 50)
-        success = command_service.set_jog_velocity(velocity)
+        success = await plc_io.run_priority(command_service.set_jog_velocity, velocity)
         await sio.emit('jog_speed_response', {
             'velocity': velocity,
             'success': success
@@ -119,40 +326,66 @@ async def set_jog_speed(sid, data):
 
 
 async def broadcast_live_data():
-    """Background task to broadcast live data every 100ms"""
+    """Background task to broadcast the latest poller snapshot
+
+    Snapshots arrive at the poller's rate (up to 50 Hz during a test);
+    each stream gets at most one per its max rate (WS_UPDATE_INTERVAL by
+    default), always the newest. Reconnecting is left to the
+    ReconnectWorker, so a dead PLC never stalls the broadcast.
+
+    A tick is projected and encoded once per due stream (see LiveStream)
+    and sent to that stream's room - minus the clients whose previous
+    frames are still queued (see ClientFlow). Those skip the tick, so a
+    frozen kiosk costs one queued frame, not an ever-growing backlog;
+    delta clients get a keyframe once they catch up.
+    """
     logger.info("Starting live data broadcast task")
-    reconnect_interval = 0  # Counter for reconnection attempts
-    last_connected = False
+    loop = asyncio.get_running_loop()
+    next_curve = loop.time()
+    last_seq = 0
 
     while True:
         try:
-            # Try to reconnect if disconnected (every 5 seconds)
-            if plc_connector and not plc_connector.connected:
-                reconnect_interval += 1
-                if reconnect_interval >= 50:  # 50 * 100ms = 5 seconds
-                    reconnect_interval = 0
-                    logger.info("Attempting to reconnect to PLC...")
-                    if plc_connector.connect():
-                        logger.info("Reconnected to PLC successfully!")
-                        await emit_connection_status(True)
-                        last_connected = True
+            # Paced by the poller, throttled to the earliest stream due
+            await poller.wait_for_update(last_seq)
+            next_emit = min([stream.next_due for stream in live_groups.values()] + [next_curve])
+            delay = next_emit - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            now = loop.time()
+            snapshot = poller.snapshot
+            last_seq = snapshot.seq
+
+            data = snapshot.to_dict()
+            for stream in [stream for stream in live_groups.values() if stream.next_due <= now]:
+                frame = stream.frame(data, snapshot.seq, now)
+                skip: List[str] = []
+                resume: List[str] = []
+                for sid in list(stream.members):
+                    flow = client_flows.get(sid)
+                    if flow is None:
+                        continue
+                    if _pending_packets(sid):
+                        flow.drop(stream.delta)
+                        skip.append(sid)
+                    elif flow.needs_keyframe:
+                        flow.deliver()
+                        skip.append(sid)
+                        resume.append(sid)
                     else:
-                        if last_connected:
-                            await emit_connection_status(False)
-                            last_connected = False
-            else:
-                reconnect_interval = 0
-                if plc_connector and plc_connector.connected and not last_connected:
-                    last_connected = True
-                    await emit_connection_status(True)
-
-            if data_service:
-                data = data_service.get_live_data()
-                await sio.emit('live_data', data, room='live_data')
+                        flow.deliver()
+                await sio.emit(stream.event, frame, room=stream.room, skip_sid=skip)
+                for sid in resume:
+                    await resync(sid, None)
+
+            if now >= next_curve:
+                next_curve = max(next_curve + settings.WS_UPDATE_INTERVAL, now)
+                await _emit_curve()
+        except asyncio.CancelledError:
+            raise
         except Exception as e:
             logger.error(f"Error broadcasting live data: {e}")
-
-        await asyncio.sleep(settings.WS_UPDATE_INTERVAL)
+            await asyncio.sleep(settings.WS_UPDATE_INTERVAL)
 
 
 async def emit_test_complete(test_data: dict):
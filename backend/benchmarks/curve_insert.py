@@ -0,0 +1,92 @@
+"""
+Test curve persistence benchmark - ORM objects vs Core executemany
+
+Writes synthetic curves of 1k, 10k and 100k points into a scratch SQLite
+database file and reports rows/s of:
+    - one TestDataPoint ORM object per sample (db.add + commit)
+    - the bulk path of db.bulk (Core insert() executemany + commit)
+
+Run from backend/: python -m benchmarks.curve_insert [--sizes 1000 10000 100000] [--repeat 3]
+"""
+
+import argparse
+import math
+import os
+import tempfile
+import time
+from typing import Callable, List, Tuple
+
+from sqlalchemy import create_engine, delete
+from sqlalchemy.orm import Session, sessionmaker
+
+from db.bulk import insert_data_points
+from db.database import Base
+from db.models import Test, TestDataPoint
+
+Row = Tuple[float, float, float, float]
+
+
+def _curve(points: int) -> List[Row]:
+    """50 Hz force / deflection curve with some noise"""
+    return [
+        (i * 0.02, 5.0 * i / points + 0.1 * math.sin(i), 9.0 * i / points, 9.0 * i / points)
+        for i in range(points)
+    ]
+
+
+def _orm(db: Session, test_id: int, rows: List[Row]):
+    for timestamp, force, deflection, position in rows:
+        db.add(TestDataPoint(
+            test_id=test_id,
+            timestamp=timestamp,
+            force=force,
+            deflection=deflection,
+            position=position,
+        ))
+
+
+def _bulk(db: Session, test_id: int, rows: List[Row]):
+    insert_data_points(db, test_id, rows)
+
+
+def _bench(name: str, factory: sessionmaker, write: Callable[[Session, int, List[Row]], None],
+           test_id: int, rows: List[Row], repeat: int):
+    best = math.inf
+    for _ in range(repeat):
+        with factory() as db:
+            db.execute(delete(TestDataPoint))
+            db.commit()
+            started = time.perf_counter()
+            write(db, test_id, rows)
+            db.commit()
+            best = min(best, time.perf_counter() - started)
+    print(f"{name:<28} {len(rows):>7} rows   {best * 1000:9.1f} ms   {len(rows) / best:>10.0f} rows/s")
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare ORM and bulk inserts of test data points")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000], help="Curve lengths")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement (best is reported)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite:///{os.path.join(directory, 'bench.db')}")
+        Base.metadata.create_all(bind=engine)
+        factory = sessionmaker(bind=engine)
+        with factory() as db:
+            test = Test(pipe_diameter=300.0, pipe_length=300.0, deflection_percent=3.0)
+            db.add(test)
+            db.commit()
+            test_id = test.id
+
+        for points in args.sizes:
+            rows = _curve(points)
+            orm = _bench("ORM db.add per point", factory, _orm, test_id, rows, args.repeat)
+            bulk = _bench("Core insert executemany", factory, _bulk, test_id, rows, args.repeat)
+            print(f"{'':<28} speedup {orm / bulk:.1f}x")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+PLC backend benchmark - snap7 vs the asyncio S7comm client
+
+Starts the PLC simulator (snap7 server) on a local port and measures
+throughput and latency percentiles of:
+    - the live data snapshot read (DB3 + IW64 multi-variable read)
+    - a bulk read of the whole DB10 sample ring buffer (16 KB)
+through PLCConnector with PLC_BACKEND=snap7 and =asyncio, plus the
+native S7Client with several requests in flight.
+
+Run from backend/: python -m benchmarks.plc_backends [--count 2000] [--port 1102]
+"""
+
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+from typing import Callable, List
+
+from plc.connector import PLCConnector
+from plc.data_service import DataService
+from plc.s7comm import S7Client
+from plc.simulator import MachineSimulator, PipeModel
+
+
+def _report(name: str, latencies: List[float], elapsed: float):
+    latencies = sorted(latencies)
+    count = len(latencies)
+    p99 = latencies[min(count - 1, int(count * 0.99))]
+    print(
+        f"{name:<42} {count / elapsed:>9.0f}/s   p50 {statistics.median(latencies) * 1000:6.2f} ms"
+        f"   p99 {p99 * 1000:6.2f} ms   max {latencies[-1] * 1000:6.2f} ms"
+    )
+
+
+def _bench_sync(name: str, call: Callable[[], object], count: int):
+    latencies = []
+    started = time.perf_counter()
+    for _ in range(count):
+        t0 = time.perf_counter()
+        if call() is None:
+            raise RuntimeError(f"{name}: read failed")
+        latencies.append(time.perf_counter() - t0)
+    _report(name, latencies, time.perf_counter() - started)
+
+
+async def _bench_pipelined(port: int, count: int, in_flight: int):
+    client = S7Client(max_in_flight=in_flight)
+    await client.connect("127.0.0.1", 0, 1, port)
+    items = [tuple(item) for item in DataService.SNAPSHOT_ITEMS]
+    latencies: List[float] = []
+
+    async def worker(n: int):
+        for _ in range(n):
+            t0 = time.perf_counter()
+            await client.read_multi(items)
+            latencies.append(time.perf_counter() - t0)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(count // in_flight) for _ in range(in_flight)))
+    _report(f"S7Client snapshot, {client.max_in_flight} in flight", latencies, time.perf_counter() - started)
+    await client.disconnect()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the snap7 and asyncio PLC backends")
+    parser.add_argument("--count", type=int, default=2000, help="Snapshot reads per run")
+    parser.add_argument("--port", type=int, default=1102, help="Simulator port")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+
+    simulator = MachineSimulator(PipeModel(300.0, 300.0, 5000.0, 50.0))
+    simulator.start(args.port)
+    ring_size = DataService.SAMPLE_HEADER_SIZE + simulator.SAMPLE_CAPACITY * DataService.SAMPLE_ENTRY.size
+    try:
+        for backend in ("snap7", "asyncio"):
+            plc = PLCConnector("127.0.0.1", 0, 1, command_connection=False, port=args.port, backend=backend)
+            if not plc.connect():
+                raise RuntimeError(f"{backend}: cannot connect to the simulator")
+            _bench_sync(f"{backend}: snapshot read_multi", lambda: plc.read_multi(DataService.SNAPSHOT_ITEMS), args.count)
+            _bench_sync(f"{backend}: DB10 read ({ring_size} bytes)",
+                        lambda: plc.read_db(DataService.SAMPLE_DB, 0, ring_size), max(1, args.count // 10))
+            plc.disconnect()
+
+        for in_flight in (1, 4, 8):
+            asyncio.run(_bench_pipelined(args.port, args.count, in_flight))
+    finally:
+        simulator.stop()
+
+
+if __name__ == "__main__":
+    main()
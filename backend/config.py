@@ -7,6 +7,20 @@ class Settings(BaseSettings):
     PLC_IP: str = "192.168.0.100"
     PLC_RACK: int = 0
     PLC_SLOT: int = 1
+    PLC_PORT: int = 102  # ISO-on-TCP port (non-standard for the local simulator)
+    PLC_COMMAND_CONNECTION: bool = True  # Second connection reserved for STOP / jog release
+    PLC_BACKEND: str = "snap7"  # "snap7" or "asyncio" (native S7comm client, plc/s7comm.py)
+    PLC_CONNECT_TIMEOUT: float = 1.0  # TCP connect + ISO / S7 handshake (snap7 PingTimeout)
+    PLC_RECV_TIMEOUT: float = 0.3     # Max wait for a PLC response (snap7 Send/RecvTimeout)
+    PLC_PING_TIMEOUT: float = 1.0     # Silence after which a connected PLC is probed
+    PLC_RECONNECT_MIN_DELAY: float = 0.5  # Reconnect backoff, doubled per failed attempt
+    PLC_RECONNECT_MAX_DELAY: float = 10.0
+    PLC_SAMPLE_BUFFER: bool = False  # Record tests from the DB10 ring buffer (PLC-timed samples)
+    SAMPLE_BUFFER_INTERVAL: float = 0.1  # Ring buffer download period during a test
+    RECORD_INTERVAL: float = 0.02  # Test curve sample period without the ring buffer
+    PERSIST_CHUNK: int = 250  # Data points written to the database per background flush during a test
+    CURVE_STORAGE: str = "binary"  # "binary" (float32 blobs per chunk, db/curve_codec.py) or "rows" (test_data_points)
+    CURVE_COMPRESSION: bool = True  # zlib-compress binary curves
 
     # Database
     DATABASE_URL: str = "sqlite+aiosqlite:///./grp_test.db"
@@ -19,6 +33,14 @@ class Settings(BaseSettings):
 
     # WebSocket
     WS_UPDATE_INTERVAL: float = 0.1  # 100ms
+    WS_KEYFRAME_INTERVAL: float = 5.0  # Full frame period on the live_delta stream
+
+    # PLC polling rate - picked by PLCPoller from machine / test state
+    POLL_IDLE_INTERVAL: float = 0.5     # 2 Hz - no subscribers, axis at rest
+    POLL_ACTIVE_INTERVAL: float = 0.02  # 50 Hz - test recording or axis moving
+    POLL_MULTI_RATE: bool = True        # Status bits + CPU state on a slower cadence
+    POLL_SLOW_INTERVAL: float = 0.5     # Slow path interval in multi-rate mode
+    POLL_MOVING_SPEED: float = 0.5      # mm/min - |actual_speed| above this counts as moving
 
     # Safety Limits
     MAX_FORCE: float = 200.0  # kN
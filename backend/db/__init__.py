@@ -1,4 +1,4 @@
 from .database import get_db, engine, async_engine, Base, init_db
-from .models import Test, TestDataPoint, Alarm
+from .models import Test, TestDataPoint, TestCurve, Alarm
 
-__all__ = ["get_db", "engine", "async_engine", "Base", "init_db", "Test", "TestDataPoint", "Alarm"]
+__all__ = ["get_db", "engine", "async_engine", "Base", "init_db", "Test", "TestDataPoint", "TestCurve", "Alarm"]
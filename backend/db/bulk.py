@@ -0,0 +1,35 @@
+from itertools import islice
+from typing import Any, Dict, Iterable, List, Tuple
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from .models import TestDataPoint
+
+
+# Core INSERT - executed with a list of parameter dicts it becomes one
+# executemany, without ORM objects, identity map or unit of work
+DATA_POINT_INSERT = insert(TestDataPoint.__table__)
+
+# Rows per executemany - bounds the parameter list for very long curves
+BATCH_SIZE = 10000
+
+
+def data_point_params(test_id: int, rows: Iterable[Tuple[float, float, float, float]]) -> List[Dict[str, Any]]:
+    """executemany parameters for (timestamp, force, deflection, position) rows"""
+    return [
+        {"test_id": test_id, "timestamp": timestamp, "force": force, "deflection": deflection, "position": position}
+        for timestamp, force, deflection, position in rows
+    ]
+
+
+def insert_data_points(db: Session, test_id: int, rows: Iterable[Tuple[float, float, float, float]]) -> int:
+    """Bulk insert data points of a test (not committed) - returns the row count"""
+    rows = iter(rows)
+    count = 0
+    while True:
+        params = data_point_params(test_id, islice(rows, BATCH_SIZE))
+        if not params:
+            return count
+        db.execute(DATA_POINT_INSERT, params)
+        count += len(params)
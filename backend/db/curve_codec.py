@@ -0,0 +1,115 @@
+"""
+Binary test curve format (test_curves.data)
+
+    header   <4sBBHI  magic b"GRPC", version, flags, column count, points
+    payload  float32 little-endian columns, one after the other, in
+             COLUMNS order - zlib-compressed when FLAG_ZLIB is set
+
+With FLAG_SHUFFLE the payload is byte-shuffled before compression (all
+first bytes of the floats, then all second bytes, ...), which groups the
+slowly changing sign / exponent bytes and roughly doubles the zlib ratio
+on smooth curves. Readers reject versions they do not know.
+"""
+
+import math
+import struct
+import sys
+import zlib
+from array import array
+from collections import namedtuple
+from typing import List, Sequence
+
+MAGIC = b"GRPC"
+VERSION = 1
+HEADER = struct.Struct("<4sBBHI")
+
+FLAG_ZLIB = 0x01
+FLAG_SHUFFLE = 0x02
+
+COLUMNS = ("timestamp", "force", "deflection", "position")
+
+CurvePoint = namedtuple("CurvePoint", COLUMNS)
+
+
+def encode_curve(columns: Sequence[array], compress: bool = True) -> bytes:
+    """Pack float32 column arrays (COLUMNS order, equal length) into a blob"""
+    if len(columns) != len(COLUMNS):
+        raise ValueError(f"Expected {len(COLUMNS)} columns, got {len(columns)}")
+    points = len(columns[0])
+    parts = []
+    for column in columns:
+        if len(column) != points:
+            raise ValueError("Curve columns differ in length")
+        if column.typecode != "f" or sys.byteorder == "big":
+            column = array("f", column)  # Copy - never swap the caller's array
+        if sys.byteorder == "big":
+            column.byteswap()
+        parts.append(column.tobytes())
+    payload = b"".join(parts)
+
+    flags = 0
+    if compress:
+        payload = b"".join(payload[offset::4] for offset in range(4))
+        payload = zlib.compress(payload, 6)
+        flags = FLAG_ZLIB | FLAG_SHUFFLE
+    return HEADER.pack(MAGIC, VERSION, flags, len(COLUMNS), points) + payload
+
+
+def decode_curve(blob: bytes) -> List[array]:
+    """Unpack a blob into float32 column arrays (COLUMNS order)"""
+    if len(blob) < HEADER.size:
+        raise ValueError("Curve blob too short")
+    magic, version, flags, column_count, points = HEADER.unpack_from(blob)
+    if magic != MAGIC:
+        raise ValueError("Not a curve blob")
+    if version != VERSION:
+        raise ValueError(f"Unsupported curve format version {version}")
+    if column_count != len(COLUMNS):
+        raise ValueError(f"Unexpected curve column count {column_count}")
+
+    payload = blob[HEADER.size:]
+    if flags & FLAG_ZLIB:
+        payload = zlib.decompress(payload)
+    if len(payload) != 4 * column_count * points:
+        raise ValueError("Curve blob size does not match its header")
+    if flags & FLAG_SHUFFLE:
+        plane = len(payload) // 4
+        interleaved = bytearray(len(payload))
+        for offset in range(4):
+            interleaved[offset::4] = payload[offset * plane:(offset + 1) * plane]
+        payload = interleaved
+
+    columns = []
+    size = 4 * points
+    for index in range(column_count):
+        column = array("f")
+        column.frombytes(payload[index * size:(index + 1) * size])
+        if sys.byteorder == "big":
+            column.byteswap()
+        columns.append(column)
+    return columns
+
+
+def concat_columns(segments: Sequence[List[array]]) -> List[array]:
+    """Join decoded segments into one set of columns"""
+    columns = [array("f") for _ in COLUMNS]
+    for segment in segments:
+        for column, part in zip(columns, segment):
+            column.extend(part)
+    return columns
+
+
+def _round_float32(column: array) -> list:
+    """Shortest 7 significant digit floats of a float32 column"""
+    values = list(map(float, ("%.7g " * len(column) % tuple(column)).split()))
+    if math.isnan(math.fsum(column)):
+        values = [None if value != value else value for value in values]
+    return values
+
+
+def curve_points(columns: Sequence[array]) -> List[CurvePoint]:
+    """Points of decoded columns, rounded to float32 precision (7 digits)
+
+    NaN marks a missing value (a legacy row without position) and becomes None.
+    """
+    return list(map(CurvePoint._make, zip(*map(_round_float32, columns))))
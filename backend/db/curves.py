@@ -0,0 +1,61 @@
+from array import array
+from typing import Any, Dict, List, Sequence
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import Session
+
+from config import settings
+from .curve_codec import encode_curve
+from .models import TestCurve, TestDataPoint
+
+
+CURVE_INSERT = insert(TestCurve.__table__)
+
+
+def curve_params(
+    test_id: int, segment: int, columns: Sequence[array], compress: bool = settings.CURVE_COMPRESSION
+) -> Dict[str, Any]:
+    """Insert parameters of one curve segment from float32 columns"""
+    return {
+        "test_id": test_id,
+        "segment": segment,
+        "points": len(columns[0]),
+        "data": encode_curve(columns, compress),
+    }
+
+
+def insert_curve_segment(
+    db: Session, test_id: int, segment: int, columns: Sequence[array], compress: bool = settings.CURVE_COMPRESSION
+):
+    """Add a part of a test curve (not committed)"""
+    db.execute(CURVE_INSERT, curve_params(test_id, segment, columns, compress))
+
+
+def replace_curve(
+    db: Session, test_id: int, columns: Sequence[array], compress: bool = settings.CURVE_COMPRESSION
+):
+    """Store the whole curve of a test as its only segment (not committed)
+
+    Drops the partial segments written while recording and any data point
+    rows of the test.
+    """
+    db.execute(delete(TestCurve.__table__).where(TestCurve.test_id == test_id))
+    db.execute(delete(TestDataPoint.__table__).where(TestDataPoint.test_id == test_id))
+    db.execute(CURVE_INSERT, curve_params(test_id, 0, columns, compress))
+
+
+def data_point_columns(db: Session, test_id: int) -> List[array]:
+    """Data point rows of a test as float32 columns - NaN for a missing position"""
+    rows = db.execute(
+        select(TestDataPoint.timestamp, TestDataPoint.force, TestDataPoint.deflection, TestDataPoint.position)
+        .where(TestDataPoint.test_id == test_id)
+        .order_by(TestDataPoint.timestamp)
+    )
+    columns = [array("f") for _ in range(4)]
+    timestamps, forces, deflections, positions = columns
+    for timestamp, force, deflection, position in rows:
+        timestamps.append(timestamp)
+        forces.append(force)
+        deflections.append(deflection)
+        positions.append(float("nan") if position is None else position)
+    return columns
@@ -0,0 +1,74 @@
+"""
+Convert test_data_points rows into binary test curves
+
+Every test that has data point rows but no binary curve gets one
+test_curves row (float32 columns, see db/curve_codec.py) and, unless
+--keep-rows is given, its data point rows are deleted. Tests are converted
+one transaction each, so the migration can be interrupted and rerun.
+SQLite only gives the freed pages back to the file system after VACUUM.
+
+Run from backend/: python -m db.migrate_curves [--keep-rows] [--no-compress] [--vacuum]
+"""
+
+import argparse
+import logging
+
+from sqlalchemy import func, select
+
+from config import settings
+from .curves import data_point_columns, insert_curve_segment, replace_curve
+from .database import SessionLocal, engine, init_db
+from .models import TestCurve, TestDataPoint
+
+logger = logging.getLogger(__name__)
+
+
+def migrate_data_points(keep_rows: bool = False, compress: bool = settings.CURVE_COMPRESSION) -> int:
+    """Convert the data points of all not yet converted tests - returns the test count"""
+    db = SessionLocal()
+    try:
+        converted = select(TestCurve.test_id).distinct()
+        test_ids = db.scalars(
+            select(TestDataPoint.test_id).distinct().where(TestDataPoint.test_id.not_in(converted))
+        ).all()
+        for test_id in test_ids:
+            columns = data_point_columns(db, test_id)
+            if keep_rows:
+                insert_curve_segment(db, test_id, 0, columns, compress)
+            else:
+                replace_curve(db, test_id, columns, compress)
+            db.commit()
+            logger.info(f"Test {test_id}: {len(columns[0])} data points converted")
+        return len(test_ids)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def vacuum():
+    """Rewrite the SQLite file without the free pages left by deleted rows"""
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        connection.exec_driver_sql("VACUUM")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert test data point rows into binary test curves")
+    parser.add_argument("--keep-rows", action="store_true", help="Keep the test_data_points rows")
+    parser.add_argument("--no-compress", action="store_true", help="Store the curves uncompressed")
+    parser.add_argument("--vacuum", action="store_true", help="VACUUM the database afterwards")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    init_db()
+    count = migrate_data_points(keep_rows=args.keep_rows, compress=not args.no_compress)
+    with SessionLocal() as db:
+        remaining = db.scalar(select(func.count()).select_from(TestDataPoint))
+    print(f"Converted {count} tests, {remaining} data point rows left")
+    if args.vacuum:
+        vacuum()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,9 @@
-from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, ForeignKey, Text, JSON, LargeBinary
 from sqlalchemy.orm import relationship
 from datetime import datetime
+from typing import List
 from .database import Base
+from .curve_codec import CurvePoint, concat_columns, curve_points, decode_curve
 
 
 class Test(Base):
@@ -29,9 +31,14 @@ class Test(Base):
     test_speed = Column(Float, nullable=True)  # mm/min
     duration = Column(Float, nullable=True)  # seconds
     notes = Column(Text, nullable=True)
+    sampling = Column(JSON, nullable=True)  # Sample timing stats (interval, missed ticks, jitter)
 
-    # Relationship to data points
+    # Relationship to data points (CURVE_STORAGE=rows and tests saved before binary curves)
     data_points = relationship("TestDataPoint", back_populates="test", cascade="all, delete-orphan")
+    # Binary curve - one segment per flushed chunk (a single one for migrated tests)
+    curve_segments = relationship(
+        "TestCurve", back_populates="test", cascade="all, delete-orphan", order_by="TestCurve.segment"
+    )
 
     def __repr__(self):
         return f"<Test {self.id}: Ø{self.pipe_diameter}mm, SN{self.sn_class}, {'PASS' if self.passed else 'FAIL'}>"
@@ -53,8 +60,22 @@ class Test(Base):
             "test_speed": self.test_speed,
             "duration": self.duration,
             "notes": self.notes,
+            "sampling": self.sampling,
         }
 
+    @property
+    def curve(self) -> List[CurvePoint]:
+        """Recorded curve whichever way it is stored, in time order
+
+        Needs curve_segments and data_points loaded (selectinload in async code).
+        """
+        if self.curve_segments:
+            return curve_points(concat_columns([decode_curve(s.data) for s in self.curve_segments]))
+        return [
+            CurvePoint(dp.timestamp, dp.force, dp.deflection, dp.position)
+            for dp in sorted(self.data_points, key=lambda x: x.timestamp)
+        ]
+
 
 class TestDataPoint(Base):
     """Test data point model - stores force/deflection curve data"""
@@ -84,6 +105,22 @@ class TestDataPoint(Base):
         }
 
 
+class TestCurve(Base):
+    """Binary test curve - float32 columns in one blob (format in db/curve_codec.py)"""
+    __tablename__ = "test_curves"
+
+    test_id = Column(Integer, ForeignKey("tests.id", ondelete="CASCADE"), primary_key=True)
+    segment = Column(Integer, primary_key=True, default=0)  # Order of the parts of a partial curve
+    points = Column(Integer, nullable=False)
+    data = Column(LargeBinary, nullable=False)
+
+    # Relationship
+    test = relationship("Test", back_populates="curve_segments")
+
+    def __repr__(self):
+        return f"<TestCurve test={self.test_id} segment={self.segment}: {self.points} points>"
+
+
 class Alarm(Base):
     """Alarm record model - stores alarm history"""
     __tablename__ = "alarms"
@@ -18,8 +18,11 @@ import socketio
 from config import settings
 from db.database import init_db
 from plc.connector import PLCConnector
+from plc.async_connector import AsyncPLCConnector
 from plc.data_service import DataService
 from plc.command_service import CommandService
+from plc.poller import PLCPoller
+from plc.reconnect import ReconnectWorker
 from services.pdf_generator import PDFGenerator
 from services.excel_export import ExcelExporter
 from services.test_service import TestService
@@ -39,11 +42,14 @@ logger = logging.getLogger(__name__)
 
 # Initialize components
 plc = PLCConnector(settings.PLC_IP, settings.PLC_RACK, settings.PLC_SLOT)
+plc_io = AsyncPLCConnector(plc)
 data_service = DataService(plc)
-command_service = CommandService(plc)
+command_service = CommandService(plc, plc_io)
+poller = PLCPoller(data_service, plc_io)
+reconnector = ReconnectWorker(plc_io)
 pdf_generator = PDFGenerator()
 excel_exporter = ExcelExporter()
-test_service = TestService(data_service, command_service)
+test_service = TestService(data_service, command_service, poller, plc_io)
 
 
 @asynccontextmanager
@@ -57,14 +63,21 @@ async def lifespan(app: FastAPI):
     logger.info("Database initialized")
 
     # Connect to PLC
-    if plc.connect():
+    if await plc_io.connect():
         logger.info(f"Connected to PLC at {settings.PLC_IP}")
         # Set default mode to REMOTE on startup
-        if command_service.set_remote_mode(True):
+        if await plc_io.run_priority(command_service.set_remote_mode, True):
             logger.info("Default mode set to REMOTE")
     else:
         logger.warning(f"Could not connect to PLC at {settings.PLC_IP} - running in offline mode")
 
+    # Start shared PLC poller (feeds broadcast, recording and /api/status)
+    poller.start()
+
+    # Keep the PLC connection up, tell clients when it changes
+    reconnector.add_listener(ws.emit_connection_status)
+    reconnector.start()
+
     # Start WebSocket broadcast task
     ws.start_broadcast_task()
     logger.info("WebSocket broadcast started")
@@ -76,12 +89,15 @@ async def lifespan(app: FastAPI):
 
     # Stop broadcast
     ws.stop_broadcast_task()
+    reconnector.stop()
+    poller.stop()
 
     # Safety: stop all movements
-    command_service.stop_all_jog()
+    await plc_io.run_priority(command_service.stop_all_jog)
 
     # Disconnect PLC
-    plc.disconnect()
+    await plc_io.disconnect()
+    plc_io.shutdown()
     logger.info("Server shutdown complete")
 
 
@@ -103,10 +119,10 @@ app.add_middleware(
 )
 
 # Set services for routes
-status.set_services(plc, data_service)
-commands.set_services(command_service)
+status.set_services(plc, data_service, poller, plc_io)
+commands.set_services(command_service, plc_io)
 reports.set_services(pdf_generator, excel_exporter)
-ws.set_services(data_service, command_service, plc)
+ws.set_services(data_service, command_service, plc, poller, plc_io, test_service)
 
 # Include routers
 app.include_router(status.router, prefix="/api")
@@ -152,7 +168,7 @@ async def api_start_test(
 @app.post("/api/test/stop")
 async def api_stop_test():
     """Stop current test"""
-    test_service.stop_test()
+    await test_service.stop_test()
     return {"success": True, "message": "Test stopped"}
 
 
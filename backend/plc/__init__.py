@@ -1,5 +1,9 @@
 from .connector import PLCConnector
+from .tags import Tag, TagMap, MACHINE_TAGS
+from .async_connector import AsyncPLCConnector
 from .data_service import DataService
 from .command_service import CommandService
+from .poller import PLCPoller, LiveSnapshot
+from .reconnect import ReconnectWorker
 
-__all__ = ["PLCConnector", "DataService", "CommandService"]
+__all__ = ["PLCConnector", "AsyncPLCConnector", "Tag", "TagMap", "MACHINE_TAGS", "DataService", "CommandService", "PLCPoller", "LiveSnapshot", "ReconnectWorker"]
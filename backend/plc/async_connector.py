@@ -0,0 +1,256 @@
+import asyncio
+import functools
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence, TypeVar
+
+from .connector import PLCConnector, ReadItem
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class LaneStats:
+    """Queueing delay statistics for one I/O lane
+
+    queue delay: time from submitting a call until it starts on the lane
+    duration: time the call itself took (including PLC lock wait)
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.count = 0
+        self.last_queue_delay = 0.0
+        self.max_queue_delay = 0.0
+        self.total_queue_delay = 0.0
+        self.max_duration = 0.0
+
+    def record(self, queue_delay: float, duration: float):
+        with self._lock:
+            self.count += 1
+            self.last_queue_delay = queue_delay
+            self.total_queue_delay += queue_delay
+            self.max_queue_delay = max(self.max_queue_delay, queue_delay)
+            self.max_duration = max(self.max_duration, duration)
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            mean = self.total_queue_delay / self.count if self.count else 0.0
+            return {
+                "calls": self.count,
+                "last_queue_delay_ms": self.last_queue_delay * 1000,
+                "mean_queue_delay_ms": mean * 1000,
+                "max_queue_delay_ms": self.max_queue_delay * 1000,
+                "max_duration_ms": self.max_duration * 1000,
+            }
+
+
+class AsyncPLCConnector:
+    """Awaitable facade over PLCConnector
+
+    snap7 calls are blocking, so every PLC call made from async code
+    (routes, Socket.IO handlers, background tasks) goes through this
+    facade and runs on a dedicated I/O thread. The event loop keeps
+    serving requests and websocket fan-out while PLC I/O is in flight.
+
+    Composite service calls (e.g. CommandService.stop) are run as a whole
+    with run(), so they keep their synchronous logic and stay atomic on
+    the I/O thread.
+
+    Every CommandService call goes through run_priority() instead: a
+    separate command thread that uses the connector's dedicated command
+    connection, so commands never queue behind polling traffic on the I/O
+    thread. Presses and releases, starts and STOPs all share this one
+    ordered lane - a release on another lane than its press could reach
+    the PLC first and leave the bit set.
+    """
+
+    def __init__(self, plc: PLCConnector):
+        self.plc = plc
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="plc-io")
+        self._command_executor = ThreadPoolExecutor(
+            max_workers=1,
+            thread_name_prefix="plc-cmd",
+            initializer=plc.mark_command_thread,
+        )
+        self.io_stats = LaneStats()
+        self.command_stats = LaneStats()
+        self._timers: Dict[Future, threading.Timer] = {}
+        self._timers_lock = threading.Lock()
+
+    @property
+    def connected(self) -> bool:
+        """Check if PLC is connected"""
+        return self.plc.connected
+
+    @property
+    def ip(self) -> str:
+        return self.plc.ip
+
+    async def run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run a blocking PLC call (or service method) on the I/O thread"""
+        loop = asyncio.get_running_loop()
+        call = _timed(self.io_stats, functools.partial(func, *args, **kwargs))
+        return await loop.run_in_executor(self._executor, call)
+
+    async def run_priority(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run a CommandService call on the command lane (in submission order)"""
+        loop = asyncio.get_running_loop()
+        call = _timed(self.command_stats, functools.partial(func, *args, **kwargs))
+        return await loop.run_in_executor(self._command_executor, call)
+
+    def stats(self) -> Dict[str, Any]:
+        """Queueing delay statistics of both lanes"""
+        return {
+            "command_connection": self.plc._command_connected,
+            "io": self.io_stats.to_dict(),
+            "command": self.command_stats.to_dict(),
+        }
+
+    def schedule(self, delay: float, func: Callable[..., T], *args: Any, priority: bool = False) -> "Future[T]":
+        """Run a PLC call on the I/O thread after delay seconds
+
+        Returns immediately - nothing blocks while the delay runs. Safe to
+        call from any thread, including from a call already running on the
+        I/O thread (e.g. a pulse started inside CommandService). With
+        priority=True the call runs on the command lane.
+
+        Returns:
+            concurrent Future with func's result. Await it from async code
+            with asyncio.wrap_future(); cancel() drops the call if the
+            delay has not expired yet.
+        """
+        handle: Future = Future()
+
+        def fire():
+            with self._timers_lock:
+                self._timers.pop(handle, None)
+            if not handle.set_running_or_notify_cancel():
+                return
+            executor, lane_stats = (
+                (self._command_executor, self.command_stats) if priority
+                else (self._executor, self.io_stats)
+            )
+            try:
+                job = executor.submit(_timed(lane_stats, functools.partial(func, *args)))
+            except RuntimeError as e:
+                handle.set_exception(e)
+                return
+            job.add_done_callback(functools.partial(_copy_result, target=handle))
+
+        timer = threading.Timer(delay, fire)
+        timer.daemon = True
+        with self._timers_lock:
+            self._timers[handle] = timer
+        handle.add_done_callback(self._discard_timer)
+        timer.start()
+        return handle
+
+    def _discard_timer(self, handle: Future):
+        """Stop the timer of a scheduled call that was cancelled"""
+        with self._timers_lock:
+            timer = self._timers.pop(handle, None)
+        if timer:
+            timer.cancel()
+
+    def shutdown(self):
+        """Stop the I/O thread once queued and scheduled calls have finished
+
+        Scheduled calls still waiting on their delay (e.g. the release of a
+        STOP pulse) are fired immediately so no command bit is left set.
+        """
+        with self._timers_lock:
+            pending = list(self._timers.items())
+            self._timers.clear()
+        for handle, timer in pending:
+            timer.cancel()
+            timer.function()
+        self._command_executor.shutdown(wait=True)
+        self._executor.shutdown(wait=True)
+        logger.info("PLC I/O thread stopped")
+
+    # ========== Connection ==========
+
+    async def connect(self) -> bool:
+        return await self.run(self.plc.connect)
+
+    async def disconnect(self):
+        return await self.run(self.plc.disconnect)
+
+    async def reconnect(self) -> bool:
+        return await self.run(self.plc.reconnect)
+
+    async def ping(self) -> bool:
+        return await self.run(self.plc.ping)
+
+    async def get_cpu_state(self) -> str:
+        return await self.run(self.plc.get_cpu_state)
+
+    # ========== DB Access ==========
+
+    async def read_db(self, db_number: int, start: int, size: int) -> Optional[bytearray]:
+        return await self.run(self.plc.read_db, db_number, start, size)
+
+    async def read_multi(self, items: Sequence[ReadItem]) -> Optional[List[Optional[bytearray]]]:
+        return await self.run(self.plc.read_multi, items)
+
+    async def read_real(self, db_number: int, offset: int) -> Optional[float]:
+        return await self.run(self.plc.read_real, db_number, offset)
+
+    async def write_real(self, db_number: int, offset: int, value: float) -> bool:
+        return await self.run(self.plc.write_real, db_number, offset, value)
+
+    async def read_bool(self, db_number: int, byte_offset: int, bit_offset: int) -> Optional[bool]:
+        return await self.run(self.plc.read_bool, db_number, byte_offset, bit_offset)
+
+    async def write_bool(self, db_number: int, byte_offset: int, bit_offset: int, value: bool) -> bool:
+        return await self.run(self.plc.write_bool, db_number, byte_offset, bit_offset, value)
+
+    async def read_int(self, db_number: int, offset: int) -> Optional[int]:
+        return await self.run(self.plc.read_int, db_number, offset)
+
+    async def write_int(self, db_number: int, offset: int, value: int) -> bool:
+        return await self.run(self.plc.write_int, db_number, offset, value)
+
+    # ========== Hardware I/O ==========
+
+    async def read_input_bit(self, byte_offset: int, bit: int) -> Optional[bool]:
+        return await self.run(self.plc.read_input_bit, byte_offset, bit)
+
+    async def read_input_byte(self, byte_offset: int) -> Optional[int]:
+        return await self.run(self.plc.read_input_byte, byte_offset)
+
+    async def read_analog_input(self, address: int) -> Optional[int]:
+        return await self.run(self.plc.read_analog_input, address)
+
+    async def write_output_bit(self, byte_offset: int, bit: int, value: bool) -> bool:
+        return await self.run(self.plc.write_output_bit, byte_offset, bit, value)
+
+    async def read_output_bit(self, byte_offset: int, bit: int) -> Optional[bool]:
+        return await self.run(self.plc.read_output_bit, byte_offset, bit)
+
+
+def _copy_result(source: Future, target: Future):
+    """Propagate a finished executor job into a schedule() handle"""
+    error = source.exception()
+    if error is not None:
+        target.set_exception(error)
+    else:
+        target.set_result(source.result())
+
+
+def _timed(lane_stats: LaneStats, call: Callable[[], T]) -> Callable[[], T]:
+    """Wrap a lane call so its queue delay and duration are recorded"""
+    submitted = time.perf_counter()
+
+    def timed_call() -> T:
+        started = time.perf_counter()
+        try:
+            return call()
+        finally:
+            lane_stats.record(started - submitted, time.perf_counter() - started)
+
+    return timed_call
@@ -1,6 +1,12 @@
 import time
+import functools
+import threading
 import logging
+from concurrent.futures import Future
+from typing import Dict, Optional, Tuple
 from .connector import PLCConnector
+from .async_connector import AsyncPLCConnector
+from .tags import MACHINE_TAGS, DB3
 
 logger = logging.getLogger(__name__)
 
@@ -26,37 +32,48 @@ class CommandService:
     └─────────────────┴────────┴─────┴──────────────┘
     """
 
-    DB_NUMBER = 3  # DB3 - Servo Control
+    DB_NUMBER = DB3  # DB3 - Servo Control
+
+    # Addresses come from the MACHINE_TAGS schema in tags.py
 
     # ═══════════════════════════════════════════════════════════════════
     # COMMANDS (Byte 0) - Main control bits
     # ═══════════════════════════════════════════════════════════════════
-    CMD_ENABLE = (0, 0)         # DB3.DBX0.0 - Enable Servo
-    CMD_JOG_FORWARD = (0, 1)    # DB3.DBX0.1 - Jog Forward
-    CMD_JOG_BACKWARD = (0, 2)   # DB3.DBX0.2 - Jog Backward
-    CMD_START_TEST = (0, 3)     # DB3.DBX0.3 - Start Test
-    CMD_STOP = (0, 4)           # DB3.DBX0.4 - Stop
-    CMD_RESET = (0, 5)          # DB3.DBX0.5 - Reset
-    CMD_HOME = (0, 6)           # DB3.DBX0.6 - Home
+    CMD_ENABLE = MACHINE_TAGS.address("servo_enabled")       # DB3.DBX0.0 - Enable Servo
+    CMD_JOG_FORWARD = MACHINE_TAGS.address("jog_forward")    # DB3.DBX0.1 - Jog Forward
+    CMD_JOG_BACKWARD = MACHINE_TAGS.address("jog_backward")  # DB3.DBX0.2 - Jog Backward
+    CMD_START_TEST = MACHINE_TAGS.address("start_test")      # DB3.DBX0.3 - Start Test
+    CMD_STOP = MACHINE_TAGS.address("stop")                  # DB3.DBX0.4 - Stop
+    CMD_RESET = MACHINE_TAGS.address("reset")                # DB3.DBX0.5 - Reset
+    CMD_HOME = MACHINE_TAGS.address("home")                  # DB3.DBX0.6 - Home
 
     # ═══════════════════════════════════════════════════════════════════
     # CLAMPS (Byte 14) - Lock control bits
     # ═══════════════════════════════════════════════════════════════════
-    CMD_LOCK_UPPER = (14, 0)    # DB3.DBX14.0 - Lock Upper Clamp
-    CMD_LOCK_LOWER = (14, 1)    # DB3.DBX14.1 - Lock Lower Clamp
+    CMD_LOCK_UPPER = MACHINE_TAGS.address("lock_upper")      # DB3.DBX14.0 - Lock Upper Clamp
+    CMD_LOCK_LOWER = MACHINE_TAGS.address("lock_lower")      # DB3.DBX14.1 - Lock Lower Clamp
 
     # ═══════════════════════════════════════════════════════════════════
     # MODE (Byte 25)
     # ═══════════════════════════════════════════════════════════════════
-    CMD_REMOTE_MODE = (25, 0)   # DB3.DBX25.0 - Remote Mode
+    CMD_REMOTE_MODE = MACHINE_TAGS.address("remote_mode")    # DB3.DBX25.0 - Remote Mode
 
     # ═══════════════════════════════════════════════════════════════════
     # REAL VALUES
     # ═══════════════════════════════════════════════════════════════════
-    CMD_JOG_VELOCITY = 16       # DB3.DBD16 - Jog Speed (Real)
+    CMD_JOG_VELOCITY = MACHINE_TAGS.address("jog_velocity")  # DB3.DBD16 - Jog Speed (Real)
+
+    # ═══════════════════════════════════════════════════════════════════
+    # PULSE DURATIONS (seconds)
+    # ═══════════════════════════════════════════════════════════════════
+    RESET_PULSE_TIME = 0.5
+    STOP_PULSE_TIME = 0.1
 
-    def __init__(self, plc: PLCConnector):
+    def __init__(self, plc: PLCConnector, scheduler: Optional[AsyncPLCConnector] = None):
         self.plc = plc
+        self.scheduler = scheduler
+        self._pulses: Dict[Tuple[int, int], Future] = {}
+        self._pulses_lock = threading.Lock()  # Used from the I/O thread, command lane and timers
 
     def _check_connection(self) -> bool:
         """Check PLC connection before command"""
@@ -65,10 +82,66 @@ class CommandService:
             return False
         return True
 
+    def _write_bits(self, *changes: Tuple[Tuple[int, int], bool]) -> bool:
+        """Write several (address, value) bits, one bit-write request per DB3 byte"""
+        by_byte: Dict[int, Dict[int, bool]] = {}
+        for (byte_offset, bit_offset), value in changes:
+            by_byte.setdefault(byte_offset, {})[bit_offset] = value
+        success = True
+        for byte_offset, bits in by_byte.items():
+            success &= self.plc.write_bits(self.DB_NUMBER, byte_offset, bits)
+        return success
+
     def _check_remote_mode(self) -> bool:
         """Check if system is in REMOTE mode"""
         return self.plc.read_bool(self.DB_NUMBER, *self.CMD_REMOTE_MODE) or False
 
+    def pulse(self, address: Tuple[int, int], duration: float) -> Optional[Future]:
+        """Set a DB3 bit and release it after duration seconds
+
+        The release is scheduled on the command lane, behind any command
+        already queued there, so the call returns as soon as the bit is set.
+        Re-pulsing a bit that is still held extends the pulse instead of
+        releasing it early.
+
+        Returns:
+            Handle for the release write (await with asyncio.wrap_future),
+            or None if the bit could not be set
+        """
+        with self._pulses_lock:
+            previous = self._pulses.pop(address, None)
+        if previous is not None:
+            previous.cancel()
+
+        if not self.plc.write_bool(self.DB_NUMBER, *address, True):
+            return None
+
+        if self.scheduler is None:
+            # No I/O thread available - hold the pulse inline
+            time.sleep(duration)
+            handle: Future = Future()
+            handle.set_result(self.plc.write_bool(self.DB_NUMBER, *address, False))
+            return handle
+
+        handle = self.scheduler.schedule(
+            duration, self.plc.write_bool, self.DB_NUMBER, *address, False, priority=True
+        )
+        with self._pulses_lock:
+            # A concurrent pulse of the same bit may have registered in between
+            replaced = self._pulses.get(address)
+            self._pulses[address] = handle
+        if replaced is not None:
+            replaced.cancel()
+        # Outside the lock - runs _forget_pulse at once if the handle is done
+        handle.add_done_callback(functools.partial(self._forget_pulse, address))
+        return handle
+
+    def _forget_pulse(self, address: Tuple[int, int], handle: Future):
+        """Drop a finished pulse handle unless it was already replaced"""
+        with self._pulses_lock:
+            if self._pulses.get(address) is handle:
+                del self._pulses[address]
+
     # ========== Servo Control ==========
 
     def enable_servo(self) -> bool:
@@ -92,11 +165,9 @@ class CommandService:
         """Reset servo alarm - DB3.DBX0.5 (pulse)"""
         if not self._check_connection():
             return False
-        self.plc.write_bool(self.DB_NUMBER, *self.CMD_RESET, True)
-        time.sleep(0.5)
-        result = self.plc.write_bool(self.DB_NUMBER, *self.CMD_RESET, False)
+        handle = self.pulse(self.CMD_RESET, self.RESET_PULSE_TIME)
         logger.info("Alarm reset (DB3.DBX0.5 pulse)")
-        return result
+        return handle is not None
 
     # ========== Jog Control - Requires REMOTE Mode ==========
 
@@ -114,8 +185,10 @@ class CommandService:
             }
 
         if state:
-            self.plc.write_bool(self.DB_NUMBER, *self.CMD_JOG_BACKWARD, False)
-        result = self.plc.write_bool(self.DB_NUMBER, *self.CMD_JOG_FORWARD, state)
+            # Forward on + backward off in one request
+            result = self._write_bits((self.CMD_JOG_FORWARD, True), (self.CMD_JOG_BACKWARD, False))
+        else:
+            result = self.plc.write_bool(self.DB_NUMBER, *self.CMD_JOG_FORWARD, False)
         logger.info(f"Jog forward: {state} (DB3.DBX0.1)")
         return {"success": result}
 
@@ -133,8 +206,10 @@ class CommandService:
             }
 
         if state:
-            self.plc.write_bool(self.DB_NUMBER, *self.CMD_JOG_FORWARD, False)
-        result = self.plc.write_bool(self.DB_NUMBER, *self.CMD_JOG_BACKWARD, state)
+            # Backward on + forward off in one request
+            result = self._write_bits((self.CMD_JOG_BACKWARD, True), (self.CMD_JOG_FORWARD, False))
+        else:
+            result = self.plc.write_bool(self.DB_NUMBER, *self.CMD_JOG_BACKWARD, False)
         logger.info(f"Jog backward: {state} (DB3.DBX0.2)")
         return {"success": result}
 
@@ -151,9 +226,7 @@ class CommandService:
         """Stop all jog movements"""
         if not self._check_connection():
             return False
-        success = True
-        success &= self.plc.write_bool(self.DB_NUMBER, *self.CMD_JOG_FORWARD, False)
-        success &= self.plc.write_bool(self.DB_NUMBER, *self.CMD_JOG_BACKWARD, False)
+        success = self._write_bits((self.CMD_JOG_FORWARD, False), (self.CMD_JOG_BACKWARD, False))
         logger.info("All jog stopped")
         return success
 
@@ -212,11 +285,9 @@ class CommandService:
         if not self._check_connection():
             return False
         self.stop_all_jog()
-        self.plc.write_bool(self.DB_NUMBER, *self.CMD_STOP, True)
-        time.sleep(0.1)
-        result = self.plc.write_bool(self.DB_NUMBER, *self.CMD_STOP, False)
+        handle = self.pulse(self.CMD_STOP, self.STOP_PULSE_TIME)
         logger.warning("STOP executed (DB3.DBX0.4)")
-        return result
+        return handle is not None
 
     def home(self) -> bool:
         """Go home - DB3.DBX0.6"""
@@ -1,57 +1,221 @@
 import snap7
 from snap7.client import Area as Areas
-from snap7.util import get_real, set_real, get_int, get_bool, set_bool
+from snap7.error import check_error
+from snap7.type import Parameter, S7DataItem, WordLen
+from snap7.util import get_real, set_real, get_int, get_bool
+import ctypes
 import threading
+import time
 import logging
-from typing import Optional
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
 from config import settings
+from .metrics import PLCMetrics
 
 logger = logging.getLogger(__name__)
 
 
+class ReadItem(NamedTuple):
+    """One byte range of a multi-variable read
+
+    area: Areas.DB, Areas.PE (inputs) or Areas.PA (outputs)
+    db_number: DB number for Areas.DB, 0 for process image areas
+    start: First byte (IW64 -> 64)
+    size: Number of bytes
+    """
+    area: Areas
+    db_number: int
+    start: int
+    size: int
+
+
 class PLCConnector:
-    """Snap7 PLC Connection Handler for Siemens S7-1214C"""
+    """Snap7 PLC Connection Handler for Siemens S7-1214C
+
+    Two ISO-on-TCP connections are kept open: the main one carries polling
+    and regular commands, the command connection is reserved for threads
+    marked with mark_command_thread() (safety-critical writes such as STOP
+    and jog release), so those never wait behind a read in progress.
+
+    Bools are written with S7 bit writes: one round trip, no read first,
+    and the other bits of the byte - status, latches, bits the PLC clears
+    as acknowledgement - are never touched. Several bits of one byte can
+    be set in the same request with write_bits().
+
+    Every snap7 call and lock acquisition is recorded in self.metrics
+    (served by GET /api/status/metrics).
+    """
+
+    # Max variables per read_multi_vars request (snap7 MaxVars)
+    MAX_MULTI_VARS = 20
 
     # CPU State Constants
     CPU_STATE_RUN = 0x08
     CPU_STATE_STOP = 0x04
     CPU_STATE_UNKNOWN = 0x00
 
+    # get_cpu_state() of snap7 2.x / SyncS7Client returns the status name
+    CPU_STATE_NAMES = {"S7CpuStatusRun": "run", "S7CpuStatusStop": "stop"}
+
     def __init__(
         self,
         ip: str = settings.PLC_IP,
         rack: int = settings.PLC_RACK,
         slot: int = settings.PLC_SLOT,
+        command_connection: bool = settings.PLC_COMMAND_CONNECTION,
+        port: int = settings.PLC_PORT,
+        backend: str = settings.PLC_BACKEND,
+        connect_timeout: float = settings.PLC_CONNECT_TIMEOUT,
+        recv_timeout: float = settings.PLC_RECV_TIMEOUT,
     ):
         self.ip = ip
         self.rack = rack
         self.slot = slot
-        self.client = snap7.client.Client()
+        self.port = port
+        self.backend = backend
+        self.connect_timeout = connect_timeout
+        self.recv_timeout = recv_timeout
+        self.client = self._create_client()
         self._connected = False
+        self.last_ok = 0.0  # time.monotonic() of the last successful PLC call
         self.lock = threading.Lock()
 
+        # Dedicated connection for safety-critical commands
+        self.command_client = self._create_client() if command_connection else None
+        self.command_lock = threading.Lock()
+        self._command_connected = False
+        self._lane = threading.local()
+
+        # Call latency, lock wait, traffic and error counters
+        self.metrics = PLCMetrics()
+
+    def _create_client(self) -> snap7.client.Client:
+        """snap7 client, or the asyncio S7comm client with the same API
+
+        Both get the connect / receive timeouts, so a dead PLC fails a call
+        within recv_timeout instead of the OS TCP timeout.
+        """
+        if self.backend == "asyncio":
+            from .s7comm import SyncS7Client
+            return SyncS7Client(connect_timeout=self.connect_timeout, request_timeout=self.recv_timeout)
+        if self.backend != "snap7":
+            logger.warning(f"Unknown PLC backend '{self.backend}', using snap7")
+        client = snap7.client.Client()
+        client.set_param(Parameter.PingTimeout, int(self.connect_timeout * 1000))
+        client.set_param(Parameter.SendTimeout, int(self.recv_timeout * 1000))
+        client.set_param(Parameter.RecvTimeout, int(self.recv_timeout * 1000))
+        return client
+
     @property
     def connected(self) -> bool:
-        """Check if PLC is connected"""
+        """Check if PLC is connected
+
+        Cached state - set by connect() / disconnect() and cleared by the
+        first call that fails with a connection error. No PLC round trip.
+        """
+        return self._connected
+
+    def mark_command_thread(self) -> None:
+        """Route PLC calls made on the current thread over the command connection"""
+        self._lane.command = True
+
+    def _channel(self) -> Tuple[snap7.client.Client, threading.Lock]:
+        """Client and lock to use for a call on the current thread
+
+        Command threads use the dedicated command connection when it is up
+        and fall back to the shared main connection otherwise.
+        """
+        if self._command_connected and getattr(self._lane, "command", False):
+            return self.command_client, self.command_lock
+        return self.client, self.lock
+
+    @contextmanager
+    def _locked(self, lock: threading.Lock) -> Iterator[None]:
+        """Acquire a connection lock, recording the wait in metrics"""
+        started = time.perf_counter()
+        with lock:
+            self.metrics.record_lock_wait(time.perf_counter() - started)
+            yield
+
+    def _call(self, operation: str, func: Callable[..., Any], *args: Any, nbytes: Optional[int] = None) -> Any:
+        """Run one snap7 call, recording latency, bytes and errors in metrics
+
+        nbytes defaults to the size of the returned data (reads) or of the
+        last argument (writes).
+        """
+        started = time.perf_counter()
         try:
-            if not self._connected:
-                return False
-            # Actually test the connection
-            is_connected = self.client.get_connected()
-            if not is_connected:
-                self._connected = False
-            return is_connected
-        except Exception:
-            self._connected = False
-            return False
+            result = func(*args)
+        except Exception as e:
+            self.metrics.record(operation, time.perf_counter() - started, 0, e)
+            raise
+        if nbytes is None:
+            if isinstance(result, (bytes, bytearray)):
+                nbytes = len(result)
+            elif args and isinstance(args[-1], (bytes, bytearray)):
+                nbytes = len(args[-1])
+            else:
+                nbytes = 0
+        self.metrics.record(operation, time.perf_counter() - started, nbytes)
+        self.last_ok = time.monotonic()
+        return result
 
     def _handle_connection_error(self, error: Exception) -> None:
         """Handle connection errors and mark as disconnected"""
         error_str = str(error)
         if "Socket error" in error_str or "TCP" in error_str or "connection" in error_str.lower():
             self._connected = False
+            self._command_connected = False
+            self.metrics.count("connection_lost")
             logger.warning(f"Connection lost: {error}")
 
+    # ══════════════════════════════════════════════════════════════════════
+    # BIT WRITES - command bits without a read-modify-write of their byte
+    # ══════════════════════════════════════════════════════════════════════
+
+    def _write_bits(self, area: Areas, db_number: int, byte_offset: int, bits: Dict[int, bool]) -> None:
+        """Set/clear several bits of one byte in a single bit-write request
+
+        Each bit is its own WordLen.Bit item (address byte * 8 + bit), so
+        the PLC changes only these bits - nothing is read first and bits
+        the PLC writes in between are kept. Raises on communication errors
+        and on items the PLC rejects.
+        """
+        items = (S7DataItem * len(bits))()
+        buffers = []
+        for item, (bit, state) in zip(items, bits.items()):
+            buffer = ctypes.create_string_buffer(bytes([1 if state else 0]), 1)
+            item.Area = int(area)
+            item.WordLen = int(WordLen.Bit)
+            item.Result = 0
+            item.DBNumber = db_number
+            item.Start = byte_offset * 8 + bit
+            item.Amount = 1
+            item.pData = ctypes.cast(buffer, ctypes.POINTER(ctypes.c_uint8))
+            buffers.append(buffer)
+
+        client, lock = self._channel()
+        with self._locked(lock):
+            self._call("write_bits", self._write_items, client, items, nbytes=len(bits))
+        for item in items:
+            if item.Result:
+                raise RuntimeError(
+                    f"PLC rejected bit {area.name}{db_number}.{item.Start // 8}.{item.Start % 8} "
+                    f"(result {item.Result:#x})"
+                )
+
+    @staticmethod
+    def _write_items(client: snap7.client.Client, items: ctypes.Array) -> None:
+        """Multi-variable write that reports the per-item results on items
+
+        snap7's Client.write_multi_vars() sends a copy of the items, so the
+        results never reach the caller - the library is called directly.
+        """
+        if isinstance(client, snap7.client.Client):
+            check_error(client._lib.Cli_WriteMultiVars(client._s7_client, ctypes.byref(items), len(items)))
+        else:
+            client.write_multi_vars(items)
+
     def connect(self) -> bool:
         """Establish connection to PLC"""
         try:
@@ -62,19 +226,43 @@ class PLCConnector:
                 self.client.disconnect()
             except Exception:
                 pass
-            self.client.connect(self.ip, self.rack, self.slot)
+            self.client.connect(self.ip, self.rack, self.slot, self.port)
             self._connected = self.client.get_connected()
             if self._connected:
+                self.metrics.count("connects")
                 logger.info(f"Connected to PLC at {self.ip}")
+                self._connect_command_client()
             return self._connected
         except Exception as e:
             logger.error(f"PLC connection error: {e}")
+            self.metrics.count("connect_failures")
             self._connected = False
             return False
 
+    def _connect_command_client(self) -> None:
+        """(Re)open the dedicated command connection - optional, never fatal"""
+        if self.command_client is None:
+            return
+        with self.command_lock:
+            self._command_connected = False
+            try:
+                self.command_client.disconnect()
+            except Exception:
+                pass
+            try:
+                self.command_client.connect(self.ip, self.rack, self.slot, self.port)
+                self._command_connected = self.command_client.get_connected()
+            except Exception as e:
+                logger.warning(f"Command connection unavailable, commands share the main connection: {e}")
+
     def disconnect(self):
         """Disconnect from PLC"""
         try:
+            if self.command_client is not None:
+                with self.command_lock:
+                    self._command_connected = False
+                    if self.command_client.get_connected():
+                        self.command_client.disconnect()
             if self.client.get_connected():
                 self.client.disconnect()
             self._connected = False
@@ -82,8 +270,37 @@ class PLCConnector:
         except Exception as e:
             logger.error(f"PLC disconnect error: {e}")
 
+    def ping(self) -> bool:
+        """Probe the connection with a CPU state read
+
+        Returns:
+            False (and marks the connection lost) if the PLC does not answer
+        """
+        if not self._connected:
+            return False
+        try:
+            client, lock = self._channel()
+            with self._locked(lock):
+                self._call("ping", self._probe, client)
+            return True
+        except Exception as e:
+            self._handle_connection_error(e)
+            logger.warning(f"PLC ping failed: {e}")
+            return False
+
+    @staticmethod
+    def _probe(client: snap7.client.Client) -> None:
+        """CPU state request that raises when the PLC does not answer
+
+        snap7's get_cpu_state() ignores the library error code and reports
+        S7CpuStatusUnknown instead, so a dead link would pass as alive.
+        """
+        if client.get_cpu_state() == "S7CpuStatusUnknown":
+            raise ConnectionError("No answer to the CPU state request - connection lost")
+
     def reconnect(self) -> bool:
         """Reconnect to PLC"""
+        self.metrics.count("reconnects")
         self.disconnect()
         return self.connect()
 
@@ -96,8 +313,11 @@ class PLCConnector:
             return "unknown"
 
         try:
-            with self.lock:
-                state = self.client.get_cpu_state()
+            client, lock = self._channel()
+            with self._locked(lock):
+                state = self._call("get_cpu_state", client.get_cpu_state)
+                if isinstance(state, str):
+                    return self.CPU_STATE_NAMES.get(state, "unknown")
                 if state == self.CPU_STATE_RUN:
                     return "run"
                 elif state == self.CPU_STATE_STOP:
@@ -108,13 +328,94 @@ class PLCConnector:
             logger.error(f"Error reading CPU state: {e}")
             return "unknown"
 
+    def read_db(self, db_number: int, start: int, size: int) -> Optional[bytearray]:
+        """Read a contiguous byte range from DB in a single request
+
+        Args:
+            db_number: Data block number (3 for DB3)
+            start: First byte to read
+            size: Number of bytes to read
+
+        Returns:
+            Raw bytes or None if error
+        """
+        if not self.connected:
+            return None
+        try:
+            client, lock = self._channel()
+            with self._locked(lock):
+                return self._call("db_read", client.db_read, db_number, start, size)
+        except Exception as e:
+            self._handle_connection_error(e)
+            logger.error(f"Error reading DB{db_number}.DBB{start} ({size} bytes): {e}")
+            return None
+
+    def read_multi(self, items: Sequence[ReadItem]) -> Optional[List[Optional[bytearray]]]:
+        """Read several DB / PE / PA byte ranges in a single PDU
+
+        Uses snap7's multi-variable read so that e.g. DB3 status and the
+        IW64 load cell are sampled in the same PLC scan.
+
+        Args:
+            items: Byte ranges to read (at most MAX_MULTI_VARS per PDU)
+
+        Returns:
+            One bytearray per item (None for items the PLC rejected),
+            or None if the request failed
+        """
+        if not self.connected:
+            return None
+        if not items:
+            return []
+
+        results: List[Optional[bytearray]] = []
+        try:
+            for first in range(0, len(items), self.MAX_MULTI_VARS):
+                chunk = items[first:first + self.MAX_MULTI_VARS]
+                data_items = (S7DataItem * len(chunk))()
+                buffers = []
+                for data_item, item in zip(data_items, chunk):
+                    buffer = ctypes.create_string_buffer(item.size)
+                    data_item.Area = int(item.area)
+                    data_item.WordLen = int(WordLen.Byte)
+                    data_item.Result = 0
+                    data_item.DBNumber = item.db_number
+                    data_item.Start = item.start
+                    data_item.Amount = item.size
+                    data_item.pData = ctypes.cast(buffer, ctypes.POINTER(ctypes.c_uint8))
+                    buffers.append(buffer)
+
+                client, lock = self._channel()
+                with self._locked(lock):
+                    self._call(
+                        "read_multi_vars", client.read_multi_vars, data_items,
+                        nbytes=sum(item.size for item in chunk),
+                    )
+
+                for data_item, buffer, item in zip(data_items, buffers, chunk):
+                    if data_item.Result == 0:
+                        results.append(bytearray(buffer.raw))
+                    else:
+                        self.metrics.count("failed_items")
+                        logger.error(
+                            f"Multi-read item {item.area.name}{item.db_number}.{item.start} "
+                            f"failed (result {data_item.Result:#x})"
+                        )
+                        results.append(None)
+            return results
+        except Exception as e:
+            self._handle_connection_error(e)
+            logger.error(f"Error in multi-variable read ({len(items)} items): {e}")
+            return None
+
     def read_real(self, db_number: int, offset: int) -> Optional[float]:
         """Read a Real (float) value from DB"""
         if not self.connected:
             return None
         try:
-            with self.lock:
-                data = self.client.db_read(db_number, offset, 4)
+            client, lock = self._channel()
+            with self._locked(lock):
+                data = self._call("db_read", client.db_read, db_number, offset, 4)
                 return get_real(data, 0)
         except Exception as e:
             logger.error(f"Error reading Real from DB{db_number}.{offset}: {e}")
@@ -125,10 +426,11 @@ class PLCConnector:
         if not self.connected:
             return False
         try:
-            with self.lock:
+            client, lock = self._channel()
+            with self._locked(lock):
                 data = bytearray(4)
                 set_real(data, 0, value)
-                self.client.db_write(db_number, offset, data)
+                self._call("db_write", client.db_write, db_number, offset, data)
                 return True
         except Exception as e:
             logger.error(f"Error writing Real to DB{db_number}.{offset}: {e}")
@@ -139,35 +441,55 @@ class PLCConnector:
         if not self.connected:
             return None
         try:
-            with self.lock:
-                data = self.client.db_read(db_number, byte_offset, 1)
+            client, lock = self._channel()
+            with self._locked(lock):
+                data = self._call("db_read", client.db_read, db_number, byte_offset, 1)
                 return get_bool(data, 0, bit_offset)
         except Exception as e:
             logger.error(f"Error reading Bool from DB{db_number}.DBX{byte_offset}.{bit_offset}: {e}")
             return None
 
     def write_bool(self, db_number: int, byte_offset: int, bit_offset: int, value: bool) -> bool:
-        """Write a Bool value to DB"""
+        """Write a Bool value to DB (S7 bit write - the rest of the byte is untouched)"""
         if not self.connected:
             return False
         try:
-            with self.lock:
-                # Read current byte first to preserve other bits
-                data = self.client.db_read(db_number, byte_offset, 1)
-                set_bool(data, 0, bit_offset, value)
-                self.client.db_write(db_number, byte_offset, data)
-                return True
+            self._write_bits(Areas.DB, db_number, byte_offset, {bit_offset: value})
+            return True
         except Exception as e:
+            self._handle_connection_error(e)
             logger.error(f"Error writing Bool to DB{db_number}.DBX{byte_offset}.{bit_offset}: {e}")
             return False
 
+    def write_bits(self, db_number: int, byte_offset: int, bits: Dict[int, bool]) -> bool:
+        """Write several Bool values of one DB byte in a single request
+
+        Args:
+            db_number: Data block number
+            byte_offset: Byte holding the bits
+            bits: bit number -> value, e.g. {1: True, 2: False}
+
+        Returns:
+            True if successful, False otherwise
+        """
+        if not self.connected:
+            return False
+        try:
+            self._write_bits(Areas.DB, db_number, byte_offset, bits)
+            return True
+        except Exception as e:
+            self._handle_connection_error(e)
+            logger.error(f"Error writing Bools {bits} to DB{db_number}.DBB{byte_offset}: {e}")
+            return False
+
     def read_int(self, db_number: int, offset: int) -> Optional[int]:
         """Read an Int (16-bit) value from DB"""
         if not self.connected:
             return None
         try:
-            with self.lock:
-                data = self.client.db_read(db_number, offset, 2)
+            client, lock = self._channel()
+            with self._locked(lock):
+                data = self._call("db_read", client.db_read, db_number, offset, 2)
                 return get_int(data, 0)
         except Exception as e:
             logger.error(f"Error reading Int from DB{db_number}.{offset}: {e}")
@@ -178,11 +500,12 @@ class PLCConnector:
         if not self.connected:
             return False
         try:
-            with self.lock:
+            client, lock = self._channel()
+            with self._locked(lock):
                 data = bytearray(2)
                 data[0] = (value >> 8) & 0xFF
                 data[1] = value & 0xFF
-                self.client.db_write(db_number, offset, data)
+                self._call("db_write", client.db_write, db_number, offset, data)
                 return True
         except Exception as e:
             logger.error(f"Error writing Int to DB{db_number}.{offset}: {e}")
@@ -206,8 +529,9 @@ class PLCConnector:
         if not self.connected:
             return None
         try:
-            with self.lock:
-                data = self.client.read_area(Areas.PE, 0, byte_offset, 1)
+            client, lock = self._channel()
+            with self._locked(lock):
+                data = self._call("read_area", client.read_area, Areas.PE, 0, byte_offset, 1)
                 return get_bool(data, 0, bit)
         except Exception as e:
             self._handle_connection_error(e)
@@ -226,8 +550,9 @@ class PLCConnector:
         if not self.connected:
             return None
         try:
-            with self.lock:
-                data = self.client.read_area(Areas.PE, 0, byte_offset, 1)
+            client, lock = self._channel()
+            with self._locked(lock):
+                data = self._call("read_area", client.read_area, Areas.PE, 0, byte_offset, 1)
                 return data[0]
         except Exception as e:
             self._handle_connection_error(e)
@@ -246,8 +571,9 @@ class PLCConnector:
         if not self.connected:
             return None
         try:
-            with self.lock:
-                data = self.client.read_area(Areas.PE, 0, address, 2)
+            client, lock = self._channel()
+            with self._locked(lock):
+                data = self._call("read_area", client.read_area, Areas.PE, 0, address, 2)
                 return get_int(data, 0)
         except Exception as e:
             self._handle_connection_error(e)
@@ -272,12 +598,8 @@ class PLCConnector:
         if not self.connected:
             return False
         try:
-            with self.lock:
-                # Read current byte to preserve other bits
-                data = self.client.read_area(Areas.PA, 0, byte_offset, 1)
-                set_bool(data, 0, bit, value)
-                self.client.write_area(Areas.PA, 0, byte_offset, data)
-                return True
+            self._write_bits(Areas.PA, 0, byte_offset, {bit: value})
+            return True
         except Exception as e:
             self._handle_connection_error(e)
             logger.error(f"Error writing output Q{byte_offset}.{bit}: {e}")
@@ -296,8 +618,9 @@ class PLCConnector:
         if not self.connected:
             return None
         try:
-            with self.lock:
-                data = self.client.read_area(Areas.PA, 0, byte_offset, 1)
+            client, lock = self._channel()
+            with self._locked(lock):
+                data = self._call("read_area", client.read_area, Areas.PA, 0, byte_offset, 1)
                 return get_bool(data, 0, bit)
         except Exception as e:
             self._handle_connection_error(e)
@@ -1,5 +1,7 @@
-from typing import Dict, Any, Optional
+import struct
+from typing import Dict, Any, List, Optional, Tuple
 from .connector import PLCConnector
+from .tags import MACHINE_TAGS, DB3, DB10, LOAD_CELL_MAX_RAW, LOAD_CELL_MAX_FORCE
 import logging
 
 logger = logging.getLogger(__name__)
@@ -33,116 +35,267 @@ class DataService:
     │ Actual_Speed    │ 10     │ DB3.DBD10    │
     │ Jog_Velocity    │ 16     │ DB3.DBD16    │
     └─────────────────┴────────┴──────────────┘
+
+    DB10 - Sample Ring Buffer (Read, filled by the PLC every cycle):
+    ┌─────────────────┬────────┬──────────────────────────────────┐
+    │ Value           │ Byte   │ Description                      │
+    ├─────────────────┼────────┼──────────────────────────────────┤
+    │ Write_Count     │ 0      │ UDInt - samples written so far  │
+    │ Capacity        │ 4      │ Int - entries in the ring        │
+    │ Entry_Size      │ 6      │ Int - 16                         │
+    │ Entries         │ 8      │ Entry[Capacity]                  │
+    ├─────────────────┼────────┼──────────────────────────────────┤
+    │ Entry.Time      │ +0     │ UDInt - PLC clock (µs)           │
+    │ Entry.Force     │ +4     │ Real - kN                        │
+    │ Entry.Position  │ +8     │ Real - mm                        │
+    │ Entry.Deflection│ +12    │ Real - mm                        │
+    └─────────────────┴────────┴──────────────────────────────────┘
+    Sample n is stored in entry n mod Capacity.
     """
 
-    DB_NUMBER = 3  # DB3 - Servo Control
+    DB_NUMBER = DB3  # DB3 - Servo Control
+
+    # Addresses come from the MACHINE_TAGS schema in tags.py; the constants
+    # below are kept for code that writes single bits / values.
 
     # ═══════════════════════════════════════════════════════════════════
     # STATUS - Bool values
     # ═══════════════════════════════════════════════════════════════════
-    STATUS_ENABLE = (0, 0)        # DB3.DBX0.0 - Enable command
-    STATUS_SERVO_READY = (0, 7)   # DB3.DBX0.7 - Servo ready
-    STATUS_SERVO_ERROR = (1, 0)   # DB3.DBX1.0 - Servo error
-    STATUS_AT_HOME = (1, 1)       # DB3.DBX1.1 - At home position
-    STATUS_LOCK_UPPER = (14, 0)   # DB3.DBX14.0 - Upper clamp
-    STATUS_LOCK_LOWER = (14, 1)   # DB3.DBX14.1 - Lower clamp
-    STATUS_MC_POWER = (20, 0)     # DB3.DBX20.0 - MC Power status
-    STATUS_MC_BUSY = (20, 1)      # DB3.DBX20.1 - MC Busy
-    STATUS_MC_ERROR = (20, 2)     # DB3.DBX20.2 - MC Error
-    STATUS_REMOTE_MODE = (25, 0)  # DB3.DBX25.0 - Remote mode
-    STATUS_ESTOP_ACTIVE = (25, 1) # DB3.DBX25.1 - E-Stop latched state
+    STATUS_ENABLE = MACHINE_TAGS.address("servo_enabled")         # DB3.DBX0.0
+    STATUS_SERVO_READY = MACHINE_TAGS.address("servo_ready")      # DB3.DBX0.7
+    STATUS_SERVO_ERROR = MACHINE_TAGS.address("servo_error")      # DB3.DBX1.0
+    STATUS_AT_HOME = MACHINE_TAGS.address("at_home")              # DB3.DBX1.1
+    STATUS_LOCK_UPPER = MACHINE_TAGS.address("lock_upper")        # DB3.DBX14.0
+    STATUS_LOCK_LOWER = MACHINE_TAGS.address("lock_lower")        # DB3.DBX14.1
+    STATUS_MC_POWER = MACHINE_TAGS.address("mc_power")            # DB3.DBX20.0
+    STATUS_MC_BUSY = MACHINE_TAGS.address("mc_busy")              # DB3.DBX20.1
+    STATUS_MC_ERROR = MACHINE_TAGS.address("mc_error")            # DB3.DBX20.2
+    STATUS_REMOTE_MODE = MACHINE_TAGS.address("remote_mode")      # DB3.DBX25.0
+    STATUS_ESTOP_ACTIVE = MACHINE_TAGS.address("e_stop_active")   # DB3.DBX25.1
 
     # ═══════════════════════════════════════════════════════════════════
     # REAL VALUES
     # ═══════════════════════════════════════════════════════════════════
-    VAL_ACTUAL_POSITION = 2       # DB3.DBD2 - Actual position
-    VAL_TARGET_POSITION = 6       # DB3.DBD6 - Target position
-    VAL_ACTUAL_SPEED = 10         # DB3.DBD10 - Actual speed
-    VAL_JOG_VELOCITY = 16         # DB3.DBD16 - Jog velocity
+    VAL_ACTUAL_POSITION = MACHINE_TAGS.address("actual_position")  # DB3.DBD2
+    VAL_TARGET_POSITION = MACHINE_TAGS.address("target_position")  # DB3.DBD6
+    VAL_ACTUAL_SPEED = MACHINE_TAGS.address("actual_speed")        # DB3.DBD10
+    VAL_JOG_VELOCITY = MACHINE_TAGS.address("jog_velocity")        # DB3.DBD16
 
     # ═══════════════════════════════════════════════════════════════════
     # HARDWARE INPUTS (I Area) - Direct from sensors
     # ═══════════════════════════════════════════════════════════════════
-    ANALOG_LOAD_CELL = 64         # IW64 - Load cell (0-27648 = 0-10V)
+    ANALOG_LOAD_CELL = MACHINE_TAGS.address("load_cell_raw")       # IW64
 
     # Load cell scaling
-    LOAD_CELL_MAX_RAW = 27648
-    LOAD_CELL_MAX_FORCE = 200.0   # kN
+    LOAD_CELL_MAX_RAW = LOAD_CELL_MAX_RAW
+    LOAD_CELL_MAX_FORCE = LOAD_CELL_MAX_FORCE  # kN
+
+    # ═══════════════════════════════════════════════════════════════════
+    # SNAPSHOT - DB3.DBB0..DBB25 + IW64 in one multi-variable PDU
+    # ═══════════════════════════════════════════════════════════════════
+    LIVE_TAGS = MACHINE_TAGS.compile([
+        "servo_ready", "servo_error", "servo_enabled", "at_home",
+        "lock_upper", "lock_lower", "remote_mode",
+        "mc_power", "mc_busy", "mc_error", "e_stop_active",
+        "actual_position", "target_position", "actual_speed", "jog_velocity",
+        "load_cell_raw", "actual_force",
+    ])
+    SNAPSHOT_ITEMS = LIVE_TAGS.read_items
+
+    # ═══════════════════════════════════════════════════════════════════
+    # MULTI-RATE - fast: force + motion every poll, slow: status bits
+    # ═══════════════════════════════════════════════════════════════════
+    FAST_TAGS = MACHINE_TAGS.compile([
+        "actual_position", "actual_speed", "load_cell_raw", "actual_force",
+    ])
+    SLOW_TAGS = MACHINE_TAGS.compile([
+        "servo_ready", "servo_error", "servo_enabled", "at_home",
+        "lock_upper", "lock_lower", "remote_mode",
+        "mc_power", "mc_busy", "mc_error", "e_stop_active",
+        "target_position", "jog_velocity",
+    ])
+    FAST_ITEMS = FAST_TAGS.read_items                    # DB3.DBB2..13 + IW64
+    FAST_SLOW_ITEMS = FAST_ITEMS + SLOW_TAGS.read_items  # + DB3.DBB0..25
+
+    # ═══════════════════════════════════════════════════════════════════
+    # SAMPLE RING BUFFER - DB10
+    # ═══════════════════════════════════════════════════════════════════
+    SAMPLE_DB = DB10
+    SAMPLE_HEADER_TAGS = MACHINE_TAGS.compile([
+        "sample_write_count", "sample_capacity", "sample_entry_size",
+    ])
+    SAMPLE_HEADER_SIZE = 8
+    SAMPLE_ENTRY = struct.Struct(">Ifff")  # time (µs), force, position, deflection
 
     def __init__(self, plc: PLCConnector):
         self.plc = plc
 
-    def _scale_load_cell(self, raw_value: int) -> float:
-        """Scale raw analog value to kN"""
-        if raw_value is None or raw_value < 0:
-            return 0.0
-        return (raw_value / self.LOAD_CELL_MAX_RAW) * self.LOAD_CELL_MAX_FORCE
+        # Ring buffer download state (I/O thread only)
+        self._sample_count: Optional[int] = None
+        self._sample_time: Optional[int] = None
+        self._sample_clock = 0.0
+        self.samples_lost = 0
 
     def get_live_data(self) -> Dict[str, Any]:
-        """Read all real-time values from DB3"""
+        """Read all real-time values from DB3
+
+        The DB3 range and the IW64 load cell are fetched in a single
+        multi-variable PDU and decoded by the precompiled LIVE_TAGS
+        decoder, so force and position come from the same PLC scan.
+        """
         if not self.plc.connected:
             return self._get_disconnected_data()
 
         try:
-            # Read load cell
-            load_cell_raw = self.plc.read_analog_input(self.ANALOG_LOAD_CELL) or 0
-            actual_force = self._scale_load_cell(load_cell_raw)
-
-            return {
-                # ═══════════════════════════════════════════════════════════
-                # STATUS from DB3
-                # ═══════════════════════════════════════════════════════════
-                "servo_ready": self.plc.read_bool(self.DB_NUMBER, *self.STATUS_SERVO_READY) or False,
-                "servo_error": self.plc.read_bool(self.DB_NUMBER, *self.STATUS_SERVO_ERROR) or False,
-                "servo_enabled": self.plc.read_bool(self.DB_NUMBER, *self.STATUS_ENABLE) or False,
-                "at_home": self.plc.read_bool(self.DB_NUMBER, *self.STATUS_AT_HOME) or False,
-                "lock_upper": self.plc.read_bool(self.DB_NUMBER, *self.STATUS_LOCK_UPPER) or False,
-                "lock_lower": self.plc.read_bool(self.DB_NUMBER, *self.STATUS_LOCK_LOWER) or False,
-                "remote_mode": self.plc.read_bool(self.DB_NUMBER, *self.STATUS_REMOTE_MODE) or False,
-                "mc_power": self.plc.read_bool(self.DB_NUMBER, *self.STATUS_MC_POWER) or False,
-                "mc_busy": self.plc.read_bool(self.DB_NUMBER, *self.STATUS_MC_BUSY) or False,
-                "mc_error": self.plc.read_bool(self.DB_NUMBER, *self.STATUS_MC_ERROR) or False,
-                "e_stop_active": self.plc.read_bool(self.DB_NUMBER, *self.STATUS_ESTOP_ACTIVE) or False,
-
-                # ═══════════════════════════════════════════════════════════
-                # REAL VALUES from DB3
-                # ═══════════════════════════════════════════════════════════
-                "actual_position": self.plc.read_real(self.DB_NUMBER, self.VAL_ACTUAL_POSITION) or 0.0,
-                "target_position": self.plc.read_real(self.DB_NUMBER, self.VAL_TARGET_POSITION) or 0.0,
-                "actual_speed": self.plc.read_real(self.DB_NUMBER, self.VAL_ACTUAL_SPEED) or 0.0,
-                "jog_velocity": self.plc.read_real(self.DB_NUMBER, self.VAL_JOG_VELOCITY) or 0.0,
-
-                # ═══════════════════════════════════════════════════════════
-                # ANALOG INPUT - Load Cell
-                # ═══════════════════════════════════════════════════════════
-                "load_cell_raw": load_cell_raw,
-                "actual_force": actual_force,
-
-                # ═══════════════════════════════════════════════════════════
-                # CALCULATED / DEFAULTS
-                # ═══════════════════════════════════════════════════════════
-                "actual_deflection": 0.0,
-                "target_deflection": 0.0,
-                "ring_stiffness": 0.0,
-                "force_at_target": 0.0,
-                "sn_class": 0,
-                "test_status": 0,
-                "test_passed": False,
-
-                # ═══════════════════════════════════════════════════════════
-                # PLC STATUS
-                # ═══════════════════════════════════════════════════════════
-                "connected": True,
-                "plc": {
-                    "connected": True,
-                    "cpu_state": self.plc.get_cpu_state(),
-                    "ip": self.plc.ip
-                }
-            }
+            results = self.plc.read_multi(self.SNAPSHOT_ITEMS)
+            if results is None or results[0] is None:
+                return self._get_disconnected_data()
+            data = self.LIVE_TAGS.decode(results)
+            data.update(self._status_fields())
+            return data
+        except Exception as e:
+            logger.error(f"Error reading live data: {e}")
+            return self._get_disconnected_data()
+
+    def get_multi_rate_data(self, include_slow: bool) -> Dict[str, Any]:
+        """Read the fast fields (force, position, speed), plus the slow ones if asked
+
+        Both groups travel in one multi-variable PDU when include_slow is
+        set. Returns only the fields read this time, or the full
+        disconnected dict ("connected": False) when the read fails -
+        callers merge the result into their last snapshot.
+        """
+        if not self.plc.connected:
+            return self._get_disconnected_data()
+
+        try:
+            items = self.FAST_SLOW_ITEMS if include_slow else self.FAST_ITEMS
+            results = self.plc.read_multi(items)
+            fast_count = len(self.FAST_ITEMS)
+            if results is None or results[0] is None or (include_slow and results[fast_count] is None):
+                return self._get_disconnected_data()
+
+            data = self.FAST_TAGS.decode(results[:fast_count])
+            if include_slow:
+                data.update(self.SLOW_TAGS.decode(results[fast_count:]))
+                data.update(self._status_fields())
+            return data
         except Exception as e:
             logger.error(f"Error reading live data: {e}")
             return self._get_disconnected_data()
 
+    def _status_fields(self) -> Dict[str, Any]:
+        """Calculated fields and PLC status of a connected snapshot"""
+        return {
+            # ═══════════════════════════════════════════════════════════
+            # CALCULATED / DEFAULTS
+            # ═══════════════════════════════════════════════════════════
+            "actual_deflection": 0.0,
+            "target_deflection": 0.0,
+            "ring_stiffness": 0.0,
+            "force_at_target": 0.0,
+            "sn_class": 0,
+            "test_status": 0,
+            "test_passed": False,
+
+            # ═══════════════════════════════════════════════════════════
+            # PLC STATUS
+            # ═══════════════════════════════════════════════════════════
+            "connected": True,
+            "plc": {
+                "connected": True,
+                "cpu_state": self.plc.get_cpu_state(),
+                "ip": self.plc.ip
+            }
+        }
+
+    # ========== Buffered Acquisition (DB10 ring buffer) ==========
+
+    def start_samples(self):
+        """Start a new buffered acquisition
+
+        The next read_samples() call only syncs to the PLC's write count,
+        so the curve starts with samples taken after this call.
+        """
+        self._sample_count = None
+        self._sample_time = None
+        self._sample_clock = 0.0
+        self.samples_lost = 0
+
+    def read_samples(self) -> Optional[List[Tuple[float, float, float, float]]]:
+        """Download all ring buffer entries written since the last call
+
+        Reads the DB10 header, then the new entries in one db_read (two if
+        they wrap around the end of the ring), then the write count again:
+        the reads are separate requests, so entries the PLC overwrote in
+        between are dropped. If the PLC wrote more than Capacity - 1
+        entries since the last call the oldest are lost and counted in
+        samples_lost.
+
+        Returns:
+            [(time, force, position, deflection), ...] with time in seconds
+            of PLC clock since the first sample, or None if the read failed
+        """
+        header = self.plc.read_db(self.SAMPLE_DB, 0, self.SAMPLE_HEADER_SIZE)
+        if header is None:
+            return None
+        info = self.SAMPLE_HEADER_TAGS.decode([header])
+        count = info["sample_write_count"]
+        capacity = info["sample_capacity"]
+        entry_size = self.SAMPLE_ENTRY.size
+        if capacity <= 1 or info["sample_entry_size"] != entry_size:
+            logger.error(f"DB{self.SAMPLE_DB} is not a sample ring buffer: {info}")
+            return None
+
+        if self._sample_count is None:
+            self._sample_count = count
+            return []
+
+        new = (count - self._sample_count) & 0xFFFFFFFF
+        if new == 0:
+            return []
+        if new > capacity - 1:
+            # The entry being written next may be in progress - keep one slot spare
+            lost = new - (capacity - 1)
+            self.samples_lost += lost
+            logger.warning(f"Sample ring buffer overrun: {lost} samples lost")
+            new = capacity - 1
+
+        slot = ((count - new) & 0xFFFFFFFF) % capacity
+        first_part = min(new, capacity - slot)
+        data = self.plc.read_db(self.SAMPLE_DB, self.SAMPLE_HEADER_SIZE + slot * entry_size, first_part * entry_size)
+        if data is not None and first_part < new:
+            rest = self.plc.read_db(self.SAMPLE_DB, self.SAMPLE_HEADER_SIZE, (new - first_part) * entry_size)
+            data = data + rest if rest is not None else None
+        if data is None:
+            return None
+
+        # Entries at or before after - capacity may have been overwritten
+        # (the slot of after - capacity is the one being written next)
+        check = self.plc.read_db(self.SAMPLE_DB, 0, self.SAMPLE_HEADER_SIZE)
+        if check is None:
+            return None
+        after = self.SAMPLE_HEADER_TAGS.decode([check])["sample_write_count"]
+        overwritten = min(new, ((after - count) & 0xFFFFFFFF) + new - (capacity - 1))
+        if overwritten > 0:
+            self.samples_lost += overwritten
+            logger.warning(f"Sample ring buffer overrun during download: {overwritten} samples lost")
+            data = data[overwritten * entry_size:]
+        self._sample_count = count
+
+        samples = []
+        last_time = self._sample_time
+        clock = self._sample_clock
+        for time_us, force, position, deflection in self.SAMPLE_ENTRY.iter_unpack(data):
+            if last_time is not None:
+                # UDInt µs clock wraps every ~71 minutes
+                clock += ((time_us - last_time) & 0xFFFFFFFF) / 1_000_000
+            last_time = time_us
+            samples.append((clock, force, position, deflection))
+        self._sample_time = last_time
+        self._sample_clock = clock
+        return samples
+
     def _get_disconnected_data(self) -> Dict[str, Any]:
         """Default values when disconnected"""
         return {
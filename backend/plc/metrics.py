@@ -0,0 +1,129 @@
+import bisect
+import threading
+import time
+from typing import Any, Dict, Optional, Sequence
+
+
+# Histogram bucket upper bounds (ms) - the last bucket is open-ended
+BUCKETS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram - constant memory, O(log buckets) record"""
+
+    def __init__(self, bounds: Sequence[float] = BUCKETS_MS):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float):
+        ms = seconds * 1000
+        self.counts[bisect.bisect_left(self.bounds, ms)] += 1
+        self.count += 1
+        self.total += ms
+        if ms > self.max:
+            self.max = ms
+
+    def percentile(self, fraction: float) -> float:
+        """Upper bound of the bucket holding the given fraction (ms)"""
+        if not self.count:
+            return 0.0
+        rank = fraction * self.count
+        seen = 0
+        for bound, count in zip(self.bounds, self.counts):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "mean_ms": self.total / self.count if self.count else 0.0,
+            "p50_ms": self.percentile(0.50),
+            "p95_ms": self.percentile(0.95),
+            "p99_ms": self.percentile(0.99),
+            "max_ms": self.max,
+            "buckets": {
+                **{f"le_{bound}": count for bound, count in zip(self.bounds, self.counts)},
+                "inf": self.counts[-1],
+            },
+        }
+
+
+class OperationStats:
+    """Latency, traffic and error counts of one snap7 operation"""
+
+    def __init__(self):
+        self.latency = LatencyHistogram()
+        self.bytes = 0
+        self.errors = 0
+        self.last_error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "latency": self.latency.to_dict(),
+            "bytes": self.bytes,
+            "errors": self.errors,
+            "last_error": self.last_error,
+        }
+
+
+class PLCMetrics:
+    """In-memory PLC call metrics, recorded by PLCConnector
+
+    operations: Per snap7 call (db_read, db_write, read_area, write_bits,
+                read_multi_vars, get_cpu_state) - time on the wire, bytes
+                transferred and exceptions
+    lock_wait: Time callers waited for a connection lock, i.e. time lost
+               in our own code behind other PLC calls
+    counters: Connection events and degraded reads (see count())
+
+    Everything lives in fixed-size structures, so overhead stays bounded
+    no matter how long the backend runs.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started = time.time()
+        self.operations: Dict[str, OperationStats] = {}
+        self.lock_wait = LatencyHistogram()
+        self.counters: Dict[str, int] = {}
+
+    def record(self, operation: str, duration: float, nbytes: int = 0, error: Optional[Exception] = None):
+        with self._lock:
+            stats = self.operations.get(operation)
+            if stats is None:
+                stats = self.operations[operation] = OperationStats()
+            stats.latency.record(duration)
+            stats.bytes += nbytes
+            if error is not None:
+                stats.errors += 1
+                stats.last_error = str(error)
+
+    def record_lock_wait(self, seconds: float):
+        with self._lock:
+            self.lock_wait.record(seconds)
+
+    def count(self, name: str, amount: int = 1):
+        """Bump an event counter (connects, connection_lost, failed_items, ...)"""
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def reset(self):
+        with self._lock:
+            self.started = time.time()
+            self.operations = {}
+            self.lock_wait = LatencyHistogram()
+            self.counters = {}
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "since": self.started,
+                "operations": {name: stats.to_dict() for name, stats in self.operations.items()},
+                "lock_wait": self.lock_wait.to_dict(),
+                "counters": dict(self.counters),
+            }
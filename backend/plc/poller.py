@@ -0,0 +1,228 @@
+import asyncio
+import logging
+import time
+from types import MappingProxyType
+from typing import Any, Dict, Hashable, Mapping, NamedTuple, Optional, Set
+
+from config import settings
+from .async_connector import AsyncPLCConnector
+from .data_service import DataService
+
+logger = logging.getLogger(__name__)
+
+
+class LiveSnapshot(NamedTuple):
+    """Immutable live data sample published by PLCPoller
+
+    seq: Increments by one for every published snapshot
+    timestamp: Wall clock time of the sample (epoch seconds)
+    monotonic: Event loop time of the sample, for interval math
+    data: Read-only view of the DataService.get_live_data() dict
+    field_timestamps: Wall clock time each field of data was last read -
+                      slow-path fields lag timestamp in multi-rate mode
+    """
+    seq: int
+    timestamp: float
+    monotonic: float
+    data: Mapping[str, Any]
+    field_timestamps: Mapping[str, float]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dict copy for JSON / Socket.IO, with seq and timestamps"""
+        result = {
+            key: dict(value) if isinstance(value, Mapping) else value
+            for key, value in self.data.items()
+        }
+        result["seq"] = self.seq
+        result["timestamp"] = self.timestamp
+        result["field_timestamps"] = dict(self.field_timestamps)
+        return result
+
+
+def _freeze(data: Dict[str, Any]) -> Mapping[str, Any]:
+    """Wrap a live data dict (and its nested dicts) in read-only views"""
+    return MappingProxyType({
+        key: MappingProxyType(dict(value)) if isinstance(value, dict) else value
+        for key, value in data.items()
+    })
+
+
+class PLCPoller:
+    """Single owner of the live data PLC reads
+
+    One background task reads the PLC and publishes a LiveSnapshot. The
+    WebSocket broadcast, test recording and the /api/status route all read
+    the latest snapshot instead of polling the PLC themselves, so PLC
+    traffic does not grow with consumers.
+
+    In multi-rate mode each poll reads only force, position and speed;
+    status bits and the CPU state ride along every slow_interval and are
+    carried over in between (see LiveSnapshot.field_timestamps).
+
+    The polling interval follows the machine state:
+        active_interval  while a high rate is requested (test recording)
+                         or the axis is moving (mc_busy, or |actual_speed|
+                         above moving_speed)
+        interval         while live data subscribers are connected
+        idle_interval    otherwise
+    """
+
+    def __init__(
+        self,
+        data_service: DataService,
+        plc_io: AsyncPLCConnector,
+        interval: float = settings.WS_UPDATE_INTERVAL,
+        idle_interval: float = settings.POLL_IDLE_INTERVAL,
+        active_interval: float = settings.POLL_ACTIVE_INTERVAL,
+        multi_rate: bool = settings.POLL_MULTI_RATE,
+        slow_interval: float = settings.POLL_SLOW_INTERVAL,
+        moving_speed: float = settings.POLL_MOVING_SPEED,
+    ):
+        self.data_service = data_service
+        self.plc_io = plc_io
+        self.interval = interval
+        self.idle_interval = idle_interval
+        self.active_interval = active_interval
+        self.multi_rate = multi_rate
+        self.slow_interval = slow_interval
+        self.moving_speed = moving_speed
+        self._next_slow = 0.0
+        self.subscribers = 0
+        self._high_rate: Set[Hashable] = set()
+        self._wake = asyncio.Event()
+        now = time.time()
+        data = data_service._get_disconnected_data()
+        self._snapshot = LiveSnapshot(
+            seq=0,
+            timestamp=now,
+            monotonic=time.monotonic(),
+            data=_freeze(data),
+            field_timestamps=MappingProxyType(dict.fromkeys(data, now)),
+        )
+        self._updated = asyncio.Condition()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def current_interval(self) -> float:
+        """Polling interval for the current machine / test state"""
+        if self._high_rate or self._is_moving(self._snapshot.data):
+            return self.active_interval
+        if self.subscribers > 0:
+            return self.interval
+        return self.idle_interval
+
+    def _is_moving(self, data: Mapping[str, Any]) -> bool:
+        """Axis busy or faster than moving_speed - REAL speed noise at rest is ignored"""
+        return bool(data.get("mc_busy")) or abs(data.get("actual_speed", 0.0)) > self.moving_speed
+
+    def set_subscribers(self, count: int):
+        """Number of live data subscribers (WebSocket clients)"""
+        previous, self.subscribers = self.subscribers, count
+        if previous == 0 and count > 0:
+            self._wake.set()
+
+    def request_high_rate(self, owner: Hashable):
+        """Poll at active_interval until release_high_rate(owner)"""
+        self._high_rate.add(owner)
+        self._wake.set()
+
+    def release_high_rate(self, owner: Hashable):
+        self._high_rate.discard(owner)
+
+    @property
+    def snapshot(self) -> LiveSnapshot:
+        """Latest published snapshot"""
+        return self._snapshot
+
+    async def wait_for_update(self, last_seq: int) -> LiveSnapshot:
+        """Wait for a snapshot newer than last_seq and return it"""
+        async with self._updated:
+            await self._updated.wait_for(lambda: self._snapshot.seq > last_seq)
+            return self._snapshot
+
+    async def poll_once(self) -> LiveSnapshot:
+        """Read the PLC once (on the I/O thread) and publish the result"""
+        if not self.multi_rate:
+            data = await self.plc_io.run(self.data_service.get_live_data)
+            return await self._publish(data)
+
+        loop = asyncio.get_running_loop()
+        # Full read after a disconnect so no stale status survives
+        include_slow = loop.time() >= self._next_slow or not self._snapshot.data.get("connected")
+        data = await self.plc_io.run(self.data_service.get_multi_rate_data, include_slow)
+        if include_slow and data.get("connected"):
+            self._next_slow = loop.time() + self.slow_interval
+        return await self._publish(data)
+
+    async def _publish(self, data: Dict[str, Any]) -> LiveSnapshot:
+        """Publish a new snapshot and wake up waiting consumers
+
+        data may hold only the fields read this time - the others are
+        carried over from the previous snapshot with their timestamps.
+        """
+        now = time.time()
+        previous = self._snapshot
+        if data.get("connected") is False or data.keys() >= previous.data.keys():
+            merged, field_timestamps = data, dict.fromkeys(data, now)
+        else:
+            merged = dict(previous.data)
+            merged.update(data)
+            field_timestamps = dict(previous.field_timestamps)
+            field_timestamps.update(dict.fromkeys(data, now))
+        snapshot = LiveSnapshot(
+            seq=previous.seq + 1,
+            timestamp=now,
+            monotonic=asyncio.get_running_loop().time(),
+            data=_freeze(merged),
+            field_timestamps=MappingProxyType(field_timestamps),
+        )
+        async with self._updated:
+            self._snapshot = snapshot
+            self._updated.notify_all()
+        return snapshot
+
+    async def _run(self):
+        """Background polling loop"""
+        logger.info(
+            f"PLC poller started ({self.idle_interval * 1000:.0f} / {self.interval * 1000:.0f} / "
+            f"{self.active_interval * 1000:.0f} ms idle / watched / active interval)"
+        )
+        loop = asyncio.get_running_loop()
+        next_tick = loop.time()
+        interval = None
+
+        while True:
+            try:
+                await self.poll_once()
+            except Exception as e:
+                logger.error(f"Error polling PLC: {e}")
+
+            if self.current_interval != interval:
+                interval = self.current_interval
+                logger.debug(f"PLC polling interval: {interval * 1000:.0f} ms")
+
+            next_tick += interval
+            delay = next_tick - loop.time()
+            if delay < 0:
+                # Overran - restart the schedule from now instead of bursting
+                next_tick = loop.time()
+                delay = 0
+
+            # A subscriber or a test starting cuts a long idle sleep short
+            self._wake.clear()
+            try:
+                await asyncio.wait_for(self._wake.wait(), delay)
+                next_tick = loop.time()
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self):
+        """Start the background polling task"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self):
+        """Stop the background polling task"""
+        if self._task and not self._task.done():
+            self._task.cancel()
+            logger.info("PLC poller stopped")
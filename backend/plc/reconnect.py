@@ -0,0 +1,110 @@
+import asyncio
+import logging
+import random
+import time
+from typing import Awaitable, Callable, List, Optional
+
+from config import settings
+from .async_connector import AsyncPLCConnector
+
+logger = logging.getLogger(__name__)
+
+
+class ReconnectWorker:
+    """Keeps the PLC connection up in the background
+
+    Watches the cached PLCConnector.connected flag (cleared by the first
+    call that fails with a connection error) and reconnects with
+    exponential backoff plus jitter: min_delay, 2 * min_delay, ... up to
+    max_delay, each randomised to 50-100 % so several backends do not hit
+    the PLC in lockstep. The first attempt after a loss is immediate.
+
+    A connected PLC that has not answered any call for ping_timeout is
+    probed with a CPU state read, so a silent link is noticed even while
+    nothing else talks to the PLC.
+
+    Listeners (see add_listener) are awaited with the new state whenever
+    the connection goes up or down.
+    """
+
+    def __init__(
+        self,
+        plc_io: AsyncPLCConnector,
+        min_delay: float = settings.PLC_RECONNECT_MIN_DELAY,
+        max_delay: float = settings.PLC_RECONNECT_MAX_DELAY,
+        ping_timeout: float = settings.PLC_PING_TIMEOUT,
+        check_interval: float = 0.1,
+    ):
+        self.plc_io = plc_io
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.ping_timeout = ping_timeout
+        self.check_interval = check_interval
+        self.attempts = 0  # Failed attempts since the connection was lost
+        self._listeners: List[Callable[[bool], Awaitable[None]]] = []
+        self._task: Optional[asyncio.Task] = None
+
+    def add_listener(self, callback: Callable[[bool], Awaitable[None]]):
+        """Await callback(connected) on every connection state change"""
+        self._listeners.append(callback)
+
+    def backoff(self, attempt: int) -> float:
+        """Delay before the given retry (0 = first retry after a failure)"""
+        delay = min(self.max_delay, self.min_delay * 2 ** attempt)
+        return random.uniform(delay / 2, delay)
+
+    async def _notify(self, connected: bool):
+        for callback in self._listeners:
+            try:
+                await callback(connected)
+            except Exception as e:
+                logger.error(f"Connection listener failed: {e}")
+
+    async def _run(self):
+        """Background watch / reconnect loop"""
+        plc = self.plc_io.plc
+        last_connected = plc.connected
+        if not last_connected:
+            self.attempts = 1  # The startup connect already failed
+        logger.info(
+            f"PLC reconnect worker started ({self.min_delay:.1f}-{self.max_delay:.1f} s backoff, "
+            f"{self.ping_timeout:.1f} s ping timeout)"
+        )
+
+        while True:
+            try:
+                if plc.connected:
+                    if time.monotonic() - plc.last_ok > self.ping_timeout:
+                        await self.plc_io.ping()
+                    await asyncio.sleep(self.check_interval)
+                else:
+                    if self.attempts:
+                        await asyncio.sleep(self.backoff(self.attempts - 1))
+                    if await self.plc_io.connect():
+                        logger.info(f"Reconnected to PLC after {self.attempts + 1} attempt(s)")
+                        self.attempts = 0
+                    else:
+                        self.attempts += 1
+
+                connected = plc.connected
+                if connected != last_connected:
+                    last_connected = connected
+                    if not connected:
+                        logger.warning("PLC connection lost - reconnecting in the background")
+                    await self._notify(connected)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Error in PLC reconnect worker: {e}")
+                await asyncio.sleep(self.check_interval)
+
+    def start(self):
+        """Start the background reconnect task"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self):
+        """Stop the background reconnect task"""
+        if self._task and not self._task.done():
+            self._task.cancel()
+            logger.info("PLC reconnect worker stopped")
@@ -0,0 +1,468 @@
+"""
+Native asyncio S7comm client (ISO-on-TCP / RFC 1006)
+
+S7Client speaks S7comm over asyncio streams: COTP connection, PDU size
+negotiation, DB / process image reads and writes (split to the
+negotiated PDU size), multi-variable reads, bit writes and the CPU
+state SZL.
+Every request carries its own PDU reference, so up to the negotiated
+number of requests are in flight at once - a large read split over
+several PDUs costs about one round trip instead of one per PDU.
+
+SyncS7Client wraps it in the blocking snap7.client.Client surface used
+by PLCConnector, selected with PLC_BACKEND=asyncio.
+"""
+
+import asyncio
+import ctypes
+import logging
+import struct
+import threading
+from typing import Any, Awaitable, Dict, List, Optional, Sequence, Tuple, TypeVar
+
+from snap7.client import Area as Areas
+from snap7.type import WordLen
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+TPKT = struct.Struct(">BBH")           # version 3, reserved, total length
+COTP_DT = b"\x02\xf0\x80"              # data TPDU, last fragment
+S7_HEADER = struct.Struct(">BBHHHH")   # 0x32, ROSCTR, reserved, PDU ref, param len, data len
+S7_ERROR = struct.Struct(">BB")        # error class / code of ACK_DATA
+DATA_ITEM = struct.Struct(">BBH")      # return code, transport size, length
+
+ROSCTR_JOB = 0x01
+ROSCTR_ACK_DATA = 0x03
+ROSCTR_USERDATA = 0x07
+
+FUNC_READ = 0x04
+FUNC_WRITE = 0x05
+FUNC_SETUP = 0xF0
+
+RESULT_OK = 0xFF
+TS_BIT = 0x03
+TS_BYTE = 0x04          # length in bits
+TS_INT = 0x05           # length in bits
+TS_OCTET = 0x09         # length in bytes
+
+# Bytes of a PDU not available for data
+READ_OVERHEAD = 18      # header 12 + param 2 + item header 4
+WRITE_OVERHEAD = 28     # header 10 + param 14 + item header 4
+
+SZL_CPU_STATE = 0x0424
+
+# Same strings as snap7.client.Client.get_cpu_state()
+CPU_STATES = {0x00: "S7CpuStatusUnknown", 0x04: "S7CpuStatusStop", 0x08: "S7CpuStatusRun"}
+
+
+class S7Error(Exception):
+    """S7 protocol error reported by the PLC"""
+
+
+class S7ConnectionError(S7Error):
+    """TCP connection lost, refused or timed out"""
+
+
+def _item_spec(area: Areas, db_number: int, start: int, size: int) -> bytes:
+    """S7ANY address of a byte range"""
+    return struct.pack(
+        ">BBBBHHB", 0x12, 0x0A, 0x10, 0x02, size, db_number, int(area)
+    ) + (start * 8).to_bytes(3, "big")
+
+
+def _bit_spec(area: Areas, db_number: int, address: int) -> bytes:
+    """S7ANY address of a single bit (address = byte * 8 + bit)"""
+    return struct.pack(
+        ">BBBBHHB", 0x12, 0x0A, 0x10, 0x01, 1, db_number, int(area)
+    ) + address.to_bytes(3, "big")
+
+
+class S7Client:
+    """asyncio S7comm client
+
+    connect_timeout: TCP connect + COTP / S7 setup (seconds)
+    request_timeout: Time to wait for a response before the connection is
+                     considered dead (seconds)
+    pdu_size: PDU size requested - the PLC may negotiate it down
+    max_in_flight: Requested pipelining depth - the PLC may negotiate it down
+    """
+
+    def __init__(
+        self,
+        connect_timeout: float = 3.0,
+        request_timeout: float = 2.0,
+        pdu_size: int = 960,
+        max_in_flight: int = 8,
+    ):
+        self.connect_timeout = connect_timeout
+        self.request_timeout = request_timeout
+        self.requested_pdu_size = pdu_size
+        self.requested_in_flight = max_in_flight
+        self.pdu_size = 0
+        self.max_in_flight = 1
+
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._reader_task: Optional[asyncio.Task] = None
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._ref = 0
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._connected = False
+
+    @property
+    def connected(self) -> bool:
+        return self._connected
+
+    # ========== Connection ==========
+
+    async def connect(self, ip: str, rack: int, slot: int, port: int = 102):
+        """Open the TCP / COTP connection and negotiate the PDU"""
+        await self.disconnect()
+        try:
+            self._reader, self._writer = await asyncio.wait_for(
+                asyncio.open_connection(ip, port), self.connect_timeout
+            )
+            await asyncio.wait_for(self._cotp_connect(rack, slot), self.connect_timeout)
+        except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError) as e:
+            await self.disconnect()
+            raise S7ConnectionError(f"TCP connection to {ip}:{port} failed: {e!r}") from e
+
+        self._connected = True
+        self._slots = asyncio.Semaphore(1)
+        self._reader_task = asyncio.create_task(self._read_responses())
+        try:
+            await self._setup_communication()
+        except S7Error:
+            await self.disconnect()
+            raise
+        logger.info(f"S7 connection to {ip}:{port}: PDU {self.pdu_size} bytes, {self.max_in_flight} in flight")
+
+    async def _cotp_connect(self, rack: int, slot: int):
+        """COTP connection request (PG connection, TSAP 01.00 -> 01.rack/slot)"""
+        params = b"\xc0\x01\x0a" + b"\xc1\x02\x01\x00" + bytes([0xC2, 0x02, 0x01, rack * 0x20 + slot])
+        tpdu = b"\xe0\x00\x00\x00\x01\x00" + params
+        self._writer.write(TPKT.pack(3, 0, 5 + len(tpdu)) + bytes([len(tpdu)]) + tpdu)
+        await self._writer.drain()
+        payload = await self._read_tpkt()
+        if len(payload) < 2 or payload[1] != 0xD0:
+            raise S7ConnectionError(f"COTP connection refused ({payload[:2].hex()})")
+
+    async def _setup_communication(self):
+        """Negotiate PDU size and the number of parallel jobs"""
+        params = struct.pack(">BBHHH", FUNC_SETUP, 0, self.requested_in_flight,
+                             self.requested_in_flight, self.requested_pdu_size)
+        response_params, _ = await self._request(ROSCTR_JOB, params)
+        amq_calling, _, pdu_size = struct.unpack_from(">HHH", response_params, 2)
+        self.pdu_size = pdu_size
+        self.max_in_flight = max(1, min(amq_calling, self.requested_in_flight))
+        self._slots = asyncio.Semaphore(self.max_in_flight)
+
+    async def disconnect(self):
+        """Close the connection and fail requests still in flight"""
+        self._connected = False
+        task, self._reader_task = self._reader_task, None
+        if task is not None and task is not asyncio.current_task():
+            task.cancel()
+            try:
+                await task
+            except (asyncio.CancelledError, Exception):
+                pass
+        writer, self._writer = self._writer, None
+        if writer is not None:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except Exception:
+                pass
+        self._fail_pending(S7ConnectionError("TCP connection closed"))
+
+    def _fail_pending(self, error: Exception):
+        pending, self._pending = self._pending, {}
+        for future in pending.values():
+            if not future.done():
+                future.set_exception(error)
+
+    # ========== Transport ==========
+
+    async def _read_tpkt(self) -> bytes:
+        """One TPKT frame without the TPKT header"""
+        header = await self._reader.readexactly(TPKT.size)
+        _, _, length = TPKT.unpack(header)
+        return await self._reader.readexactly(length - TPKT.size)
+
+    async def _read_responses(self):
+        """Route incoming S7 PDUs to the waiting requests by PDU reference"""
+        try:
+            pdu = b""
+            while True:
+                frame = await self._read_tpkt()
+                li = frame[0]
+                pdu += frame[li + 1:]
+                if frame[1] == 0xF0 and not frame[2] & 0x80:
+                    continue  # more COTP fragments follow
+                _, _, _, ref, _, _ = S7_HEADER.unpack_from(pdu)
+                future = self._pending.pop(ref, None)
+                if future is not None and not future.done():
+                    future.set_result(pdu)
+                pdu = b""
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self._connected = False
+            logger.warning(f"S7 connection lost: {e!r}")
+            self._fail_pending(S7ConnectionError(f"TCP connection lost: {e!r}"))
+
+    async def _request(self, rosctr: int, params: bytes, data: bytes = b"") -> Tuple[bytes, bytes]:
+        """Send one S7 job and wait for its response
+
+        Returns:
+            (parameters, data) of the response
+        """
+        if not self._connected:
+            raise S7ConnectionError("Not connected (TCP)")
+
+        async with self._slots:
+            self._ref = self._ref % 0xFFFF + 1
+            ref = self._ref
+            future = asyncio.get_running_loop().create_future()
+            self._pending[ref] = future
+            pdu = S7_HEADER.pack(0x32, rosctr, 0, ref, len(params), len(data)) + params + data
+            try:
+                self._writer.write(TPKT.pack(3, 0, TPKT.size + len(COTP_DT) + len(pdu)) + COTP_DT + pdu)
+                await self._writer.drain()
+                response = await asyncio.wait_for(future, self.request_timeout)
+            except asyncio.TimeoutError:
+                self._pending.pop(ref, None)
+                self._connected = False
+                self._fail_pending(S7ConnectionError("TCP connection timed out"))
+                raise S7ConnectionError(f"TCP no response within {self.request_timeout} s")
+            except OSError as e:
+                self._pending.pop(ref, None)
+                self._connected = False
+                raise S7ConnectionError(f"TCP send failed: {e!r}") from e
+
+        response_type = response[1]
+        header_size = S7_HEADER.size
+        if response_type in (ROSCTR_ACK_DATA, 0x02):
+            error_class, error_code = S7_ERROR.unpack_from(response, header_size)
+            header_size += S7_ERROR.size
+            if error_class or error_code:
+                raise S7Error(f"PLC rejected the request (error {error_class:#04x}/{error_code:#04x})")
+        _, _, _, _, param_length, data_length = S7_HEADER.unpack_from(response)
+        response_params = response[header_size:header_size + param_length]
+        response_data = response[header_size + param_length:header_size + param_length + data_length]
+        return response_params, response_data
+
+    # ========== Read / Write ==========
+
+    async def _read_items(self, items: Sequence[Tuple[Areas, int, int, int]]) -> List[Any]:
+        """Read several byte ranges in one PDU
+
+        Returns:
+            bytearray per item, or an S7Error for items the PLC rejected
+        """
+        params = bytes([FUNC_READ, len(items)]) + b"".join(_item_spec(*item) for item in items)
+        _, data = await self._request(ROSCTR_JOB, params)
+
+        results: List[Any] = []
+        position = 0
+        for index, (area, db_number, start, size) in enumerate(items):
+            code, transport, length = DATA_ITEM.unpack_from(data, position)
+            position += DATA_ITEM.size
+            if code != RESULT_OK:
+                results.append(S7Error(f"Item {area.name}{db_number}.{start} rejected (code {code:#04x})"))
+                continue
+            if transport in (TS_BYTE, TS_INT):
+                length //= 8
+            results.append(bytearray(data[position:position + length]))
+            position += length
+            if length % 2 and index < len(items) - 1:
+                position += 1  # fill byte
+        return results
+
+    async def read_area(self, area: Areas, db_number: int, start: int, size: int) -> bytearray:
+        """Read a byte range, split into PDU-sized requests sent in parallel"""
+        chunk = self.pdu_size - READ_OVERHEAD
+        ranges = [(area, db_number, offset, min(chunk, start + size - offset))
+                  for offset in range(start, start + size, chunk)]
+        parts = await asyncio.gather(*(self._read_items([item]) for item in ranges))
+        result = bytearray()
+        for (part,) in parts:
+            if isinstance(part, Exception):
+                raise part
+            result += part
+        return result
+
+    async def write_area(self, area: Areas, db_number: int, start: int, data: bytes):
+        """Write a byte range, split into PDU-sized requests sent in parallel"""
+        chunk = self.pdu_size - WRITE_OVERHEAD
+        await asyncio.gather(*(
+            self._write_item(area, db_number, offset, data[offset - start:offset - start + chunk])
+            for offset in range(start, start + len(data), chunk)
+        ))
+
+    async def _write_item(self, area: Areas, db_number: int, start: int, data: bytes):
+        params = bytes([FUNC_WRITE, 1]) + _item_spec(area, db_number, start, len(data))
+        _, response = await self._request(ROSCTR_JOB, params, DATA_ITEM.pack(0, TS_BYTE, len(data) * 8) + data)
+        if response[0] != RESULT_OK:
+            raise S7Error(f"Write {area.name}{db_number}.{start} rejected (code {response[0]:#04x})")
+
+    async def write_bits(self, items: Sequence[Tuple[Areas, int, int, bool]]) -> List[Optional[S7Error]]:
+        """Set/clear single bits in one request - (area, db, byte * 8 + bit, value) each
+
+        Only the addressed bits change on the PLC, no read needed.
+
+        Returns:
+            None per written item, or an S7Error for items the PLC rejected
+        """
+        params = bytes([FUNC_WRITE, len(items)]) + b"".join(
+            _bit_spec(area, db_number, address) for area, db_number, address, _ in items
+        )
+        data = b"".join(
+            DATA_ITEM.pack(0, TS_BIT, 1) + bytes([value]) + (b"\x00" if index < len(items) - 1 else b"")
+            for index, (_, _, _, value) in enumerate(items)
+        )
+        _, response = await self._request(ROSCTR_JOB, params, data)
+        return [
+            None if code == RESULT_OK
+            else S7Error(f"Bit write {area.name}{db_number}.{address // 8}.{address % 8} rejected (code {code:#04x})")
+            for code, (area, db_number, address, _) in zip(response, items)
+        ]
+
+    async def db_read(self, db_number: int, start: int, size: int) -> bytearray:
+        return await self.read_area(Areas.DB, db_number, start, size)
+
+    async def db_write(self, db_number: int, start: int, data: bytes):
+        await self.write_area(Areas.DB, db_number, start, data)
+
+    async def read_multi(self, items: Sequence[Tuple[Areas, int, int, int]]) -> List[Any]:
+        """Read several byte ranges, packing as many as fit into each PDU
+
+        Returns:
+            bytearray per item, or an S7Error for items the PLC rejected
+        """
+        batches: List[List[Tuple[Areas, int, int, int]]] = [[]]
+        request_size = response_size = 0
+        for item in items:
+            item_request = 12
+            item_response = DATA_ITEM.size + item[3] + item[3] % 2
+            if batches[-1] and (
+                S7_HEADER.size + 2 + request_size + item_request > self.pdu_size
+                or S7_HEADER.size + S7_ERROR.size + 2 + response_size + item_response > self.pdu_size
+            ):
+                batches.append([])
+                request_size = response_size = 0
+            batches[-1].append(item)
+            request_size += item_request
+            response_size += item_response
+        parts = await asyncio.gather(*(self._read_items(batch) for batch in batches if batch))
+        return [result for part in parts for result in part]
+
+    # ========== CPU ==========
+
+    async def get_cpu_state(self) -> str:
+        """CPU state from SZL 0x0424 - same strings as snap7"""
+        params = b"\x00\x01\x12\x04\x11\x44\x01\x00"
+        data = struct.pack(">BBHHH", RESULT_OK, TS_OCTET, 4, SZL_CPU_STATE, 0)
+        _, response = await self._request(ROSCTR_USERDATA, params, data)
+        if not response or response[0] != RESULT_OK:
+            raise S7Error("CPU state not available")
+        # return code, transport, length, SZL id, index, record length, record count, record
+        record = response[12:]
+        return CPU_STATES.get(record[3] if len(record) > 3 else 0, CPU_STATES[0x00])
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# BLOCKING FACADE - drop-in for snap7.client.Client in PLCConnector
+# ═══════════════════════════════════════════════════════════════════════
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+
+
+def _client_loop() -> asyncio.AbstractEventLoop:
+    """Event loop thread shared by all SyncS7Client instances"""
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="plc-s7", daemon=True).start()
+        return _loop
+
+
+class SyncS7Client:
+    """snap7.client.Client-compatible blocking wrapper around S7Client
+
+    Calls block the calling thread (the PLC I/O thread) while the request
+    runs on a shared event loop thread.
+    """
+
+    def __init__(self, **options: Any):
+        self._loop = _client_loop()
+        self._client = S7Client(**options)
+
+    def _run(self, coro: Awaitable[T]) -> T:
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    @property
+    def pdu_size(self) -> int:
+        return self._client.pdu_size
+
+    @property
+    def max_in_flight(self) -> int:
+        return self._client.max_in_flight
+
+    def connect(self, address: str, rack: int, slot: int, tcp_port: int = 102) -> "SyncS7Client":
+        self._run(self._client.connect(address, rack, slot, tcp_port))
+        return self
+
+    def disconnect(self):
+        self._run(self._client.disconnect())
+
+    def get_connected(self) -> bool:
+        return self._client.connected
+
+    def get_cpu_state(self) -> str:
+        return self._run(self._client.get_cpu_state())
+
+    def db_read(self, db_number: int, start: int, size: int) -> bytearray:
+        return self._run(self._client.db_read(db_number, start, size))
+
+    def db_write(self, db_number: int, start: int, data: bytearray):
+        self._run(self._client.db_write(db_number, start, bytes(data)))
+
+    def read_area(self, area: Areas, db_number: int, start: int, size: int) -> bytearray:
+        return self._run(self._client.read_area(area, db_number, start, size))
+
+    def write_area(self, area: Areas, db_number: int, start: int, data: bytearray):
+        self._run(self._client.write_area(area, db_number, start, bytes(data)))
+
+    def read_multi_vars(self, items) -> Tuple[int, Any]:
+        """Fill a ctypes S7DataItem array like snap7 (byte word length only)"""
+        specs = [(Areas(item.Area), item.DBNumber, item.Start, item.Amount) for item in items]
+        results = self._run(self._client.read_multi(specs))
+        for item, result in zip(items, results):
+            if isinstance(result, Exception):
+                item.Result = 0x00A00000  # errCliItemNotAvailable
+            else:
+                ctypes.memmove(item.pData, bytes(result), len(result))
+                item.Result = 0
+        return 0, items
+
+    def write_multi_vars(self, items) -> int:
+        """Write a ctypes S7DataItem array of single bits (WordLen.Bit) like snap7
+
+        Unlike snap7's wrapper, the per-item results are set on items.
+        """
+        if any(item.WordLen != WordLen.Bit or item.Amount != 1 for item in items):
+            raise ValueError("Only single-bit items can be written")
+        specs = [
+            (Areas(item.Area), item.DBNumber, item.Start, bool(item.pData[0]))
+            for item in items
+        ]
+        results = self._run(self._client.write_bits(specs))
+        for item, result in zip(items, results):
+            item.Result = 0 if result is None else 0x00A00000  # errCliItemNotAvailable
+        return 0
@@ -0,0 +1,282 @@
+"""
+S7-1214C simulator for the GRP ring stiffness machine
+
+Serves DB3 (servo control, layout as in DataService / CommandService),
+the DB10 sample ring buffer and the PE area with the IW64 load cell over
+snap7's server, and moves the actuator according to the jog / test / home
+bits. One ring buffer sample is written per cycle (--cycle-ms 1 for 1 kHz). Force follows the
+ISO 9969 ring stiffness relation for a pipe of the given size and class.
+
+Run with: python -m plc.simulator --port 1102 --diameter 300 --stiffness 5000
+Then start the backend with PLC_IP=127.0.0.1 PLC_PORT=1102
+"""
+
+import argparse
+import ctypes
+import logging
+import random
+import signal
+import struct
+import threading
+import time
+
+import snap7
+from snap7.type import SrvArea
+from snap7.util import get_bool, get_real, set_bool, set_int, set_real
+
+from .command_service import CommandService
+from .connector import PLCConnector
+from .data_service import DataService
+
+logger = logging.getLogger(__name__)
+
+
+class PipeModel:
+    """Force-deflection model of a GRP pipe ring under parallel plates
+
+    ISO 9969: S = (0.0186 + 0.025 * y / d) * F / (L * y)
+    solved for F, with S in kN/m² (SN 5000 -> 5 kN/m²), L, y, d in m.
+    """
+
+    def __init__(self, diameter: float, length: float, stiffness: float, contact_position: float):
+        self.diameter = diameter              # mm
+        self.length = length                  # mm
+        self.stiffness = stiffness            # N/m² (SN class number)
+        self.contact_position = contact_position  # mm - plate touches the pipe
+
+    def deflection(self, position: float) -> float:
+        """Pipe deflection (mm) at an actuator position (mm)"""
+        return max(0.0, position - self.contact_position)
+
+    def force(self, position: float) -> float:
+        """Plate force (kN) at an actuator position (mm)"""
+        y = self.deflection(position) / 1000.0
+        if y <= 0.0:
+            return 0.0
+        d = self.diameter / 1000.0
+        L = self.length / 1000.0
+        S = self.stiffness / 1000.0
+        return S * L * y / (0.0186 + 0.025 * y / d)
+
+
+class MachineSimulator:
+    """snap7 server + actuator / load cell simulation"""
+
+    DB_NUMBER = DataService.DB_NUMBER
+    DB_SIZE = 64
+    PE_SIZE = 128
+    SAMPLE_DB = DataService.SAMPLE_DB
+    SAMPLE_CAPACITY = 1000
+
+    HOME_SPEED = 300.0       # mm/min
+    MAX_STROKE = 500.0       # mm
+    LOAD_CELL_NOISE = 2      # raw counts
+
+    def __init__(
+        self,
+        pipe: PipeModel,
+        test_speed: float = 10.0,
+        deflection_percent: float = 3.0,
+        cycle_time: float = 0.01,
+    ):
+        self.pipe = pipe
+        self.test_speed = test_speed
+        self.deflection_percent = deflection_percent
+        self.cycle_time = cycle_time
+
+        self.db3 = (ctypes.c_uint8 * self.DB_SIZE)()
+        self.pe = (ctypes.c_uint8 * self.PE_SIZE)()
+        entry = DataService.SAMPLE_ENTRY
+        self.db10 = (ctypes.c_uint8 * (DataService.SAMPLE_HEADER_SIZE + self.SAMPLE_CAPACITY * entry.size))()
+        header = struct.pack(">Ihh", 0, self.SAMPLE_CAPACITY, entry.size)
+        ctypes.memmove(self.db10, header, len(header))
+        self.sample_count = 0
+        self.server = snap7.server.Server()
+        self.server.register_area(SrvArea.DB, self.DB_NUMBER, self.db3)
+        self.server.register_area(SrvArea.DB, self.SAMPLE_DB, self.db10)
+        self.server.register_area(SrvArea.PE, 0, self.pe)
+
+        self.position = 0.0
+        self.testing = False
+        self.homing = False
+        self._running = False
+        self._thread = None
+
+    # ========== Simulation ==========
+
+    def step(self, dt: float):
+        """Advance the machine by dt seconds"""
+        status = DataService
+
+        # Work on a copy while clients are locked out, then write it back
+        self.server.lock_area(SrvArea.DB, self.DB_NUMBER)
+        try:
+            db = bytearray(self.db3)
+            self._update_db3(db, dt)
+            ctypes.memmove(self.db3, bytes(db), len(db))
+        finally:
+            self.server.unlock_area(SrvArea.DB, self.DB_NUMBER)
+
+        # Load cell - IW64, 0..27648 = 0..LOAD_CELL_MAX_FORCE
+        force = self.pipe.force(self.position)
+        raw = int(force / status.LOAD_CELL_MAX_FORCE * status.LOAD_CELL_MAX_RAW)
+        raw += random.randint(-self.LOAD_CELL_NOISE, self.LOAD_CELL_NOISE)
+        raw = max(0, min(status.LOAD_CELL_MAX_RAW, raw))
+        word = bytearray(2)
+        set_int(word, 0, raw)
+        self.server.lock_area(SrvArea.PE, 0)
+        try:
+            self.pe[status.ANALOG_LOAD_CELL] = word[0]
+            self.pe[status.ANALOG_LOAD_CELL + 1] = word[1]
+        finally:
+            self.server.unlock_area(SrvArea.PE, 0)
+
+        self._append_sample(raw / status.LOAD_CELL_MAX_RAW * status.LOAD_CELL_MAX_FORCE)
+
+    def _append_sample(self, force: float):
+        """Write one DB10 ring buffer entry, then bump the write count"""
+        entry = DataService.SAMPLE_ENTRY
+        time_us = int(time.monotonic() * 1_000_000) & 0xFFFFFFFF
+        data = entry.pack(time_us, force, self.position, self.pipe.deflection(self.position))
+        offset = DataService.SAMPLE_HEADER_SIZE + (self.sample_count % self.SAMPLE_CAPACITY) * entry.size
+        self.sample_count = (self.sample_count + 1) & 0xFFFFFFFF
+        count = struct.pack(">I", self.sample_count)
+        self.server.lock_area(SrvArea.DB, self.SAMPLE_DB)
+        try:
+            ctypes.memmove(ctypes.byref(self.db10, offset), data, len(data))
+            ctypes.memmove(self.db10, count, len(count))
+        finally:
+            self.server.unlock_area(SrvArea.DB, self.SAMPLE_DB)
+
+    def _update_db3(self, db: bytearray, dt: float):
+        """Apply command bits in DB3 and write back the new status"""
+        cmd = CommandService
+        status = DataService
+
+        def bit(address: tuple) -> bool:
+            return get_bool(db, *address)
+
+        def set_bit(address: tuple, value: bool):
+            set_bool(db, *address, value)
+
+        enabled = bit(cmd.CMD_ENABLE)
+        stop = bit(cmd.CMD_STOP) or bit(status.STATUS_ESTOP_ACTIVE)
+
+        if bit(cmd.CMD_RESET):
+            set_bit(status.STATUS_SERVO_ERROR, False)
+
+        if bit(cmd.CMD_START_TEST) and not self.testing and enabled and not stop:
+            self.testing = True
+            self.homing = False
+            logger.info("Test started")
+        if bit(cmd.CMD_HOME) and not self.homing and enabled and not stop:
+            self.homing = True
+            self.testing = False
+            logger.info("Homing started")
+        if stop or not enabled:
+            # Abort like the PLC program: drop the start / home bits too,
+            # otherwise the motion resumes when the STOP pulse is released
+            self.testing = False
+            self.homing = False
+            set_bit(cmd.CMD_START_TEST, False)
+            set_bit(cmd.CMD_HOME, False)
+
+        # Velocity in mm/min, positive = down (forward)
+        velocity = 0.0
+        target = self.pipe.diameter * self.deflection_percent / 100.0
+        if enabled and not stop:
+            jog_speed = get_real(db, status.VAL_JOG_VELOCITY)
+            if self.testing:
+                velocity = self.test_speed
+                if self.pipe.deflection(self.position) >= target:
+                    # Acknowledge like the PLC program: drop the start bit
+                    velocity = 0.0
+                    self.testing = False
+                    set_bit(cmd.CMD_START_TEST, False)
+                    logger.info(f"Test target reached ({target:.2f} mm deflection)")
+            elif self.homing:
+                velocity = -self.HOME_SPEED
+                if self.position <= 0.0:
+                    velocity = 0.0
+                    self.homing = False
+                    set_bit(cmd.CMD_HOME, False)
+            elif bit(cmd.CMD_JOG_FORWARD) and not bit(cmd.CMD_JOG_BACKWARD):
+                velocity = jog_speed
+            elif bit(cmd.CMD_JOG_BACKWARD) and not bit(cmd.CMD_JOG_FORWARD):
+                velocity = -jog_speed
+
+        previous = self.position
+        self.position = min(self.MAX_STROKE, max(0.0, self.position + velocity / 60.0 * dt))
+        speed = abs(self.position - previous) / dt * 60.0 if dt > 0 else 0.0
+
+        set_real(db, status.VAL_ACTUAL_POSITION, self.position)
+        set_real(db, status.VAL_ACTUAL_SPEED, speed)
+        if self.testing:
+            set_real(db, status.VAL_TARGET_POSITION, self.pipe.contact_position + target)
+        set_bit(status.STATUS_SERVO_READY, enabled)
+        set_bit(status.STATUS_MC_POWER, enabled)
+        set_bit(status.STATUS_MC_BUSY, speed > 0.0)
+        set_bit(status.STATUS_AT_HOME, self.position <= 0.01)
+
+    def _run(self):
+        """Fixed-step simulation loop"""
+        next_tick = time.monotonic()
+        while self._running:
+            self.step(self.cycle_time)
+            next_tick += self.cycle_time
+            delay = next_tick - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                next_tick = time.monotonic()
+
+    def start(self, port: int = 102):
+        """Start the snap7 server and the simulation thread"""
+        self.server.start(tcp_port=port)
+        self.server.set_cpu_status(PLCConnector.CPU_STATE_RUN)
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="plc-sim", daemon=True)
+        self._thread.start()
+        logger.info(f"PLC simulator listening on port {port}")
+
+    def stop(self):
+        """Stop the simulation thread and the server"""
+        self._running = False
+        if self._thread:
+            self._thread.join()
+        self.server.stop()
+        self.server.destroy()
+        logger.info("PLC simulator stopped")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="GRP test machine PLC simulator")
+    parser.add_argument("--port", type=int, default=102, help="ISO-on-TCP port (102 needs root)")
+    parser.add_argument("--diameter", type=float, default=300.0, help="Pipe diameter (mm)")
+    parser.add_argument("--length", type=float, default=300.0, help="Pipe sample length (mm)")
+    parser.add_argument("--stiffness", type=float, default=5000.0, help="Ring stiffness (N/m², e.g. 5000 for SN5000)")
+    parser.add_argument("--contact", type=float, default=50.0, help="Actuator position where the plate meets the pipe (mm)")
+    parser.add_argument("--test-speed", type=float, default=10.0, help="Test speed (mm/min)")
+    parser.add_argument("--deflection", type=float, default=3.0, help="Test target deflection (%% of diameter)")
+    parser.add_argument("--cycle-ms", type=float, default=10.0, help="Simulation cycle time (ms)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    simulator = MachineSimulator(
+        PipeModel(args.diameter, args.length, args.stiffness, args.contact),
+        test_speed=args.test_speed,
+        deflection_percent=args.deflection,
+        cycle_time=args.cycle_ms / 1000.0,
+    )
+    simulator.start(args.port)
+
+    stopped = threading.Event()
+    signal.signal(signal.SIGINT, lambda *_: stopped.set())
+    signal.signal(signal.SIGTERM, lambda *_: stopped.set())
+    stopped.wait()
+    simulator.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+import struct
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple, Union
+from .connector import ReadItem, Areas
+
+
+# S7 type -> (struct code, size in bytes), all big-endian
+TYPES = {
+    "BOOL": ("B", 1),
+    "BYTE": ("B", 1),
+    "INT": ("h", 2),
+    "WORD": ("H", 2),
+    "DINT": ("i", 4),
+    "UDINT": ("I", 4),
+    "DWORD": ("I", 4),
+    "REAL": ("f", 4),
+}
+
+
+class Tag(NamedTuple):
+    """One PLC variable
+
+    name: Key in decoded dicts (e.g. "actual_position")
+    area: Areas.DB, Areas.PE (inputs) or Areas.PA (outputs)
+    db_number: DB number for Areas.DB, 0 for process image areas
+    byte: Byte offset (DB3.DBD2 -> 2, IW64 -> 64)
+    bit: Bit offset for BOOL tags, None otherwise
+    type: S7 type name, see TYPES
+    scale, offset: Engineering value = raw * scale + offset
+    low, high: Optional clamp applied after scaling
+    """
+    name: str
+    area: Areas
+    db_number: int
+    byte: int
+    bit: Optional[int] = None
+    type: str = "BOOL"
+    scale: float = 1.0
+    offset: float = 0.0
+    low: Optional[float] = None
+    high: Optional[float] = None
+
+    @property
+    def address(self) -> Union[Tuple[int, int], int]:
+        """(byte, bit) for BOOL tags, byte offset otherwise"""
+        return (self.byte, self.bit) if self.type == "BOOL" else self.byte
+
+    @property
+    def size(self) -> int:
+        return TYPES[self.type][1]
+
+    @property
+    def scaled(self) -> bool:
+        return (self.scale != 1.0 or self.offset != 0.0
+                or self.low is not None or self.high is not None)
+
+
+class _Block:
+    """Compiled decoder for one contiguous byte range (one ReadItem)
+
+    Every distinct (byte, type) field in the range becomes one entry of a
+    big-endian struct format with pad bytes in between, so the whole range
+    is decoded by a single unpack_from(). BOOL tags share the BYTE field of
+    their byte and are extracted with a precomputed mask.
+    """
+
+    def __init__(self, area: Areas, db_number: int, tags: Sequence[Tag]):
+        fields: Dict[Tuple[int, str], int] = {}
+        for tag in sorted(tags, key=lambda t: (t.byte, -t.size)):
+            fields.setdefault((tag.byte, TYPES[tag.type][0]), len(fields))
+
+        start = min(byte for byte, _ in fields)
+        fmt = ">"
+        position = start
+        for byte, code in fields:
+            if byte < position:
+                raise ValueError(f"Overlapping tags at byte {byte} of {area} {db_number}")
+            if byte > position:
+                fmt += f"{byte - position}x"
+            fmt += code
+            position = byte + struct.calcsize(">" + code)
+
+        self.item = ReadItem(area, db_number, start, position - start)
+        self.struct = struct.Struct(fmt)
+
+        bits: List[Tuple[str, int, int]] = []
+        raw: List[Tuple[str, int]] = []
+        scaled: List[Tuple[str, int, float, float, Optional[float], Optional[float]]] = []
+        self.defaults: Dict[str, Any] = {}
+        for tag in tags:
+            index = fields[(tag.byte, TYPES[tag.type][0])]
+            if tag.type == "BOOL":
+                bits.append((tag.name, index, 1 << tag.bit))
+                self.defaults[tag.name] = False
+            elif tag.scaled:
+                scaled.append((tag.name, index, tag.scale, tag.offset, tag.low, tag.high))
+                self.defaults[tag.name] = 0.0
+            else:
+                raw.append((tag.name, index))
+                self.defaults[tag.name] = 0.0 if tag.type == "REAL" else 0
+        self.bits = tuple(bits)
+        self.raw = tuple(raw)
+        self.scaled = tuple(scaled)
+
+    def decode_into(self, data: bytearray, result: Dict[str, Any]) -> None:
+        values = self.struct.unpack_from(data)
+        for name, index, mask in self.bits:
+            result[name] = bool(values[index] & mask)
+        for name, index in self.raw:
+            result[name] = values[index]
+        for name, index, scale, offset, low, high in self.scaled:
+            value = values[index] * scale + offset
+            if low is not None and value < low:
+                value = low
+            elif high is not None and value > high:
+                value = high
+            result[name] = value
+
+
+class TagDecoder:
+    """A set of tags compiled for one multi-variable read
+
+    read_items: One ReadItem per (area, DB) covering all its tags, in
+                order of first appearance - pass to PLCConnector.read_multi
+    decode(): Turns the read_multi result into a {name: value} dict;
+              tags of a block that failed to read get their default
+    """
+
+    def __init__(self, tags: Sequence[Tag]):
+        grouped: Dict[Tuple[Areas, int], List[Tag]] = {}
+        for tag in tags:
+            grouped.setdefault((tag.area, tag.db_number), []).append(tag)
+        self.blocks = tuple(_Block(area, db, group) for (area, db), group in grouped.items())
+        self.read_items = tuple(block.item for block in self.blocks)
+        self.defaults: Dict[str, Any] = {}
+        for block in self.blocks:
+            self.defaults.update(block.defaults)
+
+    def decode(self, blocks: Sequence[Optional[bytearray]]) -> Dict[str, Any]:
+        result: Dict[str, Any] = {}
+        for block, data in zip(self.blocks, blocks):
+            if data is None:
+                result.update(block.defaults)
+            else:
+                block.decode_into(data, result)
+        return result
+
+
+class TagMap:
+    """Declarative tag schema, looked up by name"""
+
+    def __init__(self, tags: Iterable[Tag]):
+        self.tags: Dict[str, Tag] = {}
+        for tag in tags:
+            if tag.type not in TYPES:
+                raise ValueError(f"Unknown type {tag.type} for tag {tag.name}")
+            if (tag.type == "BOOL") != (tag.bit is not None):
+                raise ValueError(f"Tag {tag.name}: bit offset is required for BOOL only")
+            if tag.name in self.tags:
+                raise ValueError(f"Duplicate tag {tag.name}")
+            self.tags[tag.name] = tag
+
+    def __getitem__(self, name: str) -> Tag:
+        return self.tags[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.tags
+
+    def address(self, name: str) -> Union[Tuple[int, int], int]:
+        return self.tags[name].address
+
+    def compile(self, names: Iterable[str]) -> TagDecoder:
+        """Build a decoder for the given tags"""
+        return TagDecoder([self.tags[name] for name in names])
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# GRP ring stiffness machine - DB3 Servo Control + hardware inputs
+# ═══════════════════════════════════════════════════════════════════════
+DB3 = 3
+DB10 = 10  # Sample ring buffer
+
+LOAD_CELL_MAX_RAW = 27648     # 0-10V
+LOAD_CELL_MAX_FORCE = 200.0   # kN
+
+MACHINE_TAGS = TagMap([
+    # Commands (Byte 0) - written by CommandService
+    Tag("servo_enabled", Areas.DB, DB3, 0, 0),        # DB3.DBX0.0 - Enable
+    Tag("jog_forward", Areas.DB, DB3, 0, 1),          # DB3.DBX0.1
+    Tag("jog_backward", Areas.DB, DB3, 0, 2),         # DB3.DBX0.2
+    Tag("start_test", Areas.DB, DB3, 0, 3),           # DB3.DBX0.3
+    Tag("stop", Areas.DB, DB3, 0, 4),                 # DB3.DBX0.4
+    Tag("reset", Areas.DB, DB3, 0, 5),                # DB3.DBX0.5
+    Tag("home", Areas.DB, DB3, 0, 6),                 # DB3.DBX0.6
+
+    # Status bits
+    Tag("servo_ready", Areas.DB, DB3, 0, 7),          # DB3.DBX0.7
+    Tag("servo_error", Areas.DB, DB3, 1, 0),          # DB3.DBX1.0
+    Tag("at_home", Areas.DB, DB3, 1, 1),              # DB3.DBX1.1
+    Tag("lock_upper", Areas.DB, DB3, 14, 0),          # DB3.DBX14.0 - command + status
+    Tag("lock_lower", Areas.DB, DB3, 14, 1),          # DB3.DBX14.1 - command + status
+    Tag("mc_power", Areas.DB, DB3, 20, 0),            # DB3.DBX20.0
+    Tag("mc_busy", Areas.DB, DB3, 20, 1),             # DB3.DBX20.1
+    Tag("mc_error", Areas.DB, DB3, 20, 2),            # DB3.DBX20.2
+    Tag("remote_mode", Areas.DB, DB3, 25, 0),         # DB3.DBX25.0 - command + status
+    Tag("e_stop_active", Areas.DB, DB3, 25, 1),       # DB3.DBX25.1 - E-Stop latched
+
+    # Real values
+    Tag("actual_position", Areas.DB, DB3, 2, type="REAL"),   # DB3.DBD2
+    Tag("target_position", Areas.DB, DB3, 6, type="REAL"),   # DB3.DBD6
+    Tag("actual_speed", Areas.DB, DB3, 10, type="REAL"),     # DB3.DBD10
+    Tag("jog_velocity", Areas.DB, DB3, 16, type="REAL"),     # DB3.DBD16 - command + status
+
+    # Hardware inputs - load cell on IW64
+    Tag("load_cell_raw", Areas.PE, 0, 64, type="INT"),
+    Tag("actual_force", Areas.PE, 0, 64, type="INT",
+        scale=LOAD_CELL_MAX_FORCE / LOAD_CELL_MAX_RAW, low=0.0),
+
+    # Sample ring buffer header - DB10, entries follow from DBB8
+    Tag("sample_write_count", Areas.DB, DB10, 0, type="UDINT"),  # DB10.DBD0 - samples written so far
+    Tag("sample_capacity", Areas.DB, DB10, 4, type="INT"),       # DB10.DBW4 - entries in the ring
+    Tag("sample_entry_size", Areas.DB, DB10, 6, type="INT"),     # DB10.DBW6 - bytes per entry
+])
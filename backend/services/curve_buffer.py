@@ -0,0 +1,89 @@
+import sys
+from array import array
+from typing import Iterator, List, Optional, Tuple
+
+
+# Curve columns, in storage order
+COLUMNS = ("timestamp", "force", "deflection", "position")
+
+# Samples per chunk - 4096 samples * 4 columns * 8 bytes = 128 KB
+CHUNK_SIZE = 4096
+
+
+class CurveBuffer:
+    """Columnar in-memory test curve
+
+    Each column is a list of preallocated array('d') chunks that never
+    resize, so append() is O(1) without reallocation and a worker thread
+    can read the filled part while recording goes on. Persistence and the
+    curve stream copy just the samples they send, converted to float32.
+    Count and the min / max of every column are kept as samples arrive.
+    """
+
+    def __init__(self, chunk_size: int = CHUNK_SIZE):
+        self.chunk_size = chunk_size
+        self.count = 0
+        self._chunks: List[Tuple[array, ...]] = []
+        self._min = [float("inf")] * len(COLUMNS)
+        self._max = [float("-inf")] * len(COLUMNS)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def append(self, timestamp: float, force: float, deflection: float, position: float):
+        index = self.count % self.chunk_size
+        if index == 0:
+            empty = bytes(8 * self.chunk_size)
+            self._chunks.append(tuple(array("d", empty) for _ in COLUMNS))
+        t, f, d, p = self._chunks[-1]
+        t[index] = timestamp
+        f[index] = force
+        d[index] = deflection
+        p[index] = position
+        low, high = self._min, self._max
+        for column, value in ((0, timestamp), (1, force), (2, deflection), (3, position)):
+            if value < low[column]:
+                low[column] = value
+            if value > high[column]:
+                high[column] = value
+        self.count += 1
+
+    def min(self, column: str) -> Optional[float]:
+        return self._min[COLUMNS.index(column)] if self.count else None
+
+    def max(self, column: str) -> Optional[float]:
+        return self._max[COLUMNS.index(column)] if self.count else None
+
+    def _views(self, column: str, start: int = 0, stop: Optional[int] = None) -> Iterator[memoryview]:
+        """Memoryviews (format 'd') of the chunks covering samples [start, stop)"""
+        column_index = COLUMNS.index(column)
+        stop = self.count if stop is None else min(stop, self.count)
+        position = max(start, 0)
+        while position < stop:
+            chunk, offset = divmod(position, self.chunk_size)
+            end = min(stop - chunk * self.chunk_size, self.chunk_size)
+            yield memoryview(self._chunks[chunk][column_index])[offset:end]
+            position = chunk * self.chunk_size + end
+
+    def to_array(self, column: str, start: int = 0, stop: Optional[int] = None, typecode: str = "d") -> array:
+        """Copy of samples [start, stop) as one array ('f' for float32)"""
+        result = array(typecode)
+        for view in self._views(column, start, stop):
+            if typecode == "d":
+                result.frombytes(view.cast("B"))
+            else:
+                result.extend(view)
+        return result
+
+    def to_bytes(self, column: str, start: int = 0, stop: Optional[int] = None, typecode: str = "d") -> bytes:
+        """Little-endian packed samples [start, stop)"""
+        values = self.to_array(column, start, stop, typecode)
+        if sys.byteorder == "big":
+            values.byteswap()
+        return values.tobytes()
+
+    def rows(self, start: int = 0, stop: Optional[int] = None) -> Iterator[Tuple[float, float, float, float]]:
+        """(timestamp, force, deflection, position) per sample"""
+        columns = [self._views(name, start, stop) for name in COLUMNS]
+        for chunk_views in zip(*columns):
+            yield from zip(*chunk_views)
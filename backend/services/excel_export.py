@@ -184,7 +184,8 @@ class ExcelExporter:
         ws_info.column_dimensions['B'].width = 20
 
         # Data points sheet
-        if test.data_points:
+        curve = test.curve
+        if curve:
             ws_data = wb.create_sheet("Data Points")
 
             headers = ['Time (s)', 'Force (kN)', 'Deflection (mm)', 'Position (mm)']
@@ -194,7 +195,7 @@ class ExcelExporter:
                 cell.fill = self.header_fill
                 cell.alignment = self.center_align
 
-            for row_num, dp in enumerate(sorted(test.data_points, key=lambda x: x.timestamp), 2):
+            for row_num, dp in enumerate(curve, 2):
                 ws_data.cell(row=row_num, column=1, value=round(dp.timestamp, 3))
                 ws_data.cell(row=row_num, column=2, value=round(dp.force, 3))
                 ws_data.cell(row=row_num, column=3, value=round(dp.deflection, 3))
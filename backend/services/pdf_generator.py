@@ -11,7 +11,8 @@ from datetime import datetime
 from typing import List, Optional
 import logging
 
-from db.models import Test, TestDataPoint
+from db.models import Test
+from db.curve_codec import CurvePoint
 
 logger = logging.getLogger(__name__)
 
@@ -159,9 +160,10 @@ class PDFGenerator:
         story.append(Spacer(1, 20))
 
         # Force-Deflection Chart (if data points available)
-        if test.data_points and len(test.data_points) > 1:
+        curve = test.curve
+        if len(curve) > 1:
             story.append(Paragraph("Force-Deflection Curve", self.styles['Heading_Custom']))
-            chart = self._create_chart(test.data_points)
+            chart = self._create_chart(curve)
             story.append(chart)
             story.append(Spacer(1, 12))
 
@@ -175,7 +177,7 @@ class PDFGenerator:
         buffer.seek(0)
         return buffer.read()
 
-    def _create_chart(self, data_points: List[TestDataPoint]) -> Drawing:
+    def _create_chart(self, data_points: List[CurvePoint]) -> Drawing:
         """Create force-deflection chart"""
         drawing = Drawing(450, 250)
 
@@ -0,0 +1,62 @@
+import asyncio
+from typing import Any, Dict, Optional
+
+from plc.metrics import LatencyHistogram
+
+
+class DeadlineSampler:
+    """Fixed-rate ticks on absolute deadlines of the event loop clock
+
+    Tick k is due at start + k * interval instead of "interval after the
+    previous sample", so PLC read time and loop lag never accumulate into
+    drift. A tick that wakes one or more whole intervals late skips the
+    deadlines it missed (counted in missed) rather than bursting to catch
+    up; the lateness of every tick that runs is recorded as jitter.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.start: Optional[float] = None
+        self.tick = 0
+        self.ticks = 0    # Ticks that ran
+        self.missed = 0   # Deadlines skipped because the loop was too late
+        self.stale = 0    # Ticks without new data since the previous one (set by the caller)
+        self.jitter = LatencyHistogram()
+
+    def begin(self, start: Optional[float] = None):
+        """Anchor tick 0 at start (loop.time(), default now)"""
+        self.start = asyncio.get_running_loop().time() if start is None else start
+        self.tick = 0
+
+    async def wait(self) -> float:
+        """Sleep until the next deadline - returns its offset from start (s)"""
+        loop = asyncio.get_running_loop()
+        if self.start is None:
+            self.begin()
+        self.tick += 1
+        deadline = self.start + self.tick * self.interval
+        delay = deadline - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        late = loop.time() - deadline
+        if late >= self.interval:
+            skipped = int(late // self.interval)
+            self.missed += skipped
+            self.tick += skipped
+            late -= skipped * self.interval
+        self.ticks += 1
+        self.jitter.record(late)
+        return self.tick * self.interval
+
+    def stats(self) -> Dict[str, Any]:
+        """Sampling quality summary, stored with the test"""
+        jitter = self.jitter.to_dict()
+        return {
+            "source": "poller",
+            "interval": self.interval,
+            "ticks": self.ticks,
+            "missed": self.missed,
+            "stale": self.stale,
+            "jitter_ms": {key: jitter[key] for key in ("mean_ms", "p50_ms", "p95_ms", "p99_ms", "max_ms")},
+        }
@@ -1,13 +1,20 @@
 import asyncio
 import logging
 from datetime import datetime
-from typing import Optional, List, Dict, Any
+from typing import Optional, Dict, Any
 from sqlalchemy.orm import Session
 
-from db.models import Test, TestDataPoint, Alarm
+from db.models import Test, Alarm
 from db.database import SessionLocal
+from db.bulk import insert_data_points
+from db.curves import insert_curve_segment
+from config import settings
 from plc.data_service import DataService
 from plc.command_service import CommandService
+from plc.async_connector import AsyncPLCConnector
+from plc.poller import PLCPoller
+from .curve_buffer import COLUMNS, CurveBuffer
+from .sampler import DeadlineSampler
 
 logger = logging.getLogger(__name__)
 
@@ -15,14 +22,34 @@ logger = logging.getLogger(__name__)
 class TestService:
     """Service for managing test execution and data recording"""
 
-    def __init__(self, data_service: DataService, command_service: CommandService):
+    def __init__(
+        self,
+        data_service: DataService,
+        command_service: CommandService,
+        poller: PLCPoller,
+        plc_io: AsyncPLCConnector,
+        sample_buffer: bool = settings.PLC_SAMPLE_BUFFER,
+        record_interval: float = settings.RECORD_INTERVAL,
+        persist_chunk: int = settings.PERSIST_CHUNK,
+        curve_storage: str = settings.CURVE_STORAGE,
+    ):
         self.data_service = data_service
         self.command_service = command_service
+        self.poller = poller
+        self.plc_io = plc_io
+        self.sample_buffer = sample_buffer
+        self.record_interval = record_interval
+        self.persist_chunk = persist_chunk
+        self.curve_storage = curve_storage
+        self.sampler: Optional[DeadlineSampler] = None
         self.current_test: Optional[Test] = None
         self.is_recording = False
-        self.data_points: List[Dict[str, float]] = []
+        self.curve = CurveBuffer()
+        self.curve_test_id: Optional[int] = None  # Test the curve belongs to
         self.test_start_time: Optional[float] = None
         self._recording_task: Optional[asyncio.Task] = None
+        self._persisted = 0  # Curve samples already saved to the database
+        self._flush_task: Optional[asyncio.Task] = None
 
     async def start_test(
         self,
@@ -56,7 +83,8 @@ class TestService:
             test_id = self.current_test.id
 
             # Set parameters on PLC
-            self.data_service.set_parameters(
+            await self.plc_io.run(
+                self.data_service.set_parameters,
                 diameter=pipe_diameter,
                 length=pipe_length,
                 deflection_pct=deflection_percent,
@@ -65,14 +93,25 @@ class TestService:
 
             # Start recording
             self.is_recording = True
-            self.data_points = []
+            self.curve = CurveBuffer()
+            self.curve_test_id = test_id
+            self._persisted = 0
             self.test_start_time = asyncio.get_event_loop().time()
+            self.sampler = DeadlineSampler(
+                settings.SAMPLE_BUFFER_INTERVAL if self.sample_buffer else self.record_interval
+            )
+            self.sampler.begin(self.test_start_time)
 
-            # Start data recording task
-            self._recording_task = asyncio.create_task(self._record_data())
+            # Start data recording task - poller switches to its high rate
+            self.poller.request_high_rate(self)
+            if self.sample_buffer:
+                await self.plc_io.run(self.data_service.start_samples)
+                self._recording_task = asyncio.create_task(self._record_samples())
+            else:
+                self._recording_task = asyncio.create_task(self._record_data())
 
             # Send start command to PLC
-            self.command_service.start_test()
+            await self.plc_io.run_priority(self.command_service.start_test)
 
             logger.info(f"Test {test_id} started")
             return test_id
@@ -85,42 +124,154 @@ class TestService:
             db.close()
 
     async def _record_data(self):
-        """Background task to record test data points"""
+        """Background task to record test data points from poller snapshots
+
+        One point per sampler tick, time-stamped with the tick's deadline,
+        so points are evenly spaced at record_interval. Each holds the
+        newest snapshot at that moment (at most one poll interval old).
+        """
+        sampler = self.sampler
+        last_seq = None
         while self.is_recording:
             try:
-                data = self.data_service.get_live_data()
-                current_time = asyncio.get_event_loop().time()
+                timestamp = await sampler.wait()
+                snapshot = self.poller.snapshot
+                if snapshot.seq == last_seq:
+                    sampler.stale += 1
+                last_seq = snapshot.seq
+                data = snapshot.data
 
-                self.data_points.append({
-                    'timestamp': current_time - self.test_start_time,
-                    'force': data.get('actual_force', 0),
-                    'deflection': data.get('actual_deflection', 0),
-                    'position': data.get('actual_position', 0),
-                })
+                self.curve.append(
+                    timestamp,
+                    data.get('actual_force', 0),
+                    data.get('actual_deflection', 0),
+                    data.get('actual_position', 0),
+                )
+                self._schedule_flush()
 
                 # Check if test is complete (status == 5)
                 if data.get('test_status') == 5:
                     await self.complete_test()
                     break
 
-                await asyncio.sleep(0.1)  # Record at 10 Hz
-
+            except asyncio.CancelledError:
+                raise
             except Exception as e:
                 logger.error(f"Error recording data: {e}")
                 await asyncio.sleep(0.1)
 
+    async def _record_samples(self):
+        """Background task to download PLC-timed samples from the DB10 ring buffer"""
+        sampler = self.sampler
+        while self.is_recording:
+            try:
+                await sampler.wait()
+                self._append_samples(await self.plc_io.run(self.data_service.read_samples))
+                self._schedule_flush()
+
+                # Check if test is complete (status == 5)
+                if self.poller.snapshot.data.get('test_status') == 5:
+                    await self.complete_test()
+                    break
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Error recording samples: {e}")
+
+    def _append_samples(self, samples):
+        """Add ring buffer samples (time, force, position, deflection) to the curve"""
+        for timestamp, force, position, deflection in samples or ():
+            self.curve.append(timestamp, force, deflection, position)
+
+    # ═══════════════════════════════════════════════════════════════════════════
+    # INCREMENTAL PERSISTENCE
+    # ═══════════════════════════════════════════════════════════════════════════
+
+    def _schedule_flush(self):
+        """Start a background flush once a full chunk of samples is pending"""
+        if len(self.curve) - self._persisted < self.persist_chunk:
+            return
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_chunks())
+
+    async def _flush_chunks(self):
+        """Write pending samples to the database in chunks of persist_chunk"""
+        curve, test_id = self.curve, self.curve_test_id
+        try:
+            while curve is self.curve and len(curve) - self._persisted >= self.persist_chunk:
+                stop = self._persisted + self.persist_chunk
+                await asyncio.to_thread(self._write_points, test_id, curve, self._persisted, stop)
+                if curve is self.curve:
+                    self._persisted = stop
+        except Exception as e:
+            # Retried with the next chunk / at completion
+            logger.error(f"Failed to save data points of test {test_id}: {e}")
+
+    async def _flush_remaining(self):
+        """Wait for a running flush, then write the samples still pending"""
+        if self._flush_task is not None:
+            await asyncio.gather(self._flush_task, return_exceptions=True)
+            self._flush_task = None
+        stop = len(self.curve)
+        if stop > self._persisted:
+            await asyncio.to_thread(self._write_points, self.curve_test_id, self.curve, self._persisted, stop)
+            self._persisted = stop
+
+    def _write_points(self, test_id: int, curve: CurveBuffer, start: int, stop: int):
+        """Save curve samples [start, stop) of a test (worker thread)
+
+        With binary storage they become one curve segment, numbered by
+        their first chunk. The curve's chunks never move, so reading them
+        here while the recorder keeps appending is safe.
+        """
+        db = SessionLocal()
+        try:
+            if self.curve_storage == "binary":
+                columns = [curve.to_array(name, start, stop, "f") for name in COLUMNS]
+                insert_curve_segment(db, test_id, start // self.persist_chunk, columns)
+            else:
+                insert_data_points(db, test_id, curve.rows(start, stop))
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def _sampling_stats(self) -> Optional[Dict[str, Any]]:
+        """Sample timing quality of the current recording, stored with the test"""
+        if self.sampler is None:
+            return None
+        if self.sample_buffer:
+            # PLC-timed samples - the sampler only paces the downloads
+            return {
+                "source": "plc_buffer",
+                "samples": len(self.curve),
+                "samples_lost": self.data_service.samples_lost,
+                "download_interval": self.sampler.interval,
+            }
+        return self.sampler.stats()
+
     async def complete_test(self):
         """Complete the current test and save results"""
         if not self.is_recording or not self.current_test:
             return None
 
         self.is_recording = False
+        self.poller.release_high_rate(self)
         test_end_time = asyncio.get_event_loop().time()
+        if self.sample_buffer:
+            # Samples written since the last download
+            self._append_samples(await self.plc_io.run(self.data_service.read_samples))
 
         db = SessionLocal()
         try:
+            # Most points are already saved - only the last partial chunk is left
+            await self._flush_remaining()
+
             # Get final results from PLC
-            result = self.data_service.get_test_result()
+            result = await self.plc_io.run(self.data_service.get_test_result)
 
             # Update test record
             test = db.query(Test).filter(Test.id == self.current_test.id).first()
@@ -129,20 +280,7 @@ class TestService:
                 test.ring_stiffness = result.get('ring_stiffness', 0)
                 test.sn_class = result.get('sn_class', 0)
                 test.passed = result.get('test_passed', False)
-                test.duration = test_end_time - self.test_start_time
-                test.max_force = max((dp['force'] for dp in self.data_points), default=0)
-
-                # Save data points
-                for dp in self.data_points:
-                    data_point = TestDataPoint(
-                        test_id=test.id,
-                        timestamp=dp['timestamp'],
-                        force=dp['force'],
-                        deflection=dp['deflection'],
-                        position=dp['position'],
-                    )
-                    db.add(data_point)
-
+                self._finalize(test, test_end_time)
                 db.commit()
                 logger.info(f"Test {test.id} completed: {'PASS' if test.passed else 'FAIL'}")
 
@@ -159,17 +297,41 @@ class TestService:
             return None
         finally:
             db.close()
+            # The curve stays until the next test - backfill for late joiners
             self.current_test = None
-            self.data_points = []
 
-    def stop_test(self):
+    def _finalize(self, test: Test, test_end_time: float):
+        """Store what the recording itself measured - for completed and stopped tests"""
+        test.duration = test_end_time - self.test_start_time
+        test.max_force = self.curve.max('force') or 0
+        test.sampling = self._sampling_stats()
+
+    async def stop_test(self):
         """Stop the current test (emergency stop)"""
         self.is_recording = False
+        self.poller.release_high_rate(self)
+        test_end_time = asyncio.get_event_loop().time()
         if self._recording_task:
             self._recording_task.cancel()
-        self.command_service.stop()
+        await self.plc_io.run_priority(self.command_service.stop)
         logger.warning("Test stopped by user")
 
+        # Keep the partial curve, duration and sampling stats of the stopped test
+        if self.current_test is not None:
+            db = SessionLocal()
+            try:
+                await self._flush_remaining()
+                test = db.query(Test).filter(Test.id == self.current_test.id).first()
+                if test:
+                    self._finalize(test, test_end_time)
+                    db.commit()
+            except Exception as e:
+                logger.error(f"Failed to save stopped test: {e}")
+                db.rollback()
+            finally:
+                db.close()
+                self.current_test = None
+
     def add_alarm(self, alarm_code: str, message: str, severity: str = 'warning'):
         """Add an alarm to the database"""
         db = SessionLocal()
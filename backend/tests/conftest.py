@@ -0,0 +1,32 @@
+import os
+import socket
+import sys
+from typing import Optional
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from plc.simulator import MachineSimulator, PipeModel  # noqa: E402
+
+
+def free_port() -> int:
+    """A TCP port nothing listens on right now"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_simulator(port: Optional[int] = None) -> MachineSimulator:
+    """Start a PLC simulator (snap7 server) - on a free port unless given; .port is set"""
+    sim = MachineSimulator(PipeModel(300.0, 300.0, 5000.0, 50.0))
+    sim.port = port or free_port()
+    sim.start(sim.port)
+    return sim
+
+
+@pytest.fixture
+def simulator():
+    sim = start_simulator()
+    yield sim
+    sim.stop()
@@ -0,0 +1,122 @@
+import asyncio
+import time
+
+import pytest
+
+from plc.async_connector import AsyncPLCConnector
+from plc.connector import PLCConnector
+from plc.data_service import DataService
+from plc.reconnect import ReconnectWorker
+
+from conftest import start_simulator
+
+BACKENDS = ("snap7", "asyncio")
+
+# DB3 bytes the simulator program never touches
+SCRATCH_REAL = 40
+SCRATCH_INT = 44
+SCRATCH_BYTE = 48
+
+
+def _connect(simulator, backend: str) -> PLCConnector:
+    plc = PLCConnector("127.0.0.1", 0, 1, port=simulator.port, backend=backend, recv_timeout=0.3)
+    assert plc.connect()
+    return plc
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_read_write_round_trips(simulator, backend):
+    plc = _connect(simulator, backend)
+    db = DataService.DB_NUMBER
+    try:
+        assert plc.write_real(db, SCRATCH_REAL, 12.5)
+        assert plc.read_real(db, SCRATCH_REAL) == 12.5
+        assert plc.write_int(db, SCRATCH_INT, -1234)
+        assert plc.read_int(db, SCRATCH_INT) == -1234
+
+        assert plc.write_bool(db, SCRATCH_BYTE, 3, True)
+        assert plc.write_bits(db, SCRATCH_BYTE, {0: True, 3: False, 7: True})
+        assert plc.read_db(db, SCRATCH_BYTE, 1) == bytearray([0b10000001])
+        assert plc.read_bool(db, SCRATCH_BYTE, 7) is True
+        assert plc.read_bool(db, SCRATCH_BYTE, 3) is False
+
+        blocks = plc.read_multi(DataService.SNAPSHOT_ITEMS)
+        assert blocks is not None and all(block is not None for block in blocks)
+        assert [len(block) for block in blocks] == [item.size for item in DataService.SNAPSHOT_ITEMS]
+        assert plc.get_cpu_state() == "run"
+    finally:
+        plc.disconnect()
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_backends_read_the_same_snapshot(simulator, backend):
+    reference = _connect(simulator, "snap7")
+    plc = _connect(simulator, backend)
+    try:
+        # Servo off - the machine stands still, so both reads see the same DB3
+        item = DataService.SNAPSHOT_ITEMS[0]
+        assert plc.read_multi([item])[0] == reference.read_multi([item])[0]
+    finally:
+        plc.disconnect()
+        reference.disconnect()
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_dead_plc_detected_and_reconnected(backend):
+    simulator = start_simulator()
+    plc = _connect(simulator, backend)
+    simulator.stop()
+
+    started = time.monotonic()
+    assert not plc.ping()
+    assert not plc.connected
+    assert time.monotonic() - started < 2.0
+    assert plc.read_multi(DataService.SNAPSHOT_ITEMS) is None
+
+    restarted = start_simulator(simulator.port)
+    try:
+        assert plc.reconnect()
+        assert plc.connected
+        assert plc.write_real(DataService.DB_NUMBER, SCRATCH_REAL, 3.0)
+        assert plc.read_real(DataService.DB_NUMBER, SCRATCH_REAL) == 3.0
+    finally:
+        plc.disconnect()
+        restarted.stop()
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_reconnect_worker_recovers_connection(backend):
+    simulator = start_simulator()
+    plc = _connect(simulator, backend)
+    plc_io = AsyncPLCConnector(plc)
+    worker = ReconnectWorker(plc_io, min_delay=0.05, max_delay=0.2, ping_timeout=0.1, check_interval=0.02)
+    states = []
+
+    async def on_change(connected: bool):
+        states.append(connected)
+
+    async def wait_for(state: bool, timeout: float):
+        deadline = time.monotonic() + timeout
+        while plc.connected != state:
+            assert time.monotonic() < deadline
+            await asyncio.sleep(0.02)
+
+    async def scenario():
+        worker.add_listener(on_change)
+        worker.start()
+        simulator.stop()  # Idle link - only the worker's ping can notice
+        await wait_for(False, 3.0)
+        restarted = start_simulator(simulator.port)
+        try:
+            await wait_for(True, 3.0)
+            assert await plc_io.read_real(DataService.DB_NUMBER, SCRATCH_REAL) is not None
+        finally:
+            worker.stop()
+            await plc_io.disconnect()
+            restarted.stop()
+
+    try:
+        asyncio.run(scenario())
+        assert states == [False, True]
+    finally:
+        plc_io.shutdown()
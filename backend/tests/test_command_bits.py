@@ -0,0 +1,111 @@
+import threading
+import time
+
+import pytest
+from snap7.type import SrvArea
+
+from plc.command_service import CommandService
+from plc.connector import PLCConnector
+from plc.tags import DB3
+
+BACKENDS = ("snap7", "asyncio")
+
+
+def _connect(simulator, backend: str = "snap7") -> PLCConnector:
+    plc = PLCConnector("127.0.0.1", 0, 1, port=simulator.port, backend=backend)
+    assert plc.connect()
+    return plc
+
+
+def _set_db3_bit(simulator, byte: int, bit: int, value: bool):
+    """Change a DB3 bit the way the PLC program would"""
+    simulator.server.lock_area(SrvArea.DB, DB3)
+    try:
+        if value:
+            simulator.db3[byte] |= 1 << bit
+        else:
+            simulator.db3[byte] &= ~(1 << bit) & 0xFF
+    finally:
+        simulator.server.unlock_area(SrvArea.DB, DB3)
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_commands_keep_plc_written_bits(simulator, backend):
+    plc = _connect(simulator, backend)
+    commands = CommandService(plc)
+    try:
+        assert commands.enable_servo()
+        assert commands.start_test()
+        time.sleep(0.05)
+
+        # PLC acknowledges the test start, drops Enable and latches E-Stop
+        _set_db3_bit(simulator, 0, 3, False)
+        _set_db3_bit(simulator, 0, 0, False)
+        _set_db3_bit(simulator, 25, 1, True)
+
+        assert commands.stop_all_jog()
+        assert commands.home()
+        assert commands.set_remote_mode(True)
+        assert not simulator.db3[0] & 0b1001  # Enable and Start_Test stay cleared
+        assert simulator.db3[25] == 0b11  # Remote mode set, E-Stop latch kept
+    finally:
+        plc.disconnect()
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_bit_write_needs_no_read(simulator, backend):
+    plc = _connect(simulator, backend)
+    try:
+        plc.metrics.reset()
+        assert CommandService(plc).jog_forward(False)["success"]
+        operations = plc.metrics.to_dict()["operations"]
+        assert list(operations) == ["write_bits"]
+        assert operations["write_bits"]["latency"]["count"] == 1
+    finally:
+        plc.disconnect()
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_rejected_bit_write_fails(simulator, backend):
+    plc = _connect(simulator, backend)
+    try:
+        assert not plc.write_bool(99, 0, 0, True)  # DB99 does not exist
+        assert plc.connected
+    finally:
+        plc.disconnect()
+
+
+def test_command_lane_not_blocked_by_main_lane_write(simulator):
+    plc = _connect(simulator)
+    try:
+        commands = CommandService(plc)
+        release = threading.Event()
+        entered = threading.Event()
+        original = plc._write_items
+
+        def slow_write(client, items):
+            if client is plc.client:
+                entered.set()
+                release.wait(2.0)
+            return original(client, items)
+
+        plc._write_items = slow_write
+        writer = threading.Thread(target=plc.write_bool, args=(DB3, *CommandService.CMD_ENABLE, True))
+        writer.start()
+        assert entered.wait(1.0)
+
+        def stop_jog():
+            plc.mark_command_thread()
+            commands.stop_all_jog()
+
+        started = time.perf_counter()
+        lane = threading.Thread(target=stop_jog)
+        lane.start()
+        lane.join(1.0)
+        elapsed = time.perf_counter() - started
+        release.set()
+        writer.join()
+        assert not lane.is_alive()
+        assert elapsed < 0.5
+    finally:
+        plc.disconnect()
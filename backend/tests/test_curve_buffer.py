@@ -0,0 +1,59 @@
+import struct
+from array import array
+
+import pytest
+
+from services.curve_buffer import COLUMNS, CurveBuffer
+
+
+def _filled(count: int, chunk_size: int = 8) -> CurveBuffer:
+    curve = CurveBuffer(chunk_size=chunk_size)
+    for i in range(count):
+        curve.append(i * 0.02, 0.5 * i, -0.25 * i, 100.0 - i)
+    return curve
+
+
+def _reference(count: int):
+    return [(i * 0.02, 0.5 * i, -0.25 * i, 100.0 - i) for i in range(count)]
+
+
+@pytest.mark.parametrize("count", [0, 1, 7, 8, 9, 33])
+def test_rows_match_appended_samples_across_chunks(count):
+    curve = _filled(count)
+    assert len(curve) == count
+    assert list(curve.rows()) == _reference(count)
+
+
+@pytest.mark.parametrize("start,stop", [(0, 20), (3, 17), (8, 16), (15, 15), (5, None), (18, 99)])
+def test_slices(start, stop):
+    curve = _filled(20)
+    expected = _reference(20)[start:stop]
+    assert list(curve.rows(start, stop)) == expected
+    for index, name in enumerate(COLUMNS):
+        assert list(curve.to_array(name, start, stop)) == [row[index] for row in expected]
+
+
+def test_float32_bytes_are_little_endian():
+    curve = _filled(10)
+    data = curve.to_bytes("force", 2, 6, "f")
+    assert struct.unpack("<4f", data) == (1.0, 1.5, 2.0, 2.5)
+    assert curve.to_array("force", 2, 6, "f") == array("f", [1.0, 1.5, 2.0, 2.5])
+
+
+def test_min_max():
+    curve = CurveBuffer()
+    assert curve.max("force") is None
+    for force in (3.0, -1.0, 7.5, 2.0):
+        curve.append(0.0, force, 0.0, 0.0)
+    assert curve.min("force") == -1.0
+    assert curve.max("force") == 7.5
+
+
+def test_reading_while_appending():
+    curve = _filled(5)
+    rows = curve.rows(0, 5)
+    assert next(rows) == _reference(1)[0]
+    for i in range(5, 30):
+        curve.append(i * 0.02, 0.5 * i, -0.25 * i, 100.0 - i)
+    assert list(rows) == _reference(5)[1:]
+    assert list(curve.to_array("timestamp")) == [i * 0.02 for i in range(30)]
@@ -0,0 +1,140 @@
+import asyncio
+import math
+import struct
+from array import array
+
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+
+from db import migrate_curves, models
+from db.bulk import insert_data_points
+from db.curve_codec import HEADER, MAGIC, curve_points, decode_curve, encode_curve
+from db.database import Base
+from services import test_service as recording
+
+
+def _columns(points: int):
+    return [
+        array("f", (i * 0.02 for i in range(points))),
+        array("f", (5.0 * math.sin(i / 50) for i in range(points))),
+        array("f", (0.01 * i for i in range(points))),
+        array("f", (100.0 - 0.01 * i for i in range(points))),
+    ]
+
+
+@pytest.mark.parametrize("compress", [True, False])
+@pytest.mark.parametrize("points", [0, 1, 1000])
+def test_encode_decode_round_trip(points, compress):
+    columns = _columns(points)
+    blob = encode_curve(columns, compress)
+    magic, version, flags, column_count, count = HEADER.unpack_from(blob)
+    assert (magic, version, column_count, count) == (MAGIC, 1, 4, points)
+    assert bool(flags) == compress
+    assert decode_curve(blob) == columns
+
+
+def test_compression_shrinks_smooth_curves():
+    columns = _columns(10000)
+    assert len(encode_curve(columns, True)) < len(encode_curve(columns, False)) / 2
+
+
+def test_float64_input_is_stored_as_float32():
+    blob = encode_curve([array("d", [0.1, 0.2])] * 4)
+    assert decode_curve(blob)[0] == array("f", [0.1, 0.2])
+
+
+def test_decode_rejects_bad_blobs():
+    blob = encode_curve(_columns(10), compress=False)
+    with pytest.raises(ValueError):
+        decode_curve(b"XXXX" + blob[4:])
+    with pytest.raises(ValueError):
+        decode_curve(blob[:4] + bytes([2]) + blob[5:])  # Unknown version
+    with pytest.raises(ValueError):
+        decode_curve(blob[:-4])  # Truncated payload
+    with pytest.raises(ValueError):
+        encode_curve(_columns(10)[:3])
+
+
+def test_points_are_rounded_and_nan_is_none():
+    columns = [array("f", [0.02]), array("f", [5.2]), array("f", [0.3]), array("f", [float("nan")])]
+    (point,) = curve_points(columns)
+    assert point == (0.02, 5.2, 0.3, None)
+    assert struct.pack("<f", point.force) == struct.pack("<f", 5.2)
+
+
+@pytest.fixture
+def session_factory(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'curves.db'}")
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(bind=engine)
+    monkeypatch.setattr(migrate_curves, "SessionLocal", factory)
+    yield factory
+    engine.dispose()
+
+
+def _add_test(db, rows):
+    test = models.Test(pipe_diameter=300.0, pipe_length=300.0, deflection_percent=3.0)
+    db.add(test)
+    db.flush()
+    insert_data_points(db, test.id, rows)
+    return test.id
+
+
+def test_migrate_data_points(session_factory):
+    rows = [(i * 0.1, 0.5 * i, 0.03 * i, None if i % 3 == 0 else 0.03 * i) for i in range(50)]
+    with session_factory() as db:
+        legacy = _add_test(db, reversed(rows))  # Stored out of order
+        other = _add_test(db, rows[:5])
+        db.commit()
+        expected = {test_id: db.get(models.Test, test_id).curve for test_id in (legacy, other)}
+
+    assert migrate_curves.migrate_data_points() == 2
+    assert migrate_curves.migrate_data_points() == 0  # Nothing left - safe to rerun
+
+    with session_factory() as db:
+        assert db.scalar(select(func.count()).select_from(models.TestDataPoint)) == 0
+        assert db.scalar(select(func.count()).select_from(models.TestCurve)) == 2
+        for test_id, points in expected.items():
+            migrated = db.get(models.Test, test_id).curve
+            assert len(migrated) == len(points)
+            for before, after in zip(points, migrated):
+                assert after.timestamp == pytest.approx(before.timestamp, rel=1e-6)
+                assert after.force == pytest.approx(before.force, rel=1e-6)
+                assert after.deflection == pytest.approx(before.deflection, rel=1e-6)
+                assert (after.position is None) == (before.position is None)
+
+
+def test_migrate_keep_rows(session_factory):
+    with session_factory() as db:
+        test_id = _add_test(db, [(0.0, 1.0, 2.0, 3.0), (0.1, 1.5, 2.5, 3.5)])
+        db.commit()
+
+    assert migrate_curves.migrate_data_points(keep_rows=True) == 1
+
+    with session_factory() as db:
+        test = db.get(models.Test, test_id)
+        assert len(test.data_points) == 2
+        assert test.curve == [(0.0, 1.0, 2.0, 3.0), (0.1, 1.5, 2.5, 3.5)]
+
+
+def test_completion_writes_only_the_last_segment(session_factory, monkeypatch):
+    monkeypatch.setattr(recording, "SessionLocal", session_factory)
+    with session_factory() as db:
+        test_id = _add_test(db, [])
+        db.commit()
+    service = recording.TestService(None, None, None, None, persist_chunk=4, curve_storage="binary")
+    service.curve_test_id = test_id
+    for i in range(10):
+        service.curve.append(i * 0.1, float(i), 0.01 * i, 0.02 * i)
+
+    async def record_and_complete():
+        service._schedule_flush()
+        await service._flush_remaining()
+
+    asyncio.run(record_and_complete())
+
+    with session_factory() as db:
+        test = db.get(models.Test, test_id)
+        assert [(s.segment, s.points) for s in test.curve_segments] == [(0, 4), (1, 4), (2, 2)]
+        assert [point.force for point in test.curve] == [float(i) for i in range(10)]
@@ -0,0 +1,122 @@
+import copy
+import json
+import random
+from typing import Any, Dict, Optional
+
+from api.delta import DeltaEncoder
+
+
+class LiveClient:
+    """Python port of applyDelta() in frontend/src/api/socket.ts"""
+
+    def __init__(self):
+        self.live_data: Optional[Dict[str, Any]] = None
+        self.live_seq: Optional[int] = None
+        self.resyncs = 0
+
+    def apply(self, frame: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        frame = json.loads(json.dumps(frame))  # As received over the wire
+        if frame.get("keyframe") and frame.get("data"):
+            self.live_data = frame["data"]
+        elif self.live_data is not None and frame.get("base") == self.live_seq and "changes" in frame:
+            previous = self.live_data
+            following = dict(previous)
+            for key, value in frame["changes"].items():
+                old = previous.get(key)
+                following[key] = {**old, **value} if isinstance(value, dict) and isinstance(old, dict) else value
+            following["seq"] = frame["seq"]
+            if frame.get("fresh"):
+                timestamps = dict(following["field_timestamps"])
+                for name in frame["fresh"]:
+                    timestamps[name] = following["timestamp"]
+                following["field_timestamps"] = timestamps
+            self.live_data = following
+        else:
+            if self.live_data is not None:
+                self.live_data = None
+                self.resyncs += 1
+            return None
+        self.live_seq = frame["seq"]
+        return self.live_data
+
+
+FAST = ("actual_position", "actual_force", "actual_speed")
+SLOW = ("servo_ready", "mc_busy")
+
+
+def _snapshots(count: int, seed: int = 0):
+    """Live data dicts like LiveSnapshot.to_dict(), fast fields every tick, slow ones every 5th"""
+    rng = random.Random(seed)
+    data = {name: 0.0 for name in FAST}
+    data.update({name: False for name in SLOW})
+    data["plc"] = {"connected": True, "cpu_state": "run", "ip": "127.0.0.1"}
+    read_at = {name: 0.0 for name in FAST + SLOW}
+    for seq in range(1, count + 1):
+        timestamp = 1000.0 + seq * 0.1
+        for name in FAST:
+            if rng.random() < 0.7:
+                data[name] = round(rng.uniform(-5, 5), 3)
+            read_at[name] = timestamp
+        if seq % 5 == 0:
+            for name in SLOW:
+                data[name] = rng.random() < 0.5
+                read_at[name] = timestamp
+            if rng.random() < 0.3:
+                data["plc"]["cpu_state"] = rng.choice(["run", "stop"])
+        snapshot = copy.deepcopy(data)
+        snapshot.update(seq=seq, timestamp=timestamp, field_timestamps=dict(read_at))
+        yield snapshot
+
+
+def test_delta_sequence_rebuilds_every_frame():
+    encoder = DeltaEncoder(keyframe_interval=2.0)
+    client = LiveClient()
+    keyframes = 0
+    for data in _snapshots(200):
+        frame = encoder.encode(data, data["seq"], data["timestamp"])
+        keyframes += bool(frame.get("keyframe"))
+        assert client.apply(frame) == data
+    assert keyframes == 10  # One per keyframe_interval (2 s at 10 Hz)
+    assert client.resyncs == 0
+
+
+def test_delta_frames_carry_only_changes():
+    encoder = DeltaEncoder(keyframe_interval=60.0)
+    for data in _snapshots(20):
+        frame = encoder.encode(data, data["seq"], data["timestamp"])
+        if frame.get("keyframe"):
+            continue
+        assert len(json.dumps(frame)) < len(json.dumps(data))
+        assert "seq" not in frame["changes"]
+        # Fast fields are read at the frame time - listed in fresh, not repeated
+        assert set(FAST) <= set(frame["fresh"])
+        assert not set(FAST) & set(frame["changes"].get("field_timestamps", {}))
+
+
+def test_missed_frame_resyncs_with_keyframe():
+    encoder = DeltaEncoder(keyframe_interval=60.0)
+    client = LiveClient()
+    snapshots = list(_snapshots(10))
+    for data in snapshots[:4]:
+        client.apply(encoder.encode(data, data["seq"], data["timestamp"]))
+
+    encoder.encode(snapshots[4], 5, snapshots[4]["timestamp"])  # Dropped on the way
+    data = snapshots[5]
+    assert client.apply(encoder.encode(data, 6, data["timestamp"])) is None
+    assert client.resyncs == 1
+
+    assert client.apply(encoder.keyframe()) == data
+    for data in snapshots[6:]:
+        assert client.apply(encoder.encode(data, data["seq"], data["timestamp"])) == data
+
+
+def test_field_set_change_sends_keyframe():
+    encoder = DeltaEncoder(keyframe_interval=60.0)
+    first, second = list(_snapshots(2))
+    encoder.encode(first, 1, first["timestamp"])
+    del second["mc_busy"]
+    assert encoder.encode(second, 2, second["timestamp"])["keyframe"] is True
+
+
+def test_no_keyframe_before_first_frame():
+    assert DeltaEncoder(keyframe_interval=5.0).keyframe() is None
@@ -0,0 +1,21 @@
+from plc.async_connector import AsyncPLCConnector
+from plc.connector import PLCConnector
+from plc.data_service import DataService
+from plc.poller import PLCPoller
+
+
+def _poller() -> PLCPoller:
+    plc = PLCConnector("127.0.0.1", 0, 1, command_connection=False)
+    return PLCPoller(DataService(plc), AsyncPLCConnector(plc), moving_speed=0.5)
+
+
+def test_speed_noise_is_not_motion():
+    poller = _poller()
+    assert not poller._is_moving({"mc_busy": False, "actual_speed": 1e-4})
+    assert not poller._is_moving({"mc_busy": False, "actual_speed": -0.3})
+
+
+def test_moving_axis_is_detected():
+    poller = _poller()
+    assert poller._is_moving({"mc_busy": False, "actual_speed": -10.0})
+    assert poller._is_moving({"mc_busy": True, "actual_speed": 0.0})
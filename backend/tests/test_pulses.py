@@ -0,0 +1,56 @@
+import threading
+from concurrent.futures import Future
+
+from plc.command_service import CommandService
+
+
+class FakePLC:
+    connected = True
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.writes = []
+
+    def write_bool(self, db_number, byte_offset, bit_offset, value):
+        with self.lock:
+            self.writes.append(((byte_offset, bit_offset), value))
+        return True
+
+
+class FakeScheduler:
+    """Release handles that a test completes by hand"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.handles = []
+
+    def schedule(self, delay, func, *args, priority=False):
+        handle = Future()
+        with self.lock:
+            self.handles.append(handle)
+        return handle
+
+
+def test_concurrent_pulses_leave_one_live_release():
+    commands = CommandService(FakePLC(), FakeScheduler())
+    address = CommandService.CMD_RESET
+    start = threading.Barrier(8)
+
+    def pulse_many():
+        start.wait()
+        for _ in range(200):
+            commands.pulse(address, 0.5)
+
+    threads = [threading.Thread(target=pulse_many) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    handles = commands.scheduler.handles
+    live = [handle for handle in handles if not handle.cancelled()]
+    assert len(handles) == 1600
+    assert live == [commands._pulses[address]]
+
+    live[0].set_result(True)
+    assert address not in commands._pulses
@@ -0,0 +1,63 @@
+import struct
+
+from plc.data_service import DataService
+
+ENTRY = DataService.SAMPLE_ENTRY
+HEADER = DataService.SAMPLE_HEADER_SIZE
+
+
+class RingPLC:
+    """DB10 ring buffer whose PLC keeps writing between read requests"""
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.count = 0
+        self.ring = bytearray(HEADER + capacity * ENTRY.size)
+        self.writes_per_read = 0  # Entries the PLC adds after each entry read
+        self.produce(0)
+
+    def produce(self, n: int):
+        for _ in range(n):
+            slot = self.count % self.capacity
+            ENTRY.pack_into(self.ring, HEADER + slot * ENTRY.size, self.count * 1000, float(self.count), 0.0, 0.0)
+            self.count += 1
+        struct.pack_into(">Ihh", self.ring, 0, self.count, self.capacity, ENTRY.size)
+
+    def read_db(self, db_number: int, start: int, size: int):
+        data = bytearray(self.ring[start:start + size])
+        if start >= HEADER:
+            self.produce(self.writes_per_read)
+        return data
+
+
+def _service(plc: RingPLC) -> DataService:
+    service = DataService(plc)
+    service.start_samples()
+    assert service.read_samples() == []  # Syncs to the write count
+    return service
+
+
+def test_samples_in_order_without_overrun():
+    plc = RingPLC(capacity=10)
+    plc.produce(3)
+    service = _service(plc)
+    plc.produce(5)
+    forces = [force for _, force, _, _ in service.read_samples()]
+    assert forces == [3.0, 4.0, 5.0, 6.0, 7.0]
+    assert service.samples_lost == 0
+
+
+def test_entries_overwritten_during_download_are_dropped():
+    plc = RingPLC(capacity=10)
+    service = _service(plc)
+    plc.produce(8)
+    plc.writes_per_read = 4  # PLC writes entries 8-11 into slots 8, 9, 0, 1 meanwhile
+    forces = [force for _, force, _, _ in service.read_samples()]
+    # Entries 0 and 1 were overwritten and slot 2 (entry 2) is written next
+    assert forces == [3.0, 4.0, 5.0, 6.0, 7.0]
+    assert service.samples_lost == 3
+
+    plc.writes_per_read = 0
+    forces = [force for _, force, _, _ in service.read_samples()]
+    assert forces == [8.0, 9.0, 10.0, 11.0]
+    assert service.samples_lost == 3
@@ -0,0 +1,94 @@
+import asyncio
+import time
+
+from api.routes import commands as routes
+from plc.async_connector import AsyncPLCConnector
+from plc.command_service import CommandService
+from plc.connector import PLCConnector
+from plc.data_service import DataService
+
+
+def test_stop_aborts_test_for_good(simulator):
+    plc = PLCConnector("127.0.0.1", 0, 1, port=simulator.port)
+    assert plc.connect()
+    commands = CommandService(plc)
+    data = DataService(plc)
+    try:
+        assert commands.enable_servo()
+        assert commands.start_test()
+        time.sleep(0.2)
+        assert simulator.testing
+
+        assert commands.stop()  # Pulse held inline without a scheduler
+        position = data.get_live_data()["actual_position"]
+        time.sleep(0.3)
+        assert not simulator.testing
+        assert not plc.read_bool(DataService.DB_NUMBER, *CommandService.CMD_START_TEST)
+        assert data.get_live_data()["actual_position"] == position
+    finally:
+        plc.disconnect()
+
+
+def test_ring_buffer_download(simulator):
+    plc = PLCConnector("127.0.0.1", 0, 1, port=simulator.port)
+    assert plc.connect()
+    data = DataService(plc)
+    try:
+        data.start_samples()
+        assert data.read_samples() == []
+        time.sleep(0.3)
+        samples = data.read_samples()
+        times = [sample[0] for sample in samples]
+        assert len(samples) >= 10
+        assert times == sorted(times)
+        assert data.samples_lost == 0
+    finally:
+        plc.disconnect()
+
+
+def _run_behind_slow_poll(plc, *commands):
+    """Send commands one after another while a slow poll holds the I/O lane"""
+
+    def slow_poll():
+        plc.read_db(DataService.DB_NUMBER, 0, 26)
+        time.sleep(0.3)
+
+    async def scenario():
+        poll = asyncio.create_task(plc_io.run(slow_poll))
+        await asyncio.sleep(0.05)
+        tasks = []
+        for command in commands:
+            tasks.append(asyncio.create_task(command()))
+            await asyncio.sleep(0.05)
+        await asyncio.gather(poll, *tasks)
+
+    plc_io = AsyncPLCConnector(plc)
+    routes.set_services(CommandService(plc, plc_io), plc_io)
+    try:
+        asyncio.run(scenario())
+        time.sleep(0.2)  # STOP pulse release, simulator cycles
+    finally:
+        plc_io.shutdown()
+
+
+def test_jog_release_never_overtakes_press(simulator):
+    plc = PLCConnector("127.0.0.1", 0, 1, port=simulator.port)
+    assert plc.connect()
+    try:
+        assert CommandService(plc).set_remote_mode(True)
+        _run_behind_slow_poll(plc, routes.jog_forward_start, routes.jog_forward_stop)
+        assert not plc.read_bool(DataService.DB_NUMBER, *CommandService.CMD_JOG_FORWARD)
+    finally:
+        plc.disconnect()
+
+
+def test_stop_never_overtakes_start(simulator):
+    plc = PLCConnector("127.0.0.1", 0, 1, port=simulator.port)
+    assert plc.connect()
+    try:
+        assert CommandService(plc).enable_servo()
+        _run_behind_slow_poll(plc, routes.start_test, routes.emergency_stop)
+        assert not simulator.testing
+        assert not plc.read_bool(DataService.DB_NUMBER, *CommandService.CMD_START_TEST)
+    finally:
+        plc.disconnect()
@@ -0,0 +1,14 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from api.routes import status
+
+
+def test_set_parameters_before_the_io_facade_is_up(monkeypatch):
+    monkeypatch.setattr(status, "data_service", object())
+    monkeypatch.setattr(status, "plc_io", None)
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(status.set_parameters(status.ParametersRequest(pipe_diameter=300.0)))
+    assert error.value.status_code == 503
@@ -1,11 +1,14 @@
 import { io, Socket } from 'socket.io-client';
-import type { LiveData } from '@/types/api';
+import type { CurveBatch, LiveData, LiveDeltaFrame } from '@/types/api';
 
 const SOCKET_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000';
 
 class SocketClient {
   private socket: Socket | null = null;
   private listeners: Map<string, Set<(data: unknown) => void>> = new Map();
+  private liveData: LiveData | null = null;
+  private liveSeq = -1;
+  private curveSubscribed = false;
 
   connect(): void {
     if (this.socket?.connected) return;
@@ -17,8 +20,12 @@ class SocketClient {
 
     this.socket.on('connect', () => {
       console.log('WebSocket connected');
-      // Subscribe to live data
-      this.socket?.emit('subscribe', {});
+      // Subscribe to live data - changed fields only, see applyDelta()
+      this.liveData = null;
+      this.socket?.emit('subscribe', { delta: true });
+      if (this.curveSubscribed) {
+        this.socket?.emit('subscribe_curve', {});
+      }
     });
 
     this.socket.on('disconnect', () => {
@@ -29,6 +36,17 @@ class SocketClient {
       this.emit('live_data', data);
     });
 
+    this.socket.on('live_delta', (frame: LiveDeltaFrame) => {
+      const data = this.applyDelta(frame);
+      if (data) {
+        this.emit('live_data', data);
+      }
+    });
+
+    this.socket.on('curve_append', (batch: CurveBatch) => {
+      this.emit('curve_append', batch);
+    });
+
     this.socket.on('test_complete', (data: unknown) => {
       this.emit('test_complete', data);
     });
@@ -50,6 +68,42 @@ class SocketClient {
     }
   }
 
+  // Rebuild the full live data from a keyframe or delta frame.
+  // A delta that does not follow the last frame means one was missed -
+  // drop it and ask the server for a keyframe.
+  private applyDelta(frame: LiveDeltaFrame): LiveData | null {
+    if (frame.keyframe && frame.data) {
+      this.liveData = frame.data;
+    } else if (this.liveData && frame.base === this.liveSeq && frame.changes) {
+      const previous = this.liveData as unknown as Record<string, unknown>;
+      const next: Record<string, unknown> = { ...previous };
+      for (const [key, value] of Object.entries(frame.changes)) {
+        const old = previous[key];
+        next[key] =
+          value && typeof value === 'object' && old && typeof old === 'object'
+            ? { ...old, ...value }
+            : value;
+      }
+      next.seq = frame.seq;
+      if (frame.fresh?.length) {
+        const timestamps = { ...(next.field_timestamps as Record<string, number>) };
+        for (const name of frame.fresh) {
+          timestamps[name] = next.timestamp as number;
+        }
+        next.field_timestamps = timestamps;
+      }
+      this.liveData = next as unknown as LiveData;
+    } else {
+      if (this.liveData) {
+        this.liveData = null;
+        this.socket?.emit('resync', {});
+      }
+      return null;
+    }
+    this.liveSeq = frame.seq;
+    return this.liveData;
+  }
+
   private emit(event: string, data: unknown): void {
     const eventListeners = this.listeners.get(event);
     if (eventListeners) {
@@ -69,6 +123,17 @@ class SocketClient {
     };
   }
 
+  // Batched test curve (curve_append) - starts with a backfill
+  subscribeCurve(): void {
+    this.curveSubscribed = true;
+    this.socket?.emit('subscribe_curve', {});
+  }
+
+  unsubscribeCurve(): void {
+    this.curveSubscribed = false;
+    this.socket?.emit('unsubscribe_curve', {});
+  }
+
   // Jog commands via WebSocket for real-time control
   jogForward(state: boolean): void {
     this.socket?.emit('jog_forward', { state });
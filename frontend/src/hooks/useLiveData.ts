@@ -1,6 +1,6 @@
-import { useState, useEffect, useCallback } from 'react';
+import { useState, useEffect, useCallback, useRef } from 'react';
 import { socketClient } from '@/api/socket';
-import type { LiveData } from '@/types/api';
+import type { CurveBatch, LiveData } from '@/types/api';
 
 const defaultLiveData: LiveData = {
   actual_force: 0,
@@ -69,6 +69,46 @@ export function useLiveData() {
   return { liveData, isConnected, setRemoteMode };
 }
 
+// Test curve from batched curve_append events - one update per batch
+export function useTestCurve() {
+  const [curve, setCurve] = useState<{ deflection: number; force: number }[]>([]);
+  const length = useRef(0);
+
+  useEffect(() => {
+    socketClient.connect();
+    socketClient.subscribeCurve();
+
+    const unsubscribeCurve = socketClient.on<CurveBatch>('curve_append', (batch) => {
+      if (!batch.reset && batch.start !== length.current) {
+        // Missed a batch - ask for a backfill
+        socketClient.subscribeCurve();
+        return;
+      }
+      const force = new Float32Array(batch.force);
+      const deflection = new Float32Array(batch.deflection);
+      const points = Array.from(force, (value, i) => ({ deflection: deflection[i], force: value }));
+      length.current = batch.start + points.length;
+      if (batch.reset) {
+        setCurve(points);
+      } else if (points.length) {
+        setCurve(prev => [...prev, ...points]);
+      }
+    });
+
+    return () => {
+      unsubscribeCurve();
+      socketClient.unsubscribeCurve();
+    };
+  }, []);
+
+  const clearCurve = useCallback(() => {
+    length.current = 0;
+    setCurve([]);
+  }, []);
+
+  return { curve, clearCurve };
+}
+
 // Jog control via WebSocket for real-time response
 export function useJogControl() {
   const jogForward = useCallback((pressed: boolean) => {
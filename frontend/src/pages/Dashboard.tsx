@@ -1,4 +1,4 @@
-import { useState, useEffect, useMemo } from 'react';
+import { useMemo } from 'react';
 import { StatusCard } from '@/components/dashboard/StatusCard';
 import { MachineIndicator } from '@/components/dashboard/MachineIndicator';
 import { TestStatusBadge } from '@/components/dashboard/TestStatusBadge';
@@ -7,7 +7,7 @@ import { ModeSelector } from '@/components/ModeSelector';
 import { TouchButton } from '@/components/ui/TouchButton';
 import { EStopButton } from '@/components/ui/EStopButton';
 import { Gauge, Move, Target, Activity, Home, Play, Square } from 'lucide-react';
-import { useLiveData } from '@/hooks/useLiveData';
+import { useLiveData, useTestCurve } from '@/hooks/useLiveData';
 import { useCommands, useModeControl } from '@/hooks/useApi';
 import { useLanguage } from '@/contexts/LanguageContext';
 
@@ -17,33 +17,14 @@ const Dashboard = () => {
   const { startTest, stopTest, goHome } = useCommands();
   const { setMode } = useModeControl();
 
-  // Chart data - accumulate from live data
-  const [chartData, setChartData] = useState<{ deflection: number; force: number }[]>([]);
+  // Chart data - batched test curve from the backend
+  const { curve: chartData, clearCurve } = useTestCurve();
 
   // Mode state
   const isLocalMode = !liveData.remote_mode;
   const controlsDisabled = isLocalMode || !isConnected;
   const isTestRunning = liveData.test_status === 2;
 
-  // Update chart data when testing
-  useEffect(() => {
-    if (liveData.test_status === 2) {
-      setChartData(prev => {
-        const lastPoint = prev[prev.length - 1];
-        if (lastPoint &&
-            Math.abs(lastPoint.deflection - liveData.actual_deflection) < 0.01) {
-          return prev;
-        }
-        return [...prev, {
-          deflection: liveData.actual_deflection,
-          force: liveData.actual_force,
-        }];
-      });
-    } else if (liveData.test_status === 1) {
-      setChartData([]);
-    }
-  }, [liveData.actual_deflection, liveData.actual_force, liveData.test_status]);
-
   // Call real API to change mode in PLC
   const handleModeChange = (remoteMode: boolean) => {
     setMode.mutate(remoteMode);
@@ -54,7 +35,7 @@ const Dashboard = () => {
   };
 
   const handleStartTest = () => {
-    setChartData([]);
+    clearCurve();
     startTest.mutate();
   };
 
@@ -37,6 +37,26 @@ export interface LiveData {
   plc: PLCStatus;
 }
 
+// live_delta frame - a full keyframe or the fields changed since `base`
+export interface LiveDeltaFrame {
+  seq: number;
+  keyframe?: boolean;
+  data?: LiveData;
+  base?: number;
+  changes?: Record<string, unknown>;
+  fresh?: string[]; // fields read at the frame timestamp
+}
+
+// curve_append batch - little-endian float32 columns of samples [start, ...)
+export interface CurveBatch {
+  test_id: number;
+  start: number;
+  reset: boolean;
+  t: ArrayBuffer;
+  force: ArrayBuffer;
+  deflection: ArrayBuffer;
+}
+
 // Test parameters
 export interface TestParameters {
   pipe_diameter: number;
@@ -70,8 +90,6 @@ export interface TestRecord {
 
 // Test data point
 export interface TestDataPoint {
-  id: number;
-  test_id: number;
   timestamp: number;
   force: number;
   deflection: number;